@@ -33,6 +33,189 @@ from sys import version_info
 from gedcom.helpers import deprecated
 import gedcom.tags
 
+CONTINUATION_TAGS = (gedcom.tags.GEDCOM_TAG_CONCATENATION, gedcom.tags.GEDCOM_TAG_CONTINUED)
+"""Tags of the lines continuing the value of their parent element"""
+
+ELEMENT_ADDED = "added"
+"""Change passed to `gedcom.element.element.Element.notify_change()` when an element has been added"""
+
+ELEMENT_REMOVED = "removed"
+"""Change passed to `gedcom.element.element.Element.notify_change()` when an element has been removed"""
+
+POINTER_CHANGED = "pointer"
+"""Change passed to `gedcom.element.element.Element.notify_change()` when the pointer of an element has been changed"""
+
+CHILD_ELEMENTS_CHANGED = "children"
+"""Change passed to `gedcom.element.element.Element.notify_change()` when the list of child elements of an element
+has been changed directly, see `gedcom.element.element.ChildElementList`"""
+
+
+class ChildElementList(list):
+    """List of the child elements of an element with an index of the child elements by tag, and one by pointer,
+    each built on the first lookup, see `gedcom.element.element.Element.get_child_elements_by_tag()` and
+    `gedcom.element.element.Element.remove_child_element()`. An element creates its list when it is first asked
+    for it and keeps it from then on, so that the list returned by
+    `gedcom.element.element.Element.get_child_elements()` is always the one of the element.
+    `append`, `extend`, `pop` and `remove` keep the indexes up to date, any other change of the list drops them.
+
+    Every change made through the list calls `gedcom.element.element.Element.notify_change()` of its element with
+    `gedcom.element.element.CHILD_ELEMENTS_CHANGED`, so that values derived from the child elements are discarded.
+    `append_element`, `pop_element`, `remove_element` and `set_elements` change the list without a notification, for
+    callers sending a more specific one themselves.
+    """
+
+    __slots__ = ('__element', '__index', '__pointer_index')
+
+    def __init__(self, element, elements=()):
+        list.__init__(self, elements)
+        self.__element = element
+        self.__index = None
+        self.__pointer_index = None
+
+    def get_elements_by_tag(self, tag):
+        """Returns the elements of this list with the given tag, in list order
+
+        :type tag: str
+
+        :rtype: list of Element
+        """
+        if self.__index is None:
+            index = {}
+            for element in self:
+                index.setdefault(element.get_tag(), []).append(element)
+            self.__index = index
+
+        return list(self.__index.get(tag, ()))
+
+    def get_element_by_pointer(self, pointer):
+        """Returns the first element of this list with the given pointer, or `None`
+
+        :type pointer: str
+
+        :rtype: Element
+        """
+        if self.__pointer_index is None:
+            pointer_index = {}
+            for element in self:
+                pointer_index.setdefault(element.get_pointer(), []).append(element)
+            self.__pointer_index = pointer_index
+
+        elements = self.__pointer_index.get(pointer)
+        return elements[0] if elements else None
+
+    def invalidate_pointer_index(self):
+        """Drops the index by pointer, to be called when the pointer of an element of this list has been changed"""
+        self.__pointer_index = None
+
+    def append_element(self, element):
+        """Appends an element without notifying the element of this list
+
+        :type element: Element
+        """
+        list.append(self, element)
+        if self.__index is not None:
+            self.__index.setdefault(element.get_tag(), []).append(element)
+        if self.__pointer_index is not None:
+            self.__pointer_index.setdefault(element.get_pointer(), []).append(element)
+
+    def pop_element(self, position=-1):
+        """Removes and returns the element at a position without notifying the element of this list
+
+        :type position: int
+
+        :rtype: Element
+        """
+        element = list.pop(self, position)
+        if self.__index is not None:
+            self.__index[element.get_tag()].remove(element)
+        if self.__pointer_index is not None:
+            self.__pointer_index[element.get_pointer()].remove(element)
+        return element
+
+    def remove_element(self, element):
+        """Removes an element without notifying the element of this list
+
+        :type element: Element
+        """
+        list.remove(self, element)
+        if self.__index is not None:
+            self.__index[element.get_tag()].remove(element)
+        if self.__pointer_index is not None:
+            self.__pointer_index[element.get_pointer()].remove(element)
+
+    def set_elements(self, elements):
+        """Replaces all elements of this list without notifying the element of this list
+
+        :type elements: list of Element
+        """
+        self.__drop_indexes()
+        list.__setitem__(self, slice(None), elements)
+
+    def append(self, element):
+        self.append_element(element)
+        self.__notify()
+
+    def extend(self, elements):
+        for element in elements:
+            self.append_element(element)
+        self.__notify()
+
+    def __iadd__(self, elements):
+        self.extend(elements)
+        return self
+
+    def pop(self, position=-1):
+        element = self.pop_element(position)
+        self.__notify()
+        return element
+
+    def insert(self, position, element):
+        self.__drop_indexes()
+        list.insert(self, position, element)
+        self.__notify()
+
+    def remove(self, element):
+        self.remove_element(element)
+        self.__notify()
+
+    def clear(self):
+        self.__drop_indexes()
+        list.clear(self)
+        self.__notify()
+
+    def sort(self, *args, **kwargs):
+        self.__drop_indexes()
+        list.sort(self, *args, **kwargs)
+        self.__notify()
+
+    def reverse(self):
+        self.__drop_indexes()
+        list.reverse(self)
+        self.__notify()
+
+    def __setitem__(self, key, value):
+        self.__drop_indexes()
+        list.__setitem__(self, key, value)
+        self.__notify()
+
+    def __delitem__(self, key):
+        self.__drop_indexes()
+        list.__delitem__(self, key)
+        self.__notify()
+
+    def __imul__(self, count):
+        self.__drop_indexes()
+        list.__imul__(self, count)
+        self.__notify()
+        return self
+
+    def __drop_indexes(self):
+        self.__index = None
+        self.__pointer_index = None
+
+    def __notify(self):
+        self.__element.notify_change(CHILD_ELEMENTS_CHANGED, self.__element)
+
 
 class Element(object):
     """GEDCOM element
@@ -56,8 +239,20 @@ class Element(object):
 
     See a GEDCOM file for examples of tags and their values.
     Tags available to an element are seen here: `gedcom.tags`
+
+    Elements have no instance dictionary, one is created for every line of a file. Subclasses should
+    declare `__slots__` as well, otherwise each instance gets a dictionary again.
+
+    Elements without child elements have no list of child elements until
+    `gedcom.element.element.Element.get_child_elements()` is called, most elements of a file have none.
+
+    The `CONC` and `CONT` lines of an element can be folded into it, see
+    `gedcom.element.element.Element.fold_continuations()`. They are then no child elements anymore,
+    but are still written by `gedcom.element.element.Element.to_gedcom_string()`.
     """
 
+    __slots__ = ('__level', '__pointer', '__tag', '__value', '__crlf', '__folded', '__children', '__parent')
+
     def __init__(self, level, pointer, tag, value, crlf="\n", multi_line=True):
         # basic element info
         self.__level = level
@@ -65,9 +260,12 @@ class Element(object):
         self.__tag = tag
         self.__value = value
         self.__crlf = crlf
+        # `None`, or the value including folded lines and a flat tuple of tag, value length and line ending
+        # of each folded line, see `fold_continuations`
+        self.__folded = None
 
         # structuring
-        self.__children = []
+        self.__children = None
         self.__parent = None
 
         if multi_line:
@@ -87,6 +285,19 @@ class Element(object):
         """
         return self.__pointer
 
+    def set_pointer(self, pointer):
+        """Sets the pointer of this element
+
+        :type pointer: str
+        """
+        self.__pointer = pointer
+
+        parent = self.__parent
+        if parent is not None and parent.__children is not None:
+            parent.__children.invalidate_pointer_index()
+
+        self.notify_change(POINTER_CHANGED, self)
+
     def get_tag(self):
         """Returns the tag of this element from within the GEDCOM file
 
@@ -106,16 +317,28 @@ class Element(object):
 
         :type value: str
         """
+        if self.__folded is not None:
+            multi_line_value, segments = self.__folded
+            self.__folded = (value + multi_line_value[len(self.__value):], segments)
+
         self.__value = value
+        self.notify_change()
+
+    def get_crlf(self):
+        """Returns the line ending of this element from within the GEDCOM file
+
+        :rtype: str
+        """
+        return self.__crlf
 
     def get_child_value_by_tag(self, tag):
         """Returns value of child element by tag including any CONC lines
 
         :rtype: str
         """
-        for child in self.get_child_elements():
-            if child.get_tag() == tag:
-                return child.get_multi_line_value()
+        children = self.get_child_elements_by_tag(tag)
+        if children:
+            return children[0].get_multi_line_value()
 
         return ""
 
@@ -124,18 +347,109 @@ class Element(object):
 
         :rtype: str
         """
-        result = self.get_value()
-        last_crlf = self.__crlf
-        for element in self.get_child_elements():
+        if self.is_folded():
+            result, segments = self.__folded
+            last_crlf = segments[-1]
+        else:
+            result = self.get_value()
+            last_crlf = self.get_crlf()
+
+        for element in self.get_child_elements() if self.has_child_elements() else ():
             tag = element.get_tag()
             if tag == gedcom.tags.GEDCOM_TAG_CONCATENATION:
                 result += element.get_value()
-                last_crlf = element.__crlf
+                last_crlf = element.get_crlf()
             elif tag == gedcom.tags.GEDCOM_TAG_CONTINUED:
                 result += last_crlf + element.get_value()
-                last_crlf = element.__crlf
+                last_crlf = element.get_crlf()
         return result
 
+    def is_folded(self):
+        """Checks if `CONC` or `CONT` lines are folded into this element
+
+        :rtype: bool
+        """
+        return self.__folded is not None
+
+    def fold_continuations(self):
+        """Folds the `CONC` and `CONT` child elements at the start of the child elements into this element.
+        Their values are joined into the value returned by `gedcom.element.element.Element.get_multi_line_value()`,
+        only the tag, value length and line ending of each line is kept, so that
+        `gedcom.element.element.Element.to_gedcom_string()` writes the same lines.
+        Lines with a pointer or child elements of their own are not folded.
+        The parse methods of `gedcom.parser.Parser` call this for every element when `fold` is `True`.
+        """
+        children = self.__children
+        if not children:
+            return
+
+        count = 0
+
+        for child in children:
+            if child.get_tag() not in CONTINUATION_TAGS or child.get_pointer() != "" \
+                    or child.get_level() != self.__level + 1 or child.has_child_elements() or child.is_folded():
+                break
+            count += 1
+
+        if count == 0:
+            return
+
+        if self.__folded is not None:
+            multi_line_value, segments = self.__folded
+            parts = [multi_line_value]
+            segments = list(segments)
+            last_crlf = segments[-1]
+        else:
+            parts = [self.__value]
+            segments = []
+            last_crlf = self.__crlf
+
+        for child in children[:count]:
+            tag = child.get_tag()
+            value = child.get_value()
+            if tag == gedcom.tags.GEDCOM_TAG_CONTINUED:
+                parts.append(last_crlf)
+            parts.append(value)
+
+            last_crlf = child.get_crlf()
+            segments.extend((tag, len(value), last_crlf))
+
+        folded_children = children[:count]
+        children.set_elements(children[count:])
+        for child in folded_children:
+            self.notify_change(ELEMENT_REMOVED, child)
+
+        self.__folded = (''.join(parts), tuple(segments))
+
+    def get_folded_elements(self):
+        """Returns the `CONC` and `CONT` lines folded into this element as new elements, which are not
+        added to the tree
+
+        :rtype: list of Element
+        """
+        if not self.is_folded():
+            return []
+
+        multi_line_value, segments = self.__folded
+        last_crlf = self.__crlf
+        position = len(self.__value)
+        elements = []
+
+        for index in range(0, len(segments), 3):
+            tag, length, crlf = segments[index:index + 3]
+            if tag == gedcom.tags.GEDCOM_TAG_CONTINUED:
+                position += len(last_crlf)
+
+            element = Element(self.__level + 1, "", tag, multi_line_value[position:position + length], crlf,
+                              multi_line=False)
+            element.set_parent_element(self)
+            elements.append(element)
+
+            position += length
+            last_crlf = crlf
+
+        return elements
+
     def equals(self, element):
         """Returns true when the specific fields for both elements match.  The comparison includes the
         level, pointer, tag and pointer.  If the tag is 'BIRT','BURI','DEAT','_MILT', or 'RESI', the
@@ -219,9 +533,15 @@ class Element(object):
 
         :type value: str
         """
+        self.__folded = None
         self.set_value('')
-        self.get_child_elements()[:] = [child for child in self.get_child_elements() if
-                                        child.get_tag() not in (gedcom.tags.GEDCOM_TAG_CONCATENATION, gedcom.tags.GEDCOM_TAG_CONTINUED)]
+
+        children = self.__children
+        removed_children = [child for child in children if child.get_tag() in CONTINUATION_TAGS] if children else []
+        if removed_children:
+            children.set_elements([child for child in children if child.get_tag() not in CONTINUATION_TAGS])
+            for child in removed_children:
+                self.notify_change(ELEMENT_REMOVED, child)
 
         lines = value.splitlines()
         if lines:
@@ -234,11 +554,37 @@ class Element(object):
                 self.__add_concatenation(line[n:])
 
     def get_child_elements(self):
-        """Returns the direct child elements of this element
+        """Returns the direct child elements of this element. The returned list is the one of this element,
+        changing it changes the child elements.
 
         :rtype: list of Element
         """
-        return self.__children
+        children = self.__children
+        if children is None:
+            children = self.__children = ChildElementList(self)
+
+        return children
+
+    def has_child_elements(self):
+        """Checks if this element has child elements, without creating a list of child elements
+
+        :rtype: bool
+        """
+        return bool(self.__children)
+
+    def get_child_elements_by_tag(self, tag):
+        """Returns the direct child elements of this element with the given tag
+        The child elements are indexed by tag on the first call, so that further calls take constant time.
+
+        :type tag: str
+
+        :rtype: list of Element
+        """
+        children = self.__children
+        if not children:
+            return []
+
+        return children.get_elements_by_tag(tag)
 
     def get_child_element_value(self, tag=gedcom.tags.GEDCOM_TAG_DATE):
         """Returns the value for a specific child element.
@@ -247,13 +593,11 @@ class Element(object):
 
         :rtype: str
         """
-        result = ""
+        children = self.get_child_elements_by_tag(tag)
+        if children:
+            return children[-1].get_value()
 
-        for element in self.get_child_elements():
-            if element.get_tag() == tag:
-                result = element.get_value()
-
-        return result
+        return ""
     
     def new_child_element(self, tag, pointer="", value=""):
         """Creates and returns a new child element of this element
@@ -275,19 +619,19 @@ class Element(object):
 
         # Differentiate between the type of the new child element
         if tag == gedcom.tags.GEDCOM_TAG_FAMILY:
-            child_element = FamilyElement(self.get_level() + 1, pointer, tag, value, self.__crlf)
+            child_element = FamilyElement(self.get_level() + 1, pointer, tag, value, self.get_crlf())
         elif tag == gedcom.tags.GEDCOM_TAG_FILE:
-            child_element = FileElement(self.get_level() + 1, pointer, tag, value, self.__crlf)
+            child_element = FileElement(self.get_level() + 1, pointer, tag, value, self.get_crlf())
         elif tag == gedcom.tags.GEDCOM_TAG_INDIVIDUAL:
-            child_element = IndividualElement(self.get_level() + 1, pointer, tag, value, self.__crlf)
+            child_element = IndividualElement(self.get_level() + 1, pointer, tag, value, self.get_crlf())
         elif tag == gedcom.tags.GEDCOM_TAG_OBJECT:
-            child_element = ObjectElement(self.get_level() + 1, pointer, tag, value, self.__crlf)
+            child_element = ObjectElement(self.get_level() + 1, pointer, tag, value, self.get_crlf())
         elif tag == gedcom.tags.GEDCOM_TAG_SOURCE:
-            child_element = SourceElement(self.get_level() + 1, pointer, tag, value, self.__crlf)
+            child_element = SourceElement(self.get_level() + 1, pointer, tag, value, self.get_crlf())
         elif tag == gedcom.tags.GEDCOM_TAG_REPOSITORY:
-            child_element = RepositoryElement(self.get_level() + 1, pointer, tag, value, self.__crlf)
+            child_element = RepositoryElement(self.get_level() + 1, pointer, tag, value, self.get_crlf())
         else:
-            child_element = Element(self.get_level() + 1, pointer, tag, value, self.__crlf)
+            child_element = Element(self.get_level() + 1, pointer, tag, value, self.get_crlf())
 
         self.add_child_element(child_element)
 
@@ -298,23 +642,82 @@ class Element(object):
 
         :type element: Element
         """
-        self.get_child_elements().append(element)
+        self.get_child_elements().append_element(element)
         element.set_parent_element(self)
+        self.notify_change(ELEMENT_ADDED, element)
 
         return element
 
     def remove_child_element(self, pointer):
         """ Removes child element based on pointer
+        The element is looked up in an index of the child elements by pointer, built on the first call;
+        removing it from the list still moves the child elements following it.
 
         :type pointer: str
         """
-        x = 0
-        while x < len(self.get_child_elements()):
-            if self.get_child_elements()[x].get_pointer() == pointer:
-                self.get_child_elements().pop(x)
-                break
+        children = self.__children
+        if not children:
+            return
+
+        element = children.get_element_by_pointer(pointer)
+        if element is not None:
+            children.remove_element(element)
+            self.notify_change(ELEMENT_REMOVED, element)
+
+    def remove_child_elements(self, elements):
+        """Removes all child elements with a pointer in `elements`, a collection of pointers such as a `set`,
+        or, if `elements` is a function, all child elements it returns `True` for. The list of child elements
+        is rebuilt in one pass. Returns the removed elements.
+
+        :type elements: set of str or function(Element) -> bool
+
+        :rtype: list of Element
+        """
+        if callable(elements):
+            is_removed = elements
+        else:
+            pointers = elements if isinstance(elements, (set, frozenset, dict)) else set(elements)
+
+            def is_removed(element):
+                return element.get_pointer() in pointers
+
+        children = self.__children
+        if not children:
+            return []
+
+        kept_children = []
+        removed_children = []
+        for child in children:
+            if is_removed(child):
+                removed_children.append(child)
             else:
-                x += 1
+                kept_children.append(child)
+
+        if removed_children:
+            children.set_elements(kept_children)
+            for child in removed_children:
+                self.notify_change(ELEMENT_REMOVED, child)
+
+        return removed_children
+
+    def notify_change(self, change=None, element=None):
+        """Called after this element has been changed through `set_value`, `set_pointer`, `add_child_element`,
+        `remove_child_element` or its list of child elements, and after any of its descendants has been changed.
+        Passes the notification on to the parent element, up to the `gedcom.element.root.RootElement`. Subclasses
+        override it to discard data derived from their child elements.
+
+        `change` is `gedcom.element.element.ELEMENT_ADDED`, `gedcom.element.element.ELEMENT_REMOVED` or
+        `gedcom.element.element.POINTER_CHANGED` with the added, removed or changed `element`,
+        `gedcom.element.element.CHILD_ELEMENTS_CHANGED` with the element whose list of child elements has been
+        changed directly, or `None` if only a value has been changed.
+
+        :type change: str
+
+        :type element: Element
+        """
+        parent = self.__parent
+        if parent is not None:
+            parent.notify_change(change, element)
 
     def get_parent_element(self):
         """Returns the parent element of this element
@@ -358,13 +761,16 @@ class Element(object):
         if self.get_value() != "":
             result += ' ' + self.get_value()
 
-        result += self.__crlf
+        result += self.get_crlf()
 
         if self.get_level() < 0:
             result = ''
 
         if recursive:
-            for child_element in self.get_child_elements():
+            for folded_element in self.get_folded_elements():
+                result += folded_element.to_gedcom_string()
+
+            for child_element in self.get_child_elements() if self.has_child_elements() else ():
                 result += child_element.to_gedcom_string(True)
 
         return result
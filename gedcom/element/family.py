@@ -38,6 +38,8 @@ class NotAnActualFamilyError(Exception):
 
 class FamilyElement(Element):
 
+    __slots__ = ()
+
     def get_tag(self):
         return gedcom.tags.GEDCOM_TAG_FAMILY
     
@@ -121,11 +123,5 @@ class FamilyElement(Element):
 
         :rtype: list
         """
-        result = []
-
-        for child in self.get_child_elements():
-            if child.get_tag() == tag:
-                result.append(child)
-
-        return result
+        return self.get_child_elements_by_tag(tag)
         
\ No newline at end of file
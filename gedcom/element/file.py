@@ -37,6 +37,8 @@ class NotAnActualFileError(Exception):
 
 class FileElement(Element):
 
+    __slots__ = ()
+
     def get_tag(self):
         """Returns the tag of this element from within the GEDCOM file
 
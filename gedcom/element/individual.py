@@ -39,6 +39,26 @@ class NotAnActualIndividualError(Exception):
 
 
 class IndividualElement(Element):
+    """GEDCOM element of an individual
+    The values derived from the child elements by `get_name_data`, `get_gender`, `get_event_by_tag` and
+    `get_event_year_by_tag`, and the methods based on them, are cached until this element or one of its
+    descendants is changed through `set_value`, `add_child_element` or `remove_child_element`.
+    Call `notify_change` after changing a list returned by `get_child_elements` directly.
+    """
+
+    __slots__ = ('__cache',)
+
+    cache_derived_values = True
+    """Set to `False` in subclasses which cannot be notified of changes of their descendants"""
+
+    def __init__(self, level, pointer, tag, value, crlf="\n", multi_line=True):
+        # set first, the value set by `Element` notifies this element of a change
+        self.__cache = None
+        super(IndividualElement, self).__init__(level, pointer, tag, value, crlf, multi_line)
+
+    def notify_change(self, change=None, element=None):
+        self.__cache = None
+        super(IndividualElement, self).notify_change(change, element)
 
     def get_tag(self):
         """Returns the tag of this element from within the GEDCOM file
@@ -52,35 +72,24 @@ class IndividualElement(Element):
 
         :rtype: bool
         """
-        for child in self.get_child_elements():
-            if child.get_tag() == gedcom.tags.GEDCOM_TAG_DEATH:
-                return True
-
-        return False
+        return len(self.get_child_elements_by_tag(gedcom.tags.GEDCOM_TAG_DEATH)) > 0
 
     def is_child(self):
         """Checks if this element is a child of a family
 
         :rtype: bool
         """
-        found_child = False
-
-        for child in self.get_child_elements():
-            if child.get_tag() == gedcom.tags.GEDCOM_TAG_FAMILY_CHILD:
-                found_child = True
-
-        return found_child
+        return len(self.get_child_elements_by_tag(gedcom.tags.GEDCOM_TAG_FAMILY_CHILD)) > 0
 
     def is_private(self):
         """Checks if this individual is marked private
 
         :rtype: bool
         """
-        for child in self.get_child_elements():
-            if child.get_tag() == gedcom.tags.GEDCOM_TAG_PRIVATE:
-                private = child.get_value()
-                if private == 'Y':
-                    return True
+        for child in self.get_child_elements_by_tag(gedcom.tags.GEDCOM_TAG_PRIVATE):
+            private = child.get_value()
+            if private == 'Y':
+                return True
 
         return False
 
@@ -105,6 +114,15 @@ class IndividualElement(Element):
     def get_name_data(self):
         """Returns an individual's name data including sources as a tuple: (`str` given_name, `str` surname, `str` suffix, `list` sources)
 
+        :rtype: tuple
+        """
+        given_name, surname, suffix, sources = self.__get_derived_value(self.__get_name_data)
+
+        return given_name, surname, suffix, list(sources)
+
+    def __get_name_data(self):
+        """Returns the uncached name data, see `get_name_data`
+
         :rtype: tuple
         """
         given_name = ""
@@ -115,34 +133,33 @@ class IndividualElement(Element):
         # Return the first gedcom.tags.GEDCOM_TAG_NAME that is found.
         # Alternatively as soon as we have both the gedcom.tags.GEDCOM_TAG_GIVEN_NAME and _SURNAME return those.
 
-        for child in self.get_child_elements():
-            if child.get_tag() == gedcom.tags.GEDCOM_TAG_NAME:
-                # Some GEDCOM files don't use child tags but instead
-                # place the name in the value of the NAME tag.
-                if child.get_value() != "":
-                    name = child.get_value().split('/')
-                    
-                    if len(name) > 0:
-                        given_name = name[0].strip()
-                        if len(name) > 1:
-                            surname = name[1].strip()
-                        if len(name) > 2:
-                            suffix = name[2].strip()
-
-                for childOfChild in child.get_child_elements():
-                    if childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_GIVEN_NAME:
-                        given_name = childOfChild.get_value()
-
-                    elif childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_SURNAME:
-                        surname = childOfChild.get_value()
-
-                    elif childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_SUFFIX:
-                        suffix = childOfChild.get_value()
-
-                    elif childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_SOURCE:
-                        sources.append(childOfChild)
-                    
-                return given_name, surname, suffix, sources
+        for child in self.get_child_elements_by_tag(gedcom.tags.GEDCOM_TAG_NAME):
+            # Some GEDCOM files don't use child tags but instead
+            # place the name in the value of the NAME tag.
+            if child.get_value() != "":
+                name = child.get_value().split('/')
+
+                if len(name) > 0:
+                    given_name = name[0].strip()
+                    if len(name) > 1:
+                        surname = name[1].strip()
+                    if len(name) > 2:
+                        suffix = name[2].strip()
+
+            for childOfChild in child.get_child_elements():
+                if childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_GIVEN_NAME:
+                    given_name = childOfChild.get_value()
+
+                elif childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_SURNAME:
+                    surname = childOfChild.get_value()
+
+                elif childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_SUFFIX:
+                    suffix = childOfChild.get_value()
+
+                elif childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_SOURCE:
+                    sources.append(childOfChild)
+
+            return given_name, surname, suffix, sources
 
         # If we reach here we are probably returning empty strings
         return given_name, surname, suffix, sources
@@ -152,7 +169,7 @@ class IndividualElement(Element):
 
         :rtype: list
         """
-        return [a.get_value() for a in self.get_child_elements() if a.get_tag() == gedcom.tags.GEDCOM_TAG_NAME]
+        return [a.get_value() for a in self.get_child_elements_by_tag(gedcom.tags.GEDCOM_TAG_NAME)]
 
     def get_first_name(self):
         """Returns an individual's first name
@@ -199,17 +216,20 @@ class IndividualElement(Element):
 
         :rtype: str
         """
-        gender = ""
-
-        for child in self.get_child_elements():
-            if child.get_tag() == gedcom.tags.GEDCOM_TAG_SEX:
-                gender = child.get_value()
-
-        return gender
+        return self.__get_derived_value(self.get_child_element_value, gedcom.tags.GEDCOM_TAG_SEX)
 
     def get_event_by_tag(self, tag=gedcom.tags.GEDCOM_TAG_BIRTH):
         """Returns the data of a person formatted as a tuple: (`str` date, `str` place, `list` sources)
 
+        :rtype: tuple
+        """
+        date, place, sources = self.__get_derived_value(self.__get_event_by_tag, tag)
+
+        return date, place, list(sources)
+
+    def __get_event_by_tag(self, tag):
+        """Returns the uncached event data, see `get_event_by_tag`
+
         :rtype: tuple
         """
         date = "" 
@@ -217,25 +237,31 @@ class IndividualElement(Element):
         sources = []
 
         # get primary date, place and sources
-        for child in self.get_child_elements():
-            if child.get_tag() == tag:
-                for childOfChild in child.get_child_elements():
-                    if childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_DATE:
-                        date = childOfChild.get_value()
+        for child in self.get_child_elements_by_tag(tag):
+            for childOfChild in child.get_child_elements():
+                if childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_DATE:
+                    date = childOfChild.get_value()
 
-                    elif childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_PLACE:
-                        place = childOfChild.get_value()
+                elif childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_PLACE:
+                    place = childOfChild.get_value()
 
-                    elif childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_SOURCE:
-                        sources.append(childOfChild)
+                elif childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_SOURCE:
+                    sources.append(childOfChild)
 
-                break
+            break
 
         return date, place, sources
 
     def get_event_year_by_tag(self, tag=gedcom.tags.GEDCOM_TAG_BIRTH):
         """Returns the year for the tag of a person in integer format
 
+        :rtype: int
+        """
+        return self.__get_derived_value(self.__get_event_year_by_tag, tag)
+
+    def __get_event_year_by_tag(self, tag):
+        """Returns the uncached event year, see `get_event_year_by_tag`
+
         :rtype: int
         """
         date_split = self.get_event_by_tag(tag)[0].split()
@@ -255,6 +281,25 @@ class IndividualElement(Element):
         except ValueError:
             return -1
 
+    def __get_derived_value(self, method, *args):
+        """Returns the result of `method` called with `args`, cached until this element is notified of a change
+
+        :type method: function
+
+        :rtype: object
+        """
+        if not self.cache_derived_values:
+            return method(*args)
+
+        key = (method.__name__,) + args
+        if self.__cache is None:
+            self.__cache = {}
+        elif key in self.__cache:
+            return self.__cache[key]
+
+        value = self.__cache[key] = method(*args)
+        return value
+
     def get_sources_by_tag_and_date(self, tag, date):
         """Returns the sources for a tag and date
 
@@ -278,24 +323,23 @@ class IndividualElement(Element):
         sources = []
 
         # get primary date, place and sources
-        for child in self.get_child_elements():
-            if child.get_tag() == tag:
-                tag_sources = []
-                tag_date = ""
-                tag_place = ""
+        for child in self.get_child_elements_by_tag(tag):
+            tag_sources = []
+            tag_date = ""
+            tag_place = ""
 
-                for childOfChild in child.get_child_elements():
-                    if childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_DATE:
-                        tag_date = childOfChild.get_value()
+            for childOfChild in child.get_child_elements():
+                if childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_DATE:
+                    tag_date = childOfChild.get_value()
 
-                    elif childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_PLACE:
-                        tag_place = childOfChild.get_value()
+                elif childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_PLACE:
+                    tag_place = childOfChild.get_value()
 
-                    elif childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_SOURCE:
-                        tag_sources.append(childOfChild)
+                elif childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_SOURCE:
+                    tag_sources.append(childOfChild)
 
-                if (date is None or date == tag_date) and (place is None or place == tag_place):
-                    sources += tag_sources
+            if (date is None or date == tag_date) and (place is None or place == tag_place):
+                sources += tag_sources
 
         return sources
 
@@ -309,20 +353,19 @@ class IndividualElement(Element):
         #if len(date.split()) <= 1:
         #    return sources
 
-        for child in self.get_child_elements():
-            if child.get_tag() == tag:
-                tag_sources = []
-                tag_date = ""
+        for child in self.get_child_elements_by_tag(tag):
+            tag_sources = []
+            tag_date = ""
 
-                for childOfChild in child.get_child_elements():
-                    if childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_DATE:
-                        tag_date = childOfChild.get_value()
+            for childOfChild in child.get_child_elements():
+                if childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_DATE:
+                    tag_date = childOfChild.get_value()
 
-                    elif childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_SOURCE:
-                        tag_sources.append(childOfChild)
+                elif childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_SOURCE:
+                    tag_sources.append(childOfChild)
 
-                if date == tag_date[:len(date)]:
-                    sources += tag_sources
+            if date == tag_date[:len(date)]:
+                sources += tag_sources
 
         return sources
 
@@ -336,21 +379,20 @@ class IndividualElement(Element):
         if len(year) != 4:
             return sources
         
-        for child in self.get_child_elements():
-            if child.get_tag() == tag:
-                tag_sources = []
-                tag_date = ""
+        for child in self.get_child_elements_by_tag(tag):
+            tag_sources = []
+            tag_date = ""
 
-                for childOfChild in child.get_child_elements():
-                    if childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_DATE:
-                        tag_date = childOfChild.get_value()
+            for childOfChild in child.get_child_elements():
+                if childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_DATE:
+                    tag_date = childOfChild.get_value()
 
-                    elif childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_SOURCE:
-                        tag_sources.append(childOfChild)
+                elif childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_SOURCE:
+                    tag_sources.append(childOfChild)
 
-                if len(tag_date) >= 4:
-                    if (year == tag_date[-4:] and tag_date[:3] != 'ABT'):
-                        sources += tag_sources
+            if len(tag_date) >= 4:
+                if (year == tag_date[-4:] and tag_date[:3] != 'ABT'):
+                    sources += tag_sources
 
         return sources
 
@@ -362,22 +404,21 @@ class IndividualElement(Element):
         results = []
         
         # get primary date, place and sources
-        for child in self.get_child_elements():
-            if child.get_tag() == tag:
-                date, place = "", ""
-                sources = []
+        for child in self.get_child_elements_by_tag(tag):
+            date, place = "", ""
+            sources = []
 
-                for childOfChild in child.get_child_elements():
-                    if childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_DATE:
-                        date = childOfChild.get_value()
+            for childOfChild in child.get_child_elements():
+                if childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_DATE:
+                    date = childOfChild.get_value()
 
-                    elif childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_PLACE:
-                        place = childOfChild.get_value()
+                elif childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_PLACE:
+                    place = childOfChild.get_value()
 
-                    elif childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_SOURCE:
-                        sources.append(childOfChild)
+                elif childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_SOURCE:
+                    sources.append(childOfChild)
 
-                results.append((date, place, sources))
+            results.append((date, place, sources))
 
         return results
     
@@ -510,25 +551,24 @@ class IndividualElement(Element):
         """
         census = []
 
-        for child in self.get_child_elements():
-            if child.get_tag() == gedcom.tags.GEDCOM_TAG_CENSUS:
+        for child in self.get_child_elements_by_tag(gedcom.tags.GEDCOM_TAG_CENSUS):
 
-                date = ''
-                place = ''
-                sources = []
+            date = ''
+            place = ''
+            sources = []
 
-                for childOfChild in child.get_child_elements():
+            for childOfChild in child.get_child_elements():
 
-                    if childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_DATE:
-                        date = childOfChild.get_value()
+                if childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_DATE:
+                    date = childOfChild.get_value()
 
-                    elif childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_PLACE:
-                        place = childOfChild.get_value()
+                elif childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_PLACE:
+                    place = childOfChild.get_value()
 
-                    elif childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_SOURCE:
-                        sources.append(childOfChild.get_value())
+                elif childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_SOURCE:
+                    sources.append(childOfChild.get_value())
 
-                census.append((date, place, sources))
+            census.append((date, place, sources))
 
         return census
 
@@ -539,11 +579,10 @@ class IndividualElement(Element):
         """
         date = ""
 
-        for child in self.get_child_elements():
-            if child.get_tag() == gedcom.tags.GEDCOM_TAG_CHANGE:
-                for childOfChild in child.get_child_elements():
-                    if childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_DATE:
-                        date = childOfChild.get_value()
+        for child in self.get_child_elements_by_tag(gedcom.tags.GEDCOM_TAG_CHANGE):
+            for childOfChild in child.get_child_elements():
+                if childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_DATE:
+                    date = childOfChild.get_value()
 
         return date
 
@@ -552,26 +591,14 @@ class IndividualElement(Element):
 
         :rtype: str
         """
-        notes = ""
-
-        for child in self.get_child_elements():
-            if child.get_tag() == gedcom.tags.GEDCOM_TAG_NOTE:
-                notes = child.get_value()
-
-        return notes
+        return self.get_child_element_value(gedcom.tags.GEDCOM_TAG_NOTE)
     
     def get_occupation(self):
         """Returns the occupation of a person
 
         :rtype: str
         """
-        occupation = ""
-
-        for child in self.get_child_elements():
-            if child.get_tag() == gedcom.tags.GEDCOM_TAG_OCCUPATION:
-                occupation = child.get_value()
-
-        return occupation
+        return self.get_child_element_value(gedcom.tags.GEDCOM_TAG_OCCUPATION)
 
     def birth_year_match(self, year):
         """Returns `True` if the given year matches the birth year of this person
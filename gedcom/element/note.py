@@ -36,6 +36,8 @@ class NotAnActualFileError(Exception):
 
 class NoteElement(Element):
 
+    __slots__ = ()
+
     def get_tag(self):
         """Returns the tag of this element from within the GEDCOM file
 
@@ -48,13 +50,13 @@ class NoteElement(Element):
 
         :rtype: str
         """
-        results = [""]
-        
-        for element in self.get_child_elements():
+        results = [[]]
+
+        for element in self.get_folded_elements() + self.get_child_elements():
             if element.get_tag() == gedcom.tags.GEDCOM_TAG_CONCATENATION:
-                results[-1] += element.get_value()
-            
+                results[-1].append(element.get_value())
+
             if element.get_tag() == gedcom.tags.GEDCOM_TAG_CONTINUED:
-                results.append(element.get_value())
-                        
-        return results
\ No newline at end of file
+                results.append([element.get_value()])
+
+        return [''.join(parts) for parts in results]
\ No newline at end of file
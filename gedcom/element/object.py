@@ -37,6 +37,8 @@ class NotAnActualObjectError(Exception):
 
 class ObjectElement(Element):
 
+    __slots__ = ()
+
     def get_tag(self):
         return gedcom.tags.GEDCOM_TAG_OBJECT
 
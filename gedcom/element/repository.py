@@ -38,6 +38,8 @@ class NotAnActualSourceError(Exception):
 
 class RepositoryElement(Element):
 
+    __slots__ = ()
+
     def get_tag(self):
         return gedcom.tags.GEDCOM_TAG_REPOSITORY
 
@@ -33,5 +33,21 @@ from gedcom.element.element import Element
 class RootElement(Element):
     """Virtual GEDCOM root element containing all logical records as children"""
 
+    __slots__ = ('__listener',)
+
     def __init__(self, level=-1, pointer="", tag="ROOT", value="", crlf="\n", multi_line=True):
+        self.__listener = None
         super(RootElement, self).__init__(level, pointer, tag, value, crlf, multi_line)
+
+    def set_change_listener(self, listener):
+        """Sets a function called with the `change` and `element` of every change of the tree passed to
+        `gedcom.element.element.Element.notify_change()`, for elements added, removed or re-pointered anywhere
+        below this element. `gedcom.parser.Parser` keeps its element list and dictionary up to date with it.
+
+        :type listener: function (change as str, element as Element)
+        """
+        self.__listener = listener
+
+    def notify_change(self, change=None, element=None):
+        if change is not None and self.__listener is not None:
+            self.__listener(change, element)
@@ -38,6 +38,8 @@ class NotAnActualSourceError(Exception):
 
 class SourceElement(Element):
 
+    __slots__ = ()
+
     def get_tag(self):
         return gedcom.tags.GEDCOM_TAG_SOURCE
 
@@ -46,13 +48,7 @@ class SourceElement(Element):
 
         :rtype: list
         """
-        sources = []
-
-        for child in self.get_child_elements():
-            if child.get_tag() == gedcom.tags.GEDCOM_TAG_OBJECT:
-                sources.append(child)
-
-        return sources
+        return self.get_child_elements_by_tag(gedcom.tags.GEDCOM_TAG_OBJECT)
 
     def get_author(self):
         """Returns name of author
@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+
+# Python GEDCOM Parser
+#
+# Copyright (C) 2022-2025 Mark Wing (mark @ markwing.net)
+# Copyright (C) 2018 Damon Brodie (damon.brodie at gmail.com)
+# Copyright (C) 2018-2019 Nicklas Reincke (contact at reynke.com)
+# Copyright (C) 2016 Andreas Oberritter
+# Copyright (C) 2012 Madeleine Price Ball
+# Copyright (C) 2005 Daniel Zappala (zappala at cs.byu.edu)
+# Copyright (C) 2005 Brigham Young University
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Further information about the license: http://www.gnu.org/licenses/gpl-2.0.html
+
+
+"""
+Character encodings of GEDCOM files, used by `gedcom.reader`.
+
+`gedcom.encoding.detect_encoding` sniffs the encoding from the start of a file: a byte order mark,
+the byte pattern of UTF-16 without one, or the `CHAR` line of the `HEAD` record.
+
+ANSEL (ANSI Z39.47), the encoding of many older GEDCOM files, is not a Python codec. It is decoded
+in bulk through a precomputed charmap decoding table. ANSEL writes combining diacritics before the letter
+they belong to, Unicode after it, so they are moved behind their letter and composed where possible (NFC).
+"""
+
+import codecs
+import re as regex
+import unicodedata
+
+ANSEL = 'ansel'
+"""Name of the ANSEL encoding, as accepted by `gedcom.encoding.get_incremental_decoder`"""
+
+DEFAULT_ENCODING = 'utf-8-sig'
+"""Encoding used when the start of a file does not tell otherwise"""
+
+HEADER_SIZE = 64 * 1024
+"""Number of bytes searched for the `CHAR` line if the `HEAD` record does not end before"""
+
+# `HEAD.CHAR` values of files with an ASCII compatible byte pattern. Files declaring `UNICODE`
+# without being UTF-16 are almost always UTF-8.
+CHARACTER_SETS = {
+    'ANSEL': ANSEL,
+    'UTF-8': DEFAULT_ENCODING,
+    'UTF8': DEFAULT_ENCODING,
+    'UNICODE': DEFAULT_ENCODING,
+    'ASCII': DEFAULT_ENCODING,
+    'ANSI': 'cp1252',
+    'IBMPC': 'cp437',
+}
+
+BYTE_ORDER_MARKS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+ASCII_INCOMPATIBLE_ENCODINGS = ('utf-16', 'utf-16-le', 'utf-16-be', 'utf-32', 'utf-32-le', 'utf-32-be')
+"""Encodings in which line endings and level numbers are not single ASCII bytes"""
+
+HEADER_START = b'0 HEAD'
+
+CHAR_PATTERN = regex.compile(rb'[\r\n]1 CHAR ([^\r\n]*)')
+
+HEADER_END_PATTERN = regex.compile(rb'[\r\n]0 ')
+
+ANSEL_CHARACTERS = {
+    0x88: '\u0098',  # non-sorting character sequence begins
+    0x89: '\u009c',  # non-sorting character sequence ends
+    0x8d: '\u200d',  # zero width joiner
+    0x8e: '\u200c',  # zero width non-joiner
+    0xa1: '\u0141',  # latin capital letter l with stroke
+    0xa2: '\u00d8',  # latin capital letter o with stroke
+    0xa3: '\u0110',  # latin capital letter d with stroke
+    0xa4: '\u00de',  # latin capital letter thorn
+    0xa5: '\u00c6',  # latin capital letter ae
+    0xa6: '\u0152',  # latin capital ligature oe
+    0xa7: '\u02b9',  # soft sign
+    0xa8: '\u00b7',  # middle dot
+    0xa9: '\u266d',  # musical flat
+    0xaa: '\u00ae',  # registered sign
+    0xab: '\u00b1',  # plus-minus
+    0xac: '\u01a0',  # latin capital letter o with horn
+    0xad: '\u01af',  # latin capital letter u with horn
+    0xae: '\u02bc',  # alif
+    0xb0: '\u02bb',  # ayn
+    0xb1: '\u0142',  # latin small letter l with stroke
+    0xb2: '\u00f8',  # latin small letter o with stroke
+    0xb3: '\u0111',  # latin small letter d with stroke
+    0xb4: '\u00fe',  # latin small letter thorn
+    0xb5: '\u00e6',  # latin small letter ae
+    0xb6: '\u0153',  # latin small ligature oe
+    0xb7: '\u02ba',  # hard sign
+    0xb8: '\u0131',  # dotless i
+    0xb9: '\u00a3',  # pound sign
+    0xba: '\u00f0',  # latin small letter eth
+    0xbc: '\u01a1',  # latin small letter o with horn
+    0xbd: '\u01b0',  # latin small letter u with horn
+    0xbe: '\u25a1',  # empty box (GEDCOM)
+    0xbf: '\u25a0',  # black box (GEDCOM)
+    0xc0: '\u00b0',  # degree sign
+    0xc1: '\u2113',  # script small l
+    0xc2: '\u2117',  # sound recording copyright
+    0xc3: '\u00a9',  # copyright sign
+    0xc4: '\u266f',  # musical sharp
+    0xc5: '\u00bf',  # inverted question mark
+    0xc6: '\u00a1',  # inverted exclamation mark
+    0xc7: '\u00df',  # latin small letter sharp s
+    0xc8: '\u20ac',  # euro sign
+    0xcd: '\u0065',  # midline e (GEDCOM)
+    0xce: '\u006f',  # midline o (GEDCOM)
+    0xcf: '\u00df',  # latin small letter sharp s (GEDCOM)
+}
+
+ANSEL_COMBINING_CHARACTERS = {
+    0xe0: '\u0309',  # hook above
+    0xe1: '\u0300',  # grave
+    0xe2: '\u0301',  # acute
+    0xe3: '\u0302',  # circumflex
+    0xe4: '\u0303',  # tilde
+    0xe5: '\u0304',  # macron
+    0xe6: '\u0306',  # breve
+    0xe7: '\u0307',  # dot above
+    0xe8: '\u0308',  # diaeresis
+    0xe9: '\u030c',  # caron
+    0xea: '\u030a',  # ring above
+    0xeb: '\ufe20',  # ligature, left half
+    0xec: '\ufe21',  # ligature, right half
+    0xed: '\u0315',  # comma above right
+    0xee: '\u030b',  # double acute
+    0xef: '\u0310',  # candrabindu
+    0xf0: '\u0327',  # cedilla
+    0xf1: '\u0328',  # ogonek
+    0xf2: '\u0323',  # dot below
+    0xf3: '\u0324',  # diaeresis below
+    0xf4: '\u0325',  # ring below
+    0xf5: '\u0333',  # double low line
+    0xf6: '\u0332',  # low line
+    0xf7: '\u0326',  # comma below
+    0xf8: '\u031c',  # left half ring below
+    0xf9: '\u032e',  # breve below
+    0xfa: '\ufe22',  # double tilde, left half
+    0xfb: '\ufe23',  # double tilde, right half
+    0xfe: '\u0313',  # comma above
+}
+
+# Decoding table for `codecs.charmap_decode`: the Unicode character of every byte value,
+# U+FFFD for bytes undefined in ANSEL
+ANSEL_DECODING_TABLE = ''.join(
+    chr(byte) if byte < 0x80 else ANSEL_CHARACTERS.get(byte, ANSEL_COMBINING_CHARACTERS.get(byte, '\ufffd'))
+    for byte in range(0x100))
+
+ANSEL_COMBINING_BYTES = b'[' + bytes(ANSEL_COMBINING_CHARACTERS) + b']'
+
+# Combining diacritics at the end of a chunk, that belong to a character in the next chunk
+ANSEL_TRAILING_DIACRITICS_PATTERN = regex.compile(ANSEL_COMBINING_BYTES + b'+\\Z')
+
+# Combining diacritics followed by the character they belong to
+ANSEL_DIACRITICS_PATTERN = regex.compile(b'(' + ANSEL_COMBINING_BYTES + b'+)([^\\r\\n' + ANSEL_COMBINING_BYTES[1:] + b')')
+
+
+def decode_ansel(data):
+    """Decodes ANSEL bytes
+
+    :type data: bytes
+
+    :rtype: str
+    """
+    if ANSEL_DIACRITICS_PATTERN.search(data) is None:
+        return codecs.charmap_decode(data, 'strict', ANSEL_DECODING_TABLE)[0]
+
+    # every character is a single byte, so the diacritics can be moved before decoding
+    data = ANSEL_DIACRITICS_PATTERN.sub(rb'\2\1', data)
+
+    return unicodedata.normalize('NFC', codecs.charmap_decode(data, 'strict', ANSEL_DECODING_TABLE)[0])
+
+
+class AnselIncrementalDecoder(codecs.IncrementalDecoder):
+    """Decodes ANSEL bytes arriving in chunks. Combining diacritics at the end of a chunk are
+    kept until the next one, which starts with the character they belong to."""
+
+    def __init__(self, errors='strict'):
+        super(AnselIncrementalDecoder, self).__init__(errors)
+        self.__pending = b''
+
+    def decode(self, data, final=False):
+        data = self.__pending + data
+        self.__pending = b''
+
+        if not final:
+            diacritics = ANSEL_TRAILING_DIACRITICS_PATTERN.search(data)
+            if diacritics is not None:
+                self.__pending = data[diacritics.start():]
+                data = data[:diacritics.start()]
+
+        return decode_ansel(data)
+
+    def reset(self):
+        self.__pending = b''
+
+
+def get_incremental_decoder(encoding):
+    """Returns an incremental decoder for a Python codec name or `gedcom.encoding.ANSEL`
+
+    :type encoding: str
+
+    :rtype: codecs.IncrementalDecoder
+    """
+    if encoding.lower() == ANSEL:
+        return AnselIncrementalDecoder()
+
+    return codecs.getincrementaldecoder(encoding)()
+
+
+def is_ascii_compatible(encoding):
+    """Returns `True` if line endings and level numbers are single ASCII bytes in `encoding`,
+    so that a file can be split into lines and records without decoding it
+
+    :type encoding: str
+
+    :rtype: bool
+    """
+    return encoding.lower() not in ASCII_INCOMPATIBLE_ENCODINGS
+
+
+def detect_encoding(data, final=True):
+    """Returns the encoding of GEDCOM data starting with `data`: from a byte order mark, the byte
+    pattern of UTF-16 without one, or the `CHAR` line of the `HEAD` record, in this order.
+    `gedcom.encoding.DEFAULT_ENCODING` is returned if neither is found. If `final` is `False` more
+    data may follow, and `None` is returned while it might still change the result.
+
+    :type data: bytes
+
+    :type final: bool
+
+    :rtype: str
+    """
+    for byte_order_mark, encoding in BYTE_ORDER_MARKS:
+        if data.startswith(byte_order_mark):
+            return encoding
+
+    if not final and len(data) < len(HEADER_START):
+        return None
+
+    if data.startswith(b'0\x00'):
+        return 'utf-16-le'
+    if data.startswith(b'\x000'):
+        return 'utf-16-be'
+
+    # without a `HEAD` record there is no `CHAR` line
+    if not data.startswith(HEADER_START):
+        return DEFAULT_ENCODING
+
+    header_end = HEADER_END_PATTERN.search(data)
+    header = data[:header_end.start()] if header_end is not None else data
+
+    char = CHAR_PATTERN.search(header)
+    if char is not None:
+        character_set = char.group(1).strip().decode('ascii', 'replace').upper()
+        if character_set in CHARACTER_SETS:
+            return CHARACTER_SETS[character_set]
+
+        try:
+            encoding = codecs.lookup(character_set).name
+        except LookupError:
+            return DEFAULT_ENCODING
+
+        # the `CHAR` line has just been read as ASCII, so the data cannot be in such an encoding
+        return encoding if is_ascii_compatible(encoding) else DEFAULT_ENCODING
+
+    if not final and header_end is None and len(data) < HEADER_SIZE:
+        return None
+
+    return DEFAULT_ENCODING
+
+
+def detect_file_encoding(file_path):
+    """Returns the encoding of a GEDCOM file, see `gedcom.encoding.detect_encoding`
+
+    :type file_path: str
+
+    :rtype: str
+    """
+    with open(file_path, 'rb') as gedcom_file:
+        return detect_encoding(gedcom_file.read(HEADER_SIZE))
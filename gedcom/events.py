@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+
+# Python GEDCOM Parser
+#
+# Copyright (C) 2022-2025 Mark Wing (mark @ markwing.net)
+# Copyright (C) 2018 Damon Brodie (damon.brodie at gmail.com)
+# Copyright (C) 2018-2019 Nicklas Reincke (contact at reynke.com)
+# Copyright (C) 2016 Andreas Oberritter
+# Copyright (C) 2012 Madeleine Price Ball
+# Copyright (C) 2005 Daniel Zappala (zappala at cs.byu.edu)
+# Copyright (C) 2005 Brigham Young University
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Further information about the license: http://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+Event-driven GEDCOM reader. Instead of building a tree of `gedcom.element.element.Element` objects
+like `gedcom.parser.Parser`, `gedcom.events.EventParser` calls the methods of a
+`gedcom.events.EventHandler` for every line it reads:
+
+* `start_record` and `end_record` for the logical records at level 0
+* `start_element` and `end_element` for all lines below them
+
+An element's end event is sent after the end events of all of its sub-elements.
+"""
+
+from gedcom.reader import decode_lines
+from gedcom.tokenizer import tokenize
+
+
+class EventHandler(object):
+    """Receives the events of a `gedcom.events.EventParser`. All methods do nothing;
+    override the ones needed."""
+
+    def start_record(self, level, pointer, tag, value):
+        """Called when a logical record (level 0) starts
+
+        :type level: int
+
+        :type pointer: str
+
+        :type tag: str
+
+        :type value: str
+        """
+        pass
+
+    def end_record(self, level, pointer, tag, value):
+        """Called when a logical record (level 0) and all of its sub-elements have been read
+
+        :type level: int
+
+        :type pointer: str
+
+        :type tag: str
+
+        :type value: str
+        """
+        pass
+
+    def start_element(self, level, pointer, tag, value):
+        """Called when an element below level 0 starts
+
+        :type level: int
+
+        :type pointer: str
+
+        :type tag: str
+
+        :type value: str
+        """
+        pass
+
+    def end_element(self, level, pointer, tag, value):
+        """Called when an element below level 0 and all of its sub-elements have been read
+
+        :type level: int
+
+        :type pointer: str
+
+        :type tag: str
+
+        :type value: str
+        """
+        pass
+
+
+class EventParser(object):
+    """Reads GEDCOM 5.5 formatted data and sends its structure to a `gedcom.events.EventHandler`.
+    No `gedcom.element.element.Element` objects are created. Format violations raise the same
+    `gedcom.tokenizer.GedcomFormatViolationError` as `gedcom.parser.Parser`.
+    """
+
+    def __init__(self, handler):
+        """
+        :type handler: EventHandler
+        """
+        self.__handler = handler
+
+    def parse_file(self, file_path, strict=True):
+        """Opens and reads a file, from the given file path, as GEDCOM 5.5 formatted data
+
+        :type file_path: str
+
+        :type strict: bool
+        """
+        with open(file_path, 'rb') as gedcom_stream:
+            self.parse(gedcom_stream, strict)
+
+    def parse(self, gedcom_stream, strict=True):
+        """Reads a stream, or an array of lines, as GEDCOM 5.5 formatted data
+
+        :type gedcom_stream: a binary file stream, or bytes array of lines with new line at the end
+
+        :type strict: bool
+        """
+        lines = decode_lines(gedcom_stream)
+
+        # (level, pointer, tag, value) of the open elements, outermost first
+        open_elements = []
+        last_level = -1
+        last_tag = "ROOT"
+        line_number = 1
+
+        for line in lines:
+            level, pointer, tag, value, crlf = tokenize(line_number, line, last_level, last_tag, strict)
+
+            while open_elements and open_elements[-1][0] >= level:
+                self.__end(open_elements.pop())
+
+            element = (level, pointer, tag, value)
+            open_elements.append(element)
+
+            if level == 0:
+                self.__handler.start_record(*element)
+            else:
+                self.__handler.start_element(*element)
+
+            last_level = level
+            last_tag = tag
+            line_number += 1
+
+        while open_elements:
+            self.__end(open_elements.pop())
+
+    def __end(self, element):
+        """Sends the end event of an element
+
+        :type element: tuple
+        """
+        if element[0] == 0:
+            self.__handler.end_record(*element)
+        else:
+            self.__handler.end_element(*element)
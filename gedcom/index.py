@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+
+# Python GEDCOM Parser
+#
+# Copyright (C) 2022-2025 Mark Wing (mark @ markwing.net)
+# Copyright (C) 2018 Damon Brodie (damon.brodie at gmail.com)
+# Copyright (C) 2018-2019 Nicklas Reincke (contact at reynke.com)
+# Copyright (C) 2016 Andreas Oberritter
+# Copyright (C) 2012 Madeleine Price Ball
+# Copyright (C) 2005 Daniel Zappala (zappala at cs.byu.edu)
+# Copyright (C) 2005 Brigham Young University
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Further information about the license: http://www.gnu.org/licenses/gpl-2.0.html
+
+
+"""
+Offset index of the logical records of a GEDCOM file, used by `gedcom.parser.Parser` when parsing
+with `lazy=True`.
+
+A single scan over the memory-mapped file records where each level 0 record starts and ends and,
+if it has one, its pointer. The `gedcom.element.element.Element` subtree of a record is only built
+when the record is first accessed, through its pointer or its position in the file.
+"""
+
+from collections.abc import Mapping
+from io import BytesIO
+import mmap as memory_map
+import os
+import re as regex
+
+from gedcom.encoding import detect_encoding, HEADER_SIZE
+from gedcom.reader import count_lines
+from gedcom.tokenizer import GedcomFormatViolationError
+
+# A level 0 line, following a line ending, capturing the pointer of the record if it has one.
+# The line ending is matched instead of looked behind at, which is several times faster.
+RECORD_PATTERN = regex.compile(rb'[\r\n]0 (?:(@[^@\r\n]+@) )?')
+
+# The first line of the file, after an optional byte order mark, if it is a level 0 line
+FIRST_RECORD_PATTERN = regex.compile(rb'(?:\xef\xbb\xbf)?0 (?:(@[^@\r\n]+@) )?')
+
+
+class RecordIndex(Mapping):
+    """Read-only mapping of the pointers of the logical records of a GEDCOM file to their elements.
+    Records are built on first access and kept afterwards. The file stays memory-mapped until
+    `gedcom.index.RecordIndex.close()` is called.
+
+    Each range of the file starting with a level 0 line is parsed on its own, so in non-strict mode
+    a malformed level 0 line is never appended to the preceding record. The encoding of the file,
+    detected from its start, must be ASCII compatible, see `gedcom.encoding.is_ascii_compatible`.
+    """
+
+    def __init__(self, file_path, strict=True, parent_element=None):
+        """
+        :type file_path: str
+
+        :type strict: bool
+
+        :type parent_element: Element
+        """
+        self.__strict = strict
+        self.__parent_element = parent_element
+
+        # [start offset, end offset, element or None] of each record, in file order
+        self.__records = []
+        self.__pointers = {}
+        self.__buffer = b''
+
+        with open(file_path, 'rb') as gedcom_file:
+            # an empty file cannot be mapped
+            if os.fstat(gedcom_file.fileno()).st_size > 0:
+                self.__buffer = memory_map.mmap(gedcom_file.fileno(), 0, access=memory_map.ACCESS_READ)
+
+        self.__encoding = detect_encoding(self.__buffer[:HEADER_SIZE])
+        self.__scan()
+
+    def __scan(self):
+        """Records the byte range and the pointer of each level 0 record"""
+        size = len(self.__buffer)
+        if size == 0:
+            return
+
+        # anything before the first level 0 line belongs to the first record
+        first_match = FIRST_RECORD_PATTERN.match(self.__buffer)
+        self.__add_record(0, size, first_match.group(1) if first_match is not None else None)
+
+        for match in RECORD_PATTERN.finditer(self.__buffer):
+            start = match.start() + 1
+            self.__records[-1][1] = start
+            self.__add_record(start, size, match.group(1))
+
+    def __add_record(self, start, end, pointer):
+        """Appends the byte range and the pointer of a record
+
+        :type start: int
+
+        :type end: int
+
+        :type pointer: bytes
+        """
+        pointer = pointer.decode('utf-8') if pointer is not None else ""
+        if pointer:
+            self.__pointers[pointer] = len(self.__records)
+
+        self.__records.append([start, end, None])
+
+    def __getitem__(self, pointer):
+        return self.get_record(self.__pointers[pointer])
+
+    def __contains__(self, pointer):
+        return pointer in self.__pointers
+
+    def __iter__(self):
+        return iter(self.__pointers)
+
+    def __len__(self):
+        return len(self.__pointers)
+
+    def get_record_count(self):
+        """Returns the number of logical records in the file, with or without a pointer
+
+        :rtype: int
+        """
+        return len(self.__records)
+
+    def get_offsets(self, pointer):
+        """Returns the byte offset and length of the record identified by `pointer`
+
+        :type pointer: str
+
+        :rtype: tuple
+        """
+        start, end = self.__records[self.__pointers[pointer]][:2]
+        return start, end - start
+
+    def is_loaded(self, pointer):
+        """Returns `True` if the record identified by `pointer` has already been built
+
+        :type pointer: str
+
+        :rtype: bool
+        """
+        return self.__records[self.__pointers[pointer]][2] is not None
+
+    def get_record(self, index):
+        """Returns the logical record at position `index` in the file, building it on first access
+
+        :type index: int
+
+        :rtype: Element
+        """
+        record = self.__records[index]
+        if record[2] is None:
+            record[2] = self.__build_record(record[0], record[1])
+
+        return record[2]
+
+    def get_records(self):
+        """Returns all logical records in file order, building the ones not yet accessed
+
+        :rtype: list of Element
+        """
+        return [self.get_record(index) for index in range(len(self.__records))]
+
+    def close(self):
+        """Releases the memory-mapped file. Records not yet built cannot be accessed afterwards."""
+        if isinstance(self.__buffer, memory_map.mmap):
+            self.__buffer.close()
+        self.__buffer = b''
+
+    def __build_record(self, start, end):
+        """Parses the byte range of a single record
+
+        :type start: int
+
+        :type end: int
+
+        :rtype: Element
+        """
+        # imported here to avoid a circular import
+        from gedcom.parser import Parser
+
+        data = BytesIO(self.__buffer[start:end])
+
+        try:
+            record = next(Parser().iter_records(data, self.__strict, 1, self.__encoding))
+        except GedcomFormatViolationError:
+            # counting lines is only worth it for the error message
+            line_number = count_lines(self.__buffer, 0, start) + 1
+            data.seek(0)
+            record = next(Parser().iter_records(data, self.__strict, line_number, self.__encoding))
+
+        if self.__parent_element is not None:
+            record.set_parent_element(self.__parent_element)
+
+        return record
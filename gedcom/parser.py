@@ -31,9 +31,14 @@ Module containing the actual `gedcom.parser.Parser` used to generate elements -
 which can in return be manipulated.
 """
 
-import re as regex
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+import inspect
+from io import BytesIO
+import mmap as memory_map
+import os
 from sys import version_info
-from gedcom.element.element import Element
+from gedcom.element.element import Element, ELEMENT_ADDED, ELEMENT_REMOVED, POINTER_CHANGED, CHILD_ELEMENTS_CHANGED
 from gedcom.element.family import FamilyElement, NotAnActualFamilyError
 from gedcom.element.file import FileElement
 from gedcom.element.individual import IndividualElement, NotAnActualIndividualError
@@ -42,6 +47,15 @@ from gedcom.element.object import ObjectElement
 from gedcom.element.root import RootElement
 from gedcom.element.source import SourceElement
 from gedcom.element.repository import RepositoryElement
+from gedcom.encoding import detect_encoding, detect_file_encoding, is_ascii_compatible, HEADER_SIZE
+from gedcom.index import RecordIndex
+from gedcom.progress import wrap_callback
+from gedcom.snapshot import load_snapshot, save_snapshot
+from gedcom.store import ElementStore
+from gedcom.reader import ASYNC_CHUNK_SIZE, BOUNDARY_WINDOW, IncrementalLineDecoder, decode_lines, \
+    find_record_boundaries, read_chunks, read_lines
+# `GedcomFormatViolationError` is imported from here by existing code
+from gedcom.tokenizer import GedcomFormatViolationError, tokenize, tokenize_line  # noqa: F401
 import gedcom.tags
 
 FAMILY_MEMBERS_TYPE_ALL = "ALL"
@@ -51,10 +65,6 @@ FAMILY_MEMBERS_TYPE_PARENTS = "PARENTS"
 FAMILY_MEMBERS_TYPE_WIFE = gedcom.tags.GEDCOM_TAG_WIFE
 
 
-class GedcomFormatViolationError(Exception):
-    pass
-
-
 class Parser(object):
     """Parses and manipulates GEDCOM 5.5 format data
     For documentation of the GEDCOM 5.5 format, see: http://homepages.rootsweb.ancestry.com/~pmcbride/gedcom/55gctoc.htm
@@ -68,33 +78,60 @@ class Parser(object):
 
     def __init__(self):
         """Initialize a GEDCOM data object."""
-        self.__element_list = []
-        self.__element_dictionary = {}
-        self.__root_element = RootElement()
+        self.__element_list = None
+        self.__element_dictionary = None
+        self.__duplicate_pointers = set()
+        self.__removed_elements = []
+        self.__record_positions = {}
+        self.__record_pointers = {}
+        self.__root_element = None
+        self.__set_root_element(RootElement())
+        self.__record_index = None
+        self.__element_store = None
+        self.__line_decoder = None
+        self.__feed_line_number = 1
+        self.__feed_last_element = self.__root_element
 
     def invalidate_cache(self):
         """Empties the element list and dictionary to cause `gedcom.parser.Parser.get_element_list()`
         and `gedcom.parser.Parser.get_element_dictionary()` to return updated data.
         The update gets deferred until each of the methods actually gets called.
+
+        Changes made through the methods of `gedcom.element.element.Element` are applied to the list and
+        dictionary right away, changes of a list returned by `gedcom.element.element.Element.get_child_elements()`
+        call this.
         """
-        self.__element_list = []
-        self.__element_dictionary = {}
+        self.__element_list = None
+        self.__element_dictionary = None
+        self.__duplicate_pointers = set()
+        self.__removed_elements = []
+        self.__record_positions = {}
+        self.__record_pointers = {}
 
     def get_element_list(self):
         """Returns a list containing all elements from within the GEDCOM file
         By default elements are in the same order as they appeared in the file.
-        This list gets generated on-the-fly, but gets cached. If the database
-        was modified, you should call `gedcom.parser.Parser.invalidate_cache()` once to let this
-        method return updated data.
+        This list gets generated on-the-fly, but gets cached. Elements added or removed through
+        `gedcom.element.element.Element.add_child_element()` or `gedcom.element.element.Element.remove_child_element()`
+        are inserted into, or removed from, the cached list. Inserting an element takes time in proportion to the
+        size of its record, plus moving the list items after it; removed elements are taken out together, in one
+        pass over the list on the next call.
 
         Consider using `gedcom.parser.Parser.get_root_element()` or `gedcom.parser.Parser.get_root_child_elements()` to access
         the hierarchical GEDCOM tree, unless you rarely modify the database.
 
         :rtype: list of Element
         """
-        if not self.__element_list:
+        if self.__element_list is None:
+            element_list = []
+            record_positions = {}
             for element in self.get_root_child_elements():
-                self.__build_list(element, self.__element_list)
+                record_positions[element] = len(element_list)
+                self.__build_list(element, element_list)
+            self.__element_list = element_list
+            self.__record_positions = record_positions
+        elif self.__removed_elements:
+            self.__remove_from_list()
         return self.__element_list
 
     def get_element_dictionary(self):
@@ -102,16 +139,35 @@ class Parser(object):
         Only elements identified by a pointer are listed in the dictionary.
         The keys for the dictionary are the pointers.
 
-        This dictionary gets generated on-the-fly, but gets cached. If the
-        database was modified, you should call `invalidate_cache()` once to let
-        this method return updated data.
+        This dictionary gets generated on-the-fly, but gets cached. Records added, removed or re-pointered
+        through the methods of `gedcom.element.element.Element` are added to, or removed from, the cached dictionary.
+        If several records have the same pointer, the last one is listed. Updating the cached dictionary takes
+        constant time, except for pointers of several records, for which the records are searched.
+
+        After `gedcom.parser.Parser.parse_file()` with `lazy=True`, a `gedcom.index.RecordIndex` is returned
+        instead, which only builds the records that are looked up. With `store=True`, a
+        `gedcom.store.ElementDictionary` is returned, which creates views of the records that are looked up.
 
         :rtype: dict of Element
         """
-        if not self.__element_dictionary:
-            self.__element_dictionary = {
-                element.get_pointer(): element for element in self.get_root_child_elements() if element.get_pointer()
-            }
+        if self.__record_index is not None:
+            return self.__record_index
+
+        if self.__element_store is not None:
+            return self.__element_store.get_element_dictionary()
+
+        if self.__element_dictionary is None:
+            element_dictionary = {}
+            record_pointers = {}
+            for element in self.get_root_child_elements():
+                pointer = element.get_pointer()
+                record_pointers[element] = pointer
+                if pointer:
+                    if pointer in element_dictionary:
+                        self.__duplicate_pointers.add(pointer)
+                    element_dictionary[pointer] = element
+            self.__element_dictionary = element_dictionary
+            self.__record_pointers = record_pointers
 
         return self.__element_dictionary
 
@@ -121,6 +177,9 @@ class Parser(object):
 
         :rtype: RootElement
         """
+        if self.__record_index is not None:
+            self.__load_records()
+
         return self.__root_element
 
     def get_root_child_elements(self):
@@ -131,16 +190,76 @@ class Parser(object):
         """
         return self.get_root_element().get_child_elements()
 
-    def parse_file(self, file_path, strict=True, callback=None):
+    def parse_file(self, file_path, strict=True, callback=None, mmap=False, workers=1, lazy=False, store=False,
+                   fold=False):
         """Opens and parses a file, from the given file path, as GEDCOM 5.5 formatted data.
         Callback function is used to communicate the progress.  Parsing large files may take time.
+        Progress updates are rate-limited, see `gedcom.progress`.
+
+        If `mmap` is `True` the file is memory-mapped and read from disk only once. Progress is then
+        reported by byte offset and file size instead of line number and number of lines.
+
+        If `workers` is greater than 1, the file is split into byte ranges starting at level 0 records
+        which are tokenized by a pool of `workers` processes. The elements are created in this process,
+        in file order, and format violations raise the same errors as parsing in a single process. Progress is reported
+        by byte offset, once per parsed range.
+
+        If `lazy` is `True` the file is only scanned for the byte offsets of its level 0 records. A record
+        is built when it is first looked up through `gedcom.parser.Parser.get_element_dictionary()`.
+        The whole tree is built as soon as `gedcom.parser.Parser.get_root_element()`, or any method using it,
+        is called. The file stays memory-mapped until then.
+
+        If `store` is `True` the lines are kept in a `gedcom.store.ElementStore`, which needs a fraction of the memory
+        of one element object per line. Elements are created as views of the store when they are accessed, and the
+        structure of the tree cannot be changed. `mmap`, `workers` and `lazy` are ignored.
+
+        If `fold` is `True` the `CONC` and `CONT` lines of each element are folded into it instead of becoming
+        child elements, see `gedcom.element.element.Element.fold_continuations()`. Their joined value is returned
+        by `gedcom.element.element.Element.get_multi_line_value()` and the lines are still written unchanged.
+        `fold` is ignored when `lazy` or `store` is `True`.
+
+        The encoding of the file is detected from its byte order mark or its `HEAD.CHAR` line, see `gedcom.encoding`.
+        UTF-16 files cannot be split without decoding them, so they are parsed by a single process and
+        not lazily, regardless of `workers` and `lazy`.
 
         :type file_path: str
 
         :type strict: bool
 
         :type callback: function (message as str, progress as int, progress_total as int)
+
+        :type mmap: bool
+
+        :type workers: int
+
+        :type lazy: bool
+
+        :type store: bool
+
+        :type fold: bool
         """
+        callback = wrap_callback(callback)
+
+        if store:
+            self.__parse_file_into_store(file_path, strict, callback)
+            return
+
+        if (lazy or workers > 1) and not is_ascii_compatible(detect_file_encoding(file_path)):
+            lazy = False
+            workers = 1
+
+        if lazy:
+            self.__index_file(file_path, strict, callback)
+            return
+
+        if workers > 1:
+            self.__parse_file_in_parallel(file_path, strict, callback, workers, fold)
+            return
+
+        if mmap:
+            self.__parse_mapped_file(file_path, strict, callback, fold)
+            return
+
         total_lines = 0
 
         # total lines not needed when there is no callback
@@ -150,40 +269,551 @@ class Parser(object):
                     total_lines = total_lines + 1
 
         with open(file_path, 'rb') as gedcom_stream:
-            self.parse(gedcom_stream, strict, total_lines, callback)
+            self.parse(gedcom_stream, strict, total_lines, callback, fold)
 
         if callback is not None:
             callback("File loaded", total_lines, total_lines)
 
-    def parse(self, gedcom_stream, strict=True, total_lines=0, callback=None):
+    def parse(self, gedcom_stream, strict=True, total_lines=0, callback=None, fold=False):
         """Parses a stream, or an array of lines, as GEDCOM 5.5 formatted data.
         Callback function is used to communicate the progress.  Parsing large files may take time.
+        Progress updates are rate-limited, see `gedcom.progress`.
+
+        A binary file stream is read in large chunks which are decoded at once, see `gedcom.reader`.
+        Its encoding is detected from its byte order mark or its `HEAD.CHAR` line, see `gedcom.encoding`.
+        An array of lines is decoded as UTF-8.
+
+        If `fold` is `True` the `CONC` and `CONT` lines are folded into their elements,
+        see `gedcom.parser.Parser.parse_file()`.
 
-        :type gedcom_stream: a file stream, or str array of lines with new line at the end
+        :type gedcom_stream: a binary file stream, or bytes array of lines with new line at the end
 
         :type strict: bool
 
         :type total_lines: int
 
         :type callback: function (message as str, progress as int, progress_total as int)
+
+        :type fold: bool
         """
-        self.invalidate_cache()
-        self.__root_element = RootElement()
+        callback = wrap_callback(callback)
+
+        self.__reset()
 
         line_number = 1
         last_element = self.get_root_element()
 
-        for line in gedcom_stream:
-            last_element = self.__parse_line(line_number, line.decode('utf-8-sig'), last_element, strict)
+        for line in decode_lines(gedcom_stream):
+            last_element = self.__parse_line(line_number, line, last_element, strict, fold)
 
             if callback is not None:
                 callback("Loading and parsing file", line_number, total_lines)
 
             line_number += 1
 
+        if fold:
+            self.__fold_open_elements(last_element)
+
+    def feed(self, data, strict=True, fold=False):
+        """Parses a chunk of GEDCOM 5.5 formatted data, for data arriving in pieces of any size.
+        The first call after `gedcom.parser.Parser.close()`, or after any other parse method, starts a new tree.
+        Lines completed by the chunk are added to the tree right away; an incomplete line at the end
+        is kept until the next chunk. Call `gedcom.parser.Parser.close()` after the last chunk.
+        If `fold` is `True` the `CONC` and `CONT` lines of the elements completed by the chunk are folded into them,
+        see `gedcom.parser.Parser.parse()`.
+
+        :type data: bytes
+
+        :type strict: bool
+
+        :type fold: bool
+        """
+        if self.__line_decoder is None:
+            self.__reset()
+            self.__line_decoder = IncrementalLineDecoder()
+            self.__feed_line_number = 1
+            self.__feed_last_element = self.__root_element
+
+        self.__feed_lines(self.__line_decoder.decode(data), strict, fold)
+
+    def close(self, strict=True, fold=False):
+        """Parses the data kept back by `gedcom.parser.Parser.feed()`, that is a last line without line ending,
+        and completes the tree. If `fold` is `True` the `CONC` and `CONT` lines of the elements still open
+        are folded into them.
+
+        :type strict: bool
+
+        :type fold: bool
+        """
+        if self.__line_decoder is None:
+            return
+
+        lines = self.__line_decoder.decode(b'', True)
+        self.__line_decoder = None
+
+        self.__feed_lines(lines, strict, fold)
+
+        if fold:
+            self.__fold_open_elements(self.__feed_last_element)
+
+    async def parse_async(self, async_stream, strict=True, executor=None, chunk_size=ASYNC_CHUNK_SIZE, fold=False):
+        """Coroutine parsing an asynchronous binary stream as GEDCOM 5.5 formatted data, such as an
+        `asyncio.StreamReader` or any object with a coroutine `read(size)` method returning bytes.
+        Control is given back to the event loop after every chunk of `chunk_size` bytes.
+
+        If an `executor` (`concurrent.futures.Executor`) is given, the lines of each chunk are tokenized
+        in it and only the elements are created in the event loop's thread. With a
+        `concurrent.futures.ProcessPoolExecutor` the tokenizing does not hold the event loop's thread at all.
+        If `fold` is `True` the `CONC` and `CONT` lines are folded into their elements,
+        see `gedcom.parser.Parser.parse()`.
+
+        :type async_stream: an asynchronous binary stream
+
+        :type strict: bool
+
+        :type executor: concurrent.futures.Executor
+
+        :type chunk_size: int
+
+        :type fold: bool
+        """
+        loop = asyncio.get_running_loop()
+
+        self.__reset()
+
+        decoder = IncrementalLineDecoder()
+        line_number = 1
+        last_element = self.get_root_element()
+
+        while True:
+            chunk = await async_stream.read(chunk_size)
+            final = not chunk
+            lines = decoder.decode(chunk, final)
+
+            if executor is None:
+                for line in lines:
+                    last_element = self.__parse_line(line_number, line, last_element, strict, fold)
+                    line_number += 1
+
+                await asyncio.sleep(0)
+            elif lines:
+                tokens = await loop.run_in_executor(executor, tokenize_lines, lines, line_number,
+                                                    last_element.get_level(), last_element.get_tag(), strict)
+
+                for level, pointer, tag, value, crlf in zip(*tokens):
+                    last_element = self.__add_element(level, pointer, tag, value, crlf, last_element, fold)
+                line_number += len(lines)
+
+            if final:
+                if fold:
+                    self.__fold_open_elements(last_element)
+                return
+
+    def iter_records(self, path_or_stream, strict=True, line_number=1, encoding=None, fold=False):
+        """Generator returning the logical records of a GEDCOM file, from a file path or a stream,
+        one at a time. Each record is fully built, including all of its sub-elements, but the
+        records are not added to this parser's tree. Only one record is held in memory at a time.
+        `line_number` is the number of the first line, as used in error messages.
+        If `encoding` is `None` it is detected from the start of the data.
+        If `fold` is `True` the `CONC` and `CONT` lines are folded into their elements,
+        see `gedcom.parser.Parser.parse()`.
+
+        :type path_or_stream: str, or a binary file stream, or bytes array of lines with new line at the end
+
+        :type strict: bool
+
+        :type line_number: int
+
+        :type encoding: str
+
+        :type fold: bool
+
+        :rtype: generator of Element
+        """
+        if isinstance(path_or_stream, (str, bytes, os.PathLike)):
+            with open(path_or_stream, 'rb') as gedcom_stream:
+                yield from self.iter_records(gedcom_stream, strict, line_number, encoding, fold)
+            return
+
+        root_element = RootElement()
+        records = root_element.get_child_elements()
+
+        last_element = root_element
+
+        for line in decode_lines(path_or_stream, encoding):
+            last_element = self.__parse_line(line_number, line, last_element, strict, fold)
+
+            # a new record starts, so the previous one is complete
+            if last_element.get_level() == 0 and len(records) > 1:
+                yield records.pop_element(0)
+
+            line_number += 1
+
+        if fold:
+            self.__fold_open_elements(last_element)
+
+        if records:
+            yield records.pop_element()
+
     # Private methods
+    def __set_root_element(self, root_element):
+        """Replaces the root element and follows the changes of its tree
+
+        :type root_element: RootElement
+        """
+        if self.__root_element is not None:
+            self.__root_element.set_change_listener(None)
+
+        self.__root_element = root_element
+        root_element.set_change_listener(self.__apply_change)
+
+    def __apply_change(self, change, element):
+        """Applies a change of the tree to the element list and dictionary, if they have been built
+
+        :type change: str
+
+        :type element: Element
+        """
+        if change == CHILD_ELEMENTS_CHANGED:
+            self.invalidate_cache()
+            return
+
+        if self.__element_list is not None and change != POINTER_CHANGED:
+            self.__apply_change_to_list(change, element)
+
+        if self.__element_dictionary is not None and element.get_parent_element() is self.__root_element:
+            self.__apply_change_to_dictionary(change, element)
+
+    def __apply_change_to_list(self, change, element):
+        """Inserts an added element and its descendants into the element list, or removes a removed one
+
+        :type change: str
+
+        :type element: Element
+        """
+        if change == ELEMENT_REMOVED:
+            # removed elements are collected and removed from the list at once
+            self.__removed_elements.append(element)
+            return
+
+        if self.__removed_elements:
+            self.__remove_from_list()
+
+        element_list = self.__element_list
+        if element_list is None:
+            return
+
+        elements = []
+        self.__build_list(element, elements)
+
+        # the record of the element, found through its ancestors
+        record = element
+        parent_element = element.get_parent_element()
+        while parent_element is not self.__root_element:
+            record = parent_element
+            parent_element = parent_element.get_parent_element()
+
+        record_positions = self.__record_positions
+        if record is element:
+            # added records are the last child element of the root element
+            position = len(element_list)
+            record_positions[record] = position
+        else:
+            record_elements = []
+            self.__build_list(record, record_elements)
+
+            # a record only moves back by the elements inserted before it, so the search for it starts from the
+            # position it was last found at
+            try:
+                record_position = element_list.index(record, record_positions.get(record, 0))
+            except ValueError:
+                # the tree has been changed without notification, the list gets rebuilt on the next call
+                self.__element_list = None
+                return
+
+            record_positions[record] = record_position
+            position = record_position + record_elements.index(element)
+
+        element_list[position:position] = elements
+
+    def __remove_from_list(self):
+        """Removes the collected removed elements and their descendants from the element list in one pass"""
+        removed_elements = []
+        for element in self.__removed_elements:
+            self.__build_list(element, removed_elements)
+        self.__removed_elements = []
+
+        removed_ids = {id(element) for element in removed_elements}
+        element_list = self.__element_list
+
+        kept_elements = [element for element in element_list if id(element) not in removed_ids]
+        if len(kept_elements) + len(removed_ids) != len(element_list):
+            # the tree has been changed without notification, the list gets rebuilt on the next call
+            self.__element_list = None
+            return
+
+        element_list[:] = kept_elements
+        # records after the removed elements have moved forward
+        self.__record_positions = {}
+
+    def __apply_change_to_dictionary(self, change, record):
+        """Updates the element dictionary for a record added to, removed from or re-pointered in the root element
+
+        :type change: str
+
+        :type record: Element
+        """
+        element_dictionary = self.__element_dictionary
+        record_pointers = self.__record_pointers
+
+        if change == ELEMENT_ADDED:
+            pointer = record.get_pointer()
+            record_pointers[record] = pointer
+            if pointer:
+                if pointer in element_dictionary:
+                    self.__duplicate_pointers.add(pointer)
+                element_dictionary[pointer] = record
+            return
+
+        # the previous pointer of a re-pointered record is only known from the reverse map
+        previous_pointer = record_pointers.pop(record, record.get_pointer())
+        pointers = [previous_pointer]
+
+        if change == POINTER_CHANGED:
+            pointer = record.get_pointer()
+            record_pointers[record] = pointer
+            if pointer == previous_pointer:
+                return
+
+            if pointer in element_dictionary:
+                # the last record with the pointer is listed, which may be another one
+                self.__duplicate_pointers.add(pointer)
+                pointers.append(pointer)
+            elif pointer:
+                element_dictionary[pointer] = record
+
+        for pointer in pointers:
+            if not pointer:
+                continue
+
+            if pointer in self.__duplicate_pointers:
+                # the last record with the pointer is listed
+                element_dictionary.pop(pointer, None)
+                for element in reversed(self.__root_element.get_child_elements()):
+                    if element.get_pointer() == pointer:
+                        element_dictionary[pointer] = element
+                        break
+            elif element_dictionary.get(pointer) is record:
+                del element_dictionary[pointer]
+
+    def __reset(self):
+        """Discards the parsed data, including a record index and data kept back by `feed`"""
+        self.invalidate_cache()
+        self.__set_root_element(RootElement())
+
+        if self.__record_index is not None:
+            self.__record_index.close()
+            self.__record_index = None
+
+        self.__element_store = None
+        self.__line_decoder = None
+
+    def __parse_file_into_store(self, file_path, strict=True, callback=None):
+        """Parses a file into an element store
+
+        :type file_path: str
+
+        :type strict: bool
+
+        :type callback: function (message as str, progress as int, progress_total as int)
+        """
+        self.__reset()
+
+        element_store = ElementStore()
+        with open(file_path, 'rb') as gedcom_stream:
+            element_store.parse(read_lines(gedcom_stream), strict)
+
+        self.__element_store = element_store
+        self.__set_root_element(element_store.get_root_element())
+
+        if callback is not None:
+            callback("File loaded", len(element_store), len(element_store))
+
+    def __feed_lines(self, lines, strict=True, fold=False):
+        """Adds lines passed to `gedcom.parser.Parser.feed()` to the tree
+
+        :type lines: list of str
+
+        :type strict: bool
+
+        :type fold: bool
+        """
+        if lines:
+            self.invalidate_cache()
+
+        line_number = self.__feed_line_number
+        open_element = last_element = self.__feed_last_element
+
+        for line in lines:
+            last_element = self.__parse_line(line_number, line, last_element, strict, fold)
+            line_number += 1
+
+        # the tree may have been used since the last chunk, values derived from the elements open before and
+        # after the chunk are outdated; the elements completed by the chunk are ancestors of the former
+        if lines:
+            open_element.notify_change()
+            last_element.notify_change()
+
+        self.__feed_line_number = line_number
+        self.__feed_last_element = last_element
+
+    def __index_file(self, file_path, strict=True, callback=None):
+        """Scans a file for its level 0 records without building them
+
+        :type file_path: str
+
+        :type strict: bool
+
+        :type callback: function (message as str, progress as int, progress_total as int)
+        """
+        self.__reset()
+        self.__record_index = RecordIndex(file_path, strict, self.__root_element)
+
+        if callback is not None:
+            records = self.__record_index.get_record_count()
+            callback("File indexed", records, records)
+
+    def __load_records(self):
+        """Builds all records of the record index not built yet and adds them to the tree"""
+        records = self.__record_index.get_records()
+
+        self.__record_index.close()
+        self.__record_index = None
+
+        for record in records:
+            self.__root_element.add_child_element(record)
+
+    def __parse_mapped_file(self, file_path, strict=True, callback=None, fold=False):
+        """Parses a memory-mapped file, reporting progress by byte offset once per chunk
+
+        :type file_path: str
+
+        :type strict: bool
+
+        :type callback: function (message as str, progress as int, progress_total as int)
+
+        :type fold: bool
+        """
+        self.__reset()
+
+        line_number = 1
+        last_element = self.get_root_element()
+
+        with open(file_path, 'rb') as gedcom_file:
+            file_size = os.fstat(gedcom_file.fileno()).st_size
+
+            # an empty file cannot be mapped
+            if file_size > 0:
+                with memory_map.mmap(gedcom_file.fileno(), 0, access=memory_map.ACCESS_READ) as mapped_file:
+                    for lines in read_chunks(mapped_file):
+                        for line in lines:
+                            last_element = self.__parse_line(line_number, line, last_element, strict, fold)
+                            line_number += 1
+
+                        if callback is not None:
+                            callback("Loading and parsing file", mapped_file.tell(), file_size)
+
+        if fold:
+            self.__fold_open_elements(last_element)
+
+        if callback is not None:
+            callback("File loaded", file_size, file_size)
+
+    def __parse_file_in_parallel(self, file_path, strict=True, callback=None, workers=2, fold=False):
+        """Tokenizes byte ranges of a file, each starting with a level 0 record, in a pool of processes
+        and builds the tree from the tokens in file order. The lines of each range are numbered from 1 by the
+        workers, one token is returned per line, so that the number of the first line of a range is known from
+        the ranges before it. A range with a format violation is tokenized again with its line numbers to raise
+        the same error as `gedcom.parser.Parser.parse()`.
+
+        :type file_path: str
+
+        :type strict: bool
+
+        :type callback: function (message as str, progress as int, progress_total as int)
+
+        :type workers: int
+
+        :type fold: bool
+        """
+        self.__reset()
+
+        ranges = []
+        encoding = None
+
+        with open(file_path, 'rb') as gedcom_file:
+            file_size = os.fstat(gedcom_file.fileno()).st_size
+
+            # an empty file cannot be mapped
+            if file_size > 0:
+                with memory_map.mmap(gedcom_file.fileno(), 0, access=memory_map.ACCESS_READ) as mapped_file:
+                    encoding = detect_encoding(mapped_file[:HEADER_SIZE])
+
+                    # only split before valid lines, non-strict quirks depend on the previous line
+                    boundaries = [boundary for boundary in find_record_boundaries(mapped_file, workers)
+                                  if boundary in (0, file_size) or self.__starts_valid_line(mapped_file, boundary)]
+                    ranges = list(zip(boundaries, boundaries[1:]))
+
+        last_element = self.get_root_element()
+        line_number = 1
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(tokenize_range, file_path, start, end, 1, strict, encoding)
+                       for start, end in ranges]
+
+            # results are collected in file order, so the first violation in the file is raised
+            for future, (start, end) in zip(futures, ranges):
+                try:
+                    tokens = future.result()
+                except GedcomFormatViolationError:
+                    # raises the error again with the line number in the file
+                    tokens = tokenize_range(file_path, start, end, line_number, strict, encoding)
+
+                for level, pointer, tag, value, crlf in zip(*tokens):
+                    last_element = self.__add_element(level, pointer, tag, value, crlf, last_element, fold)
+                line_number += len(tokens[0])
+
+                if callback is not None:
+                    callback("Loading and parsing file", end, file_size)
+
+        if fold:
+            self.__fold_open_elements(last_element)
+
+        if callback is not None:
+            callback("File loaded", file_size, file_size)
+
     @staticmethod
-    def __parse_line(line_number, line, last_element, strict=True):
+    def __starts_valid_line(buffer, offset):
+        """Checks if the line starting at a byte offset is a valid GEDCOM line. Only the first
+        `gedcom.reader.BOUNDARY_WINDOW` bytes are read, a longer line is not checked and not accepted.
+
+        :type buffer: bytes or `mmap.mmap`
+
+        :type offset: int
+
+        :rtype: bool
+        """
+        line = buffer[offset:offset + BOUNDARY_WINDOW]
+        line_ends = [index for index in (line.find(b'\n'), line.find(b'\r')) if index >= 0]
+        if line_ends:
+            line = line[:min(line_ends) + 1]
+        elif offset + len(line) < len(buffer):
+            return False
+
+        return tokenize_line(line.decode('utf-8', 'replace')) is not None
+
+    @staticmethod
+    def __parse_line(line_number, line, last_element, strict=True, fold=False):
         """Parse a line from a GEDCOM 5.5 formatted document
         Each line should have the following (bracketed items optional):
         level + ' ' + [pointer + ' ' +] tag + [' ' + line_value]
@@ -196,77 +826,38 @@ class Parser(object):
 
         :type strict: bool
 
+        :type fold: bool
+
         :rtype: Element
         """
 
-        # Level must start with non-negative int, no leading zeros.
-        level_regex = '^(0|[1-9]+[0-9]*) '
+        level, pointer, tag, value, crlf = tokenize(line_number, line, last_element.get_level(),
+                                                    last_element.get_tag(), strict)
 
-        # Pointer optional, if it exists it must be flanked by `@`
-        pointer_regex = '(@[^@]+@ |)'
+        return Parser.__add_element(level, pointer, tag, value, crlf, last_element, fold)
 
-        # Tag must be an alphanumeric string
-        tag_regex = '([A-Za-z0-9_]+)'
+    @staticmethod
+    def __add_element(level, pointer, tag, value, crlf, last_element, fold=False):
+        """Creates the element of a tokenized line and adds it to the tree below its parent,
+        which is `last_element` or one of its ancestors. If `fold` is `True` the `CONC` and `CONT` lines of
+        the elements completed by this line are folded into them.
 
-        # Value optional, consists of anything after a space to end of line
-        value_regex = '( [^\n\r]*|)'
+        :type level: int
 
-        # End of line defined by `\n` or `\r`
-        end_of_line_regex = '([\r\n]{1,2})'
+        :type pointer: str
 
-        # Complete regex
-        gedcom_line_regex = level_regex + pointer_regex + tag_regex + value_regex + end_of_line_regex
-        regex_match = regex.match(gedcom_line_regex, line)
+        :type tag: str
 
-        if regex_match is None:
-            if strict:
-                error_message = ("Line <%d:%s> of document violates GEDCOM format 5.5" % (line_number, line)
-                                 + "\nSee: https://chronoplexsoftware.com/gedcomvalidator/gedcom/gedcom-5.5.pdf")
-                raise GedcomFormatViolationError(error_message)
-            else:
-                # Quirk check - see if this is a line without a CRLF (which could be the last line)
-                last_line_regex = level_regex + pointer_regex + tag_regex + value_regex
-                regex_match = regex.match(last_line_regex, line)
-                if regex_match is not None:
-                    line_parts = regex_match.groups()
-
-                    level = int(line_parts[0])
-                    pointer = line_parts[1].rstrip(' ')
-                    tag = line_parts[2]
-                    value = line_parts[3][1:]
-                    crlf = '\n'
-                else:
-                    # Quirk check - Sometimes a gedcom has a text field with a CR.
-                    # This creates a line without the standard level and pointer.
-                    # If this is detected then turn it into a CONC or CONT.
-                    line_regex = '([^\n\r]*|)'
-                    cont_line_regex = line_regex + end_of_line_regex
-                    regex_match = regex.match(cont_line_regex, line)
-                    line_parts = regex_match.groups()
-                    level = last_element.get_level()
-                    tag = last_element.get_tag()
-                    pointer = None
-                    value = line_parts[0][1:]
-                    crlf = line_parts[1]
-                    if tag != gedcom.tags.GEDCOM_TAG_CONTINUED and tag != gedcom.tags.GEDCOM_TAG_CONCATENATION:
-                        # Increment level and change this line to a CONC
-                        level += 1
-                        tag = gedcom.tags.GEDCOM_TAG_CONCATENATION
-        else:
-            line_parts = regex_match.groups()
+        :type value: str
+
+        :type crlf: str
 
-            level = int(line_parts[0])
-            pointer = line_parts[1].rstrip(' ')
-            tag = line_parts[2]
-            value = line_parts[3][1:]
-            crlf = line_parts[4]
+        :type last_element: Element
 
-        # Check level: should never be more than one higher than previous line.
-        if level > last_element.get_level() + 1:
-            error_message = ("Line %d of document violates GEDCOM format 5.5" % line_number
-                             + "\nLines must be no more than one level higher than previous line."
-                             + "\nSee: https://chronoplexsoftware.com/gedcomvalidator/gedcom/gedcom-5.5.pdf")
-            raise GedcomFormatViolationError(error_message)
+        :type fold: bool
+
+        :rtype: Element
+        """
 
         # Create element. Store in list and dict, create children and parents.
         if tag == gedcom.tags.GEDCOM_TAG_INDIVIDUAL:
@@ -290,13 +881,29 @@ class Parser(object):
         parent_element = last_element
 
         while parent_element.get_level() > level - 1:
+            # all lines of an element left behind have been read
+            if fold:
+                parent_element.fold_continuations()
             parent_element = parent_element.get_parent_element()
 
-        # Add child to parent & parent to child.
-        parent_element.add_child_element(element)
+        # Add child to parent & parent to child. Unlike `add_child_element` this does not call `notify_change`,
+        # nothing has been derived from the elements while they are parsed.
+        parent_element.get_child_elements().append_element(element)
+        element.set_parent_element(parent_element)
 
         return element
 
+    @staticmethod
+    def __fold_open_elements(last_element):
+        """Folds the `CONC` and `CONT` lines of the last element and its ancestors once all lines have been read
+
+        :type last_element: Element
+        """
+        element = last_element
+        while element is not None:
+            element.fold_continuations()
+            element = element.get_parent_element()
+
     def __build_list(self, element, element_list):
         """Recursively add elements to a list containing elements
 
@@ -305,6 +912,9 @@ class Parser(object):
         :type element_list: list of Element
         """
         element_list.append(element)
+        if not element.has_child_elements():
+            return
+
         for child in element.get_child_elements():
             self.__build_list(child, element_list)
 
@@ -423,15 +1033,13 @@ class Parser(object):
         # Get and analyze families where individual is spouse.
         families = self.get_families(individual, gedcom.tags.GEDCOM_TAG_FAMILY_SPOUSE)
         for family in families:
-            for child in family.get_child_elements():
-                if child.get_tag() == gedcom.tags.GEDCOM_TAG_MARRIAGE:
-                    for childOfChild in child.get_child_elements():
-                        if childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_DATE:
-                            date = childOfChild.get_value().split()[-1]
-                            try:
-                                dates.append(int(date))
-                            except ValueError:
-                                pass
+            for child in family.get_child_elements_by_tag(gedcom.tags.GEDCOM_TAG_MARRIAGE):
+                for childOfChild in child.get_child_elements_by_tag(gedcom.tags.GEDCOM_TAG_DATE):
+                    date = childOfChild.get_value().split()[-1]
+                    try:
+                        dates.append(int(date))
+                    except ValueError:
+                        pass
         return dates
 
     def marriage_year_match(self, individual, year):
@@ -493,10 +1101,8 @@ class Parser(object):
         families = []
         element_dictionary = self.get_element_dictionary()
 
-        for child_element in individual.get_child_elements():
-            is_family = (child_element.get_tag() == family_type
-                         and child_element.get_value() in element_dictionary)
-            if is_family:
+        for child_element in individual.get_child_elements_by_tag(family_type):
+            if child_element.get_value() in element_dictionary:
                 families.append(element_dictionary[child_element.get_value()])
 
         return families
@@ -547,10 +1153,9 @@ class Parser(object):
 
         for family in families:
             if parent_type == "NAT":
-                for family_member in family.get_child_elements():
+                for family_member in family.get_child_elements_by_tag(gedcom.tags.GEDCOM_TAG_CHILD):
 
-                    if family_member.get_tag() == gedcom.tags.GEDCOM_TAG_CHILD \
-                       and family_member.get_value() == individual.get_pointer():
+                    if family_member.get_value() == individual.get_pointer():
 
                         for child in family_member.get_child_elements():
                             if child.get_value() == "Natural":
@@ -675,9 +1280,8 @@ class Parser(object):
                     parent_match = True
 
             if parent_match == True:
-                for family_member in family.get_child_elements():
-                    if family_member.get_tag() == gedcom.tags.GEDCOM_TAG_CHILD \
-                       and family_member.get_value() == individual.get_pointer():
+                for family_member in family.get_child_elements_by_tag(gedcom.tags.GEDCOM_TAG_CHILD):
+                    if family_member.get_value() == individual.get_pointer():
 
                         for child in family_member.get_child_elements():
                             if child.get_tag() == gedcom.tags.GEDCOM_PROGRAM_DEFINED_TAG_MREL and parent.get_gender() == 'F':
@@ -826,6 +1430,70 @@ class Parser(object):
 
     # Other methods
 
+    def find_referenced_pointers(self, records, record_tags=None):
+        """Returns the pointers of `records` and of the records referenced from them, directly or through other
+        referenced records. A record is referenced by any element, at any depth and with any tag, whose value is
+        the pointer of the record, such as `SOUR`, `REPO`, `OBJE`, `NOTE`, `SUBM` or custom tags. If `record_tags`
+        is given only references to records with one of these tags are followed. Each element is visited once.
+
+        :type records: list of Element
+
+        :type record_tags: set of str
+
+        :rtype: set of str
+        """
+        element_dictionary = self.get_element_dictionary()
+
+        unvisited = list(records)
+        referenced_pointers = {record.get_pointer() for record in unvisited}
+        visited_records = set()
+
+        while unvisited:
+            record = unvisited.pop()
+            if id(record) in visited_records:
+                continue
+            visited_records.add(id(record))
+
+            elements = list(record.get_child_elements()) if record.has_child_elements() else []
+            while elements:
+                element = elements.pop()
+                value = element.get_value()
+                if value[:1] == "@" and value not in referenced_pointers and value in element_dictionary:
+                    referenced_record = element_dictionary[value]
+                    if record_tags is None or referenced_record.get_tag() in record_tags:
+                        referenced_pointers.add(value)
+                        unvisited.append(referenced_record)
+                if element.has_child_elements():
+                    elements.extend(element.get_child_elements())
+
+        return referenced_pointers
+
+    def prune_unreferenced(self, keep_roots, record_tags=None):
+        """Removes the records that are not referenced from the records to keep, directly or through other
+        referenced records, see `gedcom.parser.Parser.find_referenced_pointers()`.
+
+        The records in `keep_roots` and the records without a pointer, such as the header, are kept. If
+        `record_tags` is given only records with one of these tags are removed, all others are kept as well.
+        Each element is visited once, and the records are removed in one pass. Returns the removed records.
+
+        :type keep_roots: list of Element
+
+        :type record_tags: set of str
+
+        :rtype: list of Element
+        """
+        def is_removable(record):
+            return record.get_pointer() != "" and (record_tags is None or record.get_tag() in record_tags)
+
+        # mark, references to records that are not removable need not be followed, they are all kept anyway
+        roots = [record for record in self.get_root_child_elements() if not is_removable(record)]
+        referenced_pointers = self.find_referenced_pointers(roots + list(keep_roots), record_tags)
+
+        # sweep
+        return self.get_root_element().remove_child_elements(
+            lambda record: is_removable(record) and record.get_pointer() not in referenced_pointers
+        )
+
     def print_gedcom(self):
         """Write GEDCOM data to stdout"""
         from sys import stdout
@@ -840,3 +1508,137 @@ class Parser(object):
             open_file.write(self.get_root_element().to_gedcom_string(True))
         else:
             open_file.write(self.get_root_element().to_gedcom_string(True).encode('utf-8-sig'))
+
+    def save_snapshot(self, file_path):
+        """Saves the tree to a binary snapshot file, see `gedcom.snapshot`.
+        `gedcom.parser.Parser.load_snapshot()` restores it much faster than parsing the GEDCOM file again.
+
+        :type file_path: str
+        """
+        with open(file_path, 'wb') as snapshot_file:
+            save_snapshot(self.get_root_element(), snapshot_file)
+
+    def load_snapshot(self, file_path):
+        """Loads a tree from a snapshot file written by `gedcom.parser.Parser.save_snapshot()`, with the same
+        element classes and line endings. Raises `gedcom.snapshot.SnapshotFormatError` if the file is not a valid snapshot.
+
+        :type file_path: str
+        """
+        with open(file_path, 'rb') as snapshot_file:
+            root_element = load_snapshot(snapshot_file)
+
+        self.__reset()
+        self.__set_root_element(root_element)
+
+    async def save_async(self, async_writer, encoding=None):
+        """Coroutine saving GEDCOM data to an asynchronous writer, such as an `asyncio.StreamWriter` or
+        any object with a `write(data)` method, which may be a coroutine. The records are written in
+        batches of about `gedcom.reader.ASYNC_CHUNK_SIZE` characters, giving control back to the event loop
+        after each batch. If the writer has a `drain()` coroutine it is awaited after each batch.
+
+        If `encoding` is given the data is written as bytes, otherwise as str.
+
+        :type async_writer: an asynchronous writer
+
+        :type encoding: str
+        """
+        batch = []
+        batch_size = 0
+
+        for element in self.get_root_child_elements():
+            batch.append(element.to_gedcom_string(True))
+            batch_size += len(batch[-1])
+
+            if batch_size >= ASYNC_CHUNK_SIZE:
+                await self.__write_async(async_writer, "".join(batch), encoding)
+                batch = []
+                batch_size = 0
+
+        if batch:
+            await self.__write_async(async_writer, "".join(batch), encoding)
+
+    @staticmethod
+    async def __write_async(async_writer, data, encoding=None):
+        """Writes data to an asynchronous writer and gives control back to the event loop
+
+        :type async_writer: an asynchronous writer
+
+        :type data: str
+
+        :type encoding: str
+        """
+        if encoding is not None:
+            data = data.encode(encoding)
+
+        result = async_writer.write(data)
+        if inspect.isawaitable(result):
+            await result
+
+        if hasattr(async_writer, 'drain'):
+            await async_writer.drain()
+
+        await asyncio.sleep(0)
+
+
+def tokenize_range(file_path, start, end, line_number=1, strict=True, encoding=None):
+    """Tokenizes the lines in a byte range of a file. The range must start with a level 0 line.
+    `line_number` is the number of the first line of the range, as used in error messages.
+    Returns the tokens as a tuple of lists: (levels, pointers, tags, values, crlfs), which is much
+    cheaper to send between processes than elements.
+    Used by the worker processes of `gedcom.parser.Parser.parse_file`.
+
+    :type file_path: str
+
+    :type start: int
+
+    :type end: int
+
+    :type line_number: int
+
+    :type strict: bool
+
+    :type encoding: str
+
+    :rtype: tuple
+    """
+    with open(file_path, 'rb') as gedcom_file:
+        gedcom_file.seek(start)
+        data = gedcom_file.read(end - start)
+
+    return tokenize_lines(read_lines(BytesIO(data), encoding), line_number, strict=strict)
+
+
+def tokenize_lines(lines, line_number=1, last_level=-1, last_tag="ROOT", strict=True):
+    """Tokenizes decoded lines, given the level and tag of the line before them.
+    `line_number` is the number of the first line, as used in error messages.
+    Returns the tokens as a tuple of lists: (levels, pointers, tags, values, crlfs).
+    Used by `gedcom.parser.Parser.parse_async` when tokenizing in an executor.
+
+    :type lines: iterable of str
+
+    :type line_number: int
+
+    :type last_level: int
+
+    :type last_tag: str
+
+    :type strict: bool
+
+    :rtype: tuple
+    """
+    levels, pointers, tags, values, crlfs = [], [], [], [], []
+
+    for line in lines:
+        level, pointer, tag, value, crlf = tokenize(line_number, line, last_level, last_tag, strict)
+
+        levels.append(level)
+        pointers.append(pointer)
+        tags.append(tag)
+        values.append(value)
+        crlfs.append(crlf)
+
+        last_level = level
+        last_tag = tag
+        line_number += 1
+
+    return levels, pointers, tags, values, crlfs
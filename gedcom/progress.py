@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+
+# Python GEDCOM Parser
+#
+# Copyright (C) 2022-2025 Mark Wing (mark @ markwing.net)
+# Copyright (C) 2018 Damon Brodie (damon.brodie at gmail.com)
+# Copyright (C) 2018-2019 Nicklas Reincke (contact at reynke.com)
+# Copyright (C) 2016 Andreas Oberritter
+# Copyright (C) 2012 Madeleine Price Ball
+# Copyright (C) 2005 Daniel Zappala (zappala at cs.byu.edu)
+# Copyright (C) 2005 Brigham Young University
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Further information about the license: http://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+Rate-limited progress reporting for long-running operations of `gedcom.parser.Parser` and
+`gedcom.utilities.splitter.splitter.Splitter`.
+
+Every operation accepting a `callback` function (message as str, progress as int, progress_total as int)
+wraps it in a `gedcom.progress.ProgressReporter`, which only forwards a call when the message changes,
+the operation completes, or the configured time interval or percentage step has passed.
+"""
+
+import sys
+import time
+
+DEFAULT_INTERVAL = 0.1
+"""Minimum number of seconds between two forwarded progress updates"""
+
+
+class ProgressReporter(object):
+    """Callable with the signature of a progress callback: (message as str, progress as int,
+    progress_total as int). Forwards throttled updates to `callback` and keeps track of the
+    rate (progress units per second) and the estimated time remaining of the current operation.
+
+    If `step` is given, an update is forwarded whenever progress advanced by at least `step` percent,
+    otherwise whenever at least `interval` seconds have passed.
+    """
+
+    def __init__(self, callback=None, interval=DEFAULT_INTERVAL, step=None):
+        self.__callback = callback
+        self.__interval = interval
+        self.__step = step
+
+        self.__message = None
+        self.__start_time = 0.0
+        self.__start_progress = 0
+        self.__last_time = 0.0
+        self.__last_progress = 0
+        self.__next_progress = 0
+        self.__progress = 0
+        self.__progress_total = 0
+
+    def __call__(self, message, progress, progress_total):
+        self.update(message, progress, progress_total)
+
+    def update(self, message, progress, progress_total):
+        """Records the progress of an operation and forwards it if it is due
+
+        :type message: str
+
+        :type progress: int
+
+        :type progress_total: int
+        """
+        self.__progress = progress
+        self.__progress_total = progress_total
+
+        if message != self.__message:
+            self.__message = message
+            self.__start_time = time.monotonic()
+            self.__start_progress = progress
+        elif progress < progress_total or progress_total <= 0:
+            if self.__step is not None:
+                if progress < self.__next_progress:
+                    return
+            elif time.monotonic() - self.__last_time < self.__interval:
+                return
+
+        self.__last_time = time.monotonic()
+        self.__last_progress = progress
+        if self.__step is not None and progress_total > 0:
+            self.__next_progress = progress + progress_total * self.__step / 100.0
+
+        self.report(message, progress, progress_total)
+
+    def report(self, message, progress, progress_total):
+        """Forwards an update to the callback function. Override to display progress differently.
+
+        :type message: str
+
+        :type progress: int
+
+        :type progress_total: int
+        """
+        if self.__callback is not None:
+            self.__callback(message, progress, progress_total)
+
+    def get_rate(self):
+        """Returns the progress units (lines, bytes or records) per second of the current operation,
+        as of the last forwarded update
+
+        :rtype: float
+        """
+        elapsed = self.__last_time - self.__start_time
+        if elapsed <= 0:
+            return 0.0
+
+        return (self.__last_progress - self.__start_progress) / elapsed
+
+    def get_eta(self):
+        """Returns the estimated number of seconds until the current operation completes,
+        or `None` if it cannot be estimated
+
+        :rtype: float
+        """
+        rate = self.get_rate()
+        if rate <= 0 or self.__progress_total <= 0:
+            return None
+
+        return max(self.__progress_total - self.__last_progress, 0) / rate
+
+
+class ConsoleProgressReporter(ProgressReporter):
+    """Writes a progress bar with rate and estimated time remaining to stdout"""
+
+    BAR_LENGTH = 30
+
+    def __init__(self, interval=DEFAULT_INTERVAL, step=None, stream=None):
+        super(ConsoleProgressReporter, self).__init__(None, interval, step)
+        self.__stream = stream
+        self.__message = None
+
+    def report(self, message, progress, progress_total):
+        stream = self.__stream if self.__stream is not None else sys.stdout
+
+        if message != self.__message:
+            self.__message = message
+            stream.write("\n")
+
+        percent = round(progress / progress_total, 3) if progress_total > 0 else 0
+        block = int(round(self.BAR_LENGTH * min(percent, 1)))
+
+        eta = self.get_eta()
+        eta_text = "--:--" if eta is None else "%d:%02d" % divmod(int(eta), 60)
+
+        text = "\r{0}: [{1}] {2}/{3} {4:,.0f}/s ETA {5}          ".format(
+            message, "#" * block + "-" * (self.BAR_LENGTH - block), progress, progress_total, self.get_rate(), eta_text)
+        stream.write(text)
+        stream.flush()
+
+
+def wrap_callback(callback):
+    """Returns `callback` wrapped in a `gedcom.progress.ProgressReporter`. `None` and callbacks
+    that already are a `gedcom.progress.ProgressReporter` are returned unchanged.
+
+    :type callback: function (message as str, progress as int, progress_total as int)
+
+    :rtype: ProgressReporter
+    """
+    if callback is None or isinstance(callback, ProgressReporter):
+        return callback
+
+    return ProgressReporter(callback)
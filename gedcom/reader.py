@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+
+# Python GEDCOM Parser
+#
+# Copyright (C) 2022-2025 Mark Wing (mark @ markwing.net)
+# Copyright (C) 2018 Damon Brodie (damon.brodie at gmail.com)
+# Copyright (C) 2018-2019 Nicklas Reincke (contact at reynke.com)
+# Copyright (C) 2016 Andreas Oberritter
+# Copyright (C) 2012 Madeleine Price Ball
+# Copyright (C) 2005 Daniel Zappala (zappala at cs.byu.edu)
+# Copyright (C) 2005 Brigham Young University
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Further information about the license: http://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+Input stage of `gedcom.parser.Parser`: reads a binary stream in large chunks, decodes each chunk once
+and splits the decoded text into lines ending in `\\r\\n`, `\\n` or `\\r`.
+Unless an encoding is given it is detected from the start of the stream, see `gedcom.encoding`.
+"""
+
+import re as regex
+
+from gedcom.encoding import detect_encoding, get_incremental_decoder
+
+CHUNK_SIZE = 1024 * 1024
+"""Number of bytes read from the stream at a time"""
+
+ASYNC_CHUNK_SIZE = 64 * 1024
+"""Number of bytes read from an asynchronous stream, or written to an asynchronous writer, before
+yielding to the event loop"""
+
+BOUNDARY_WINDOW = 64 * 1024
+"""Number of bytes first searched for a level 0 line by `gedcom.reader.find_record_boundaries()`"""
+
+# A line is anything up to and including `\r\n`, `\r` or `\n`, or the remainder of the text
+LINE_PATTERN = regex.compile('[^\r\n]*(?:\r\n|\r|\n)|[^\r\n]+')
+
+
+def split_lines(text, final=True):
+    """Splits decoded text into lines, keeping the line endings. Returns a tuple:
+    (`list` lines, `str` rest), where `rest` is the unterminated text at the end that must be
+    prepended to the next chunk. When `final` is `True` there is no next chunk and `rest` is empty.
+
+    :type text: str
+
+    :type final: bool
+
+    :rtype: tuple
+    """
+    end = len(text)
+
+    if not final:
+        # A `\r` at the very end may be the first half of a `\r\n` split across chunks
+        if text.endswith('\r'):
+            end -= 1
+        end = max(text.rfind('\n', 0, end), text.rfind('\r', 0, end)) + 1
+
+    return LINE_PATTERN.findall(text, 0, end), text[end:]
+
+
+class IncrementalLineDecoder(object):
+    """Decodes bytes fed in chunks of any size into complete lines, line endings included.
+    Incomplete characters and the unterminated line at the end of a chunk are kept until the next one.
+    If no encoding is given, the data is kept until its encoding is detected, see
+    `gedcom.encoding.detect_encoding`.
+    """
+
+    def __init__(self, encoding=None):
+        """
+        :type encoding: str
+        """
+        self.__encoding = encoding
+        self.__decoder = get_incremental_decoder(encoding) if encoding is not None else None
+        self.__head = b''
+        self.__rest = ''
+
+    def get_encoding(self):
+        """Returns the encoding of the data, or `None` while it is not detected yet
+
+        :rtype: str
+        """
+        return self.__encoding
+
+    def decode(self, data, final=False):
+        """Returns the lines completed by `data`. When `final` is `True` no more data follows and the
+        remaining text is returned as the last line.
+
+        :type data: bytes
+
+        :type final: bool
+
+        :rtype: list of str
+        """
+        if self.__decoder is None:
+            data = self.__head + data
+
+            self.__encoding = detect_encoding(data, final)
+            if self.__encoding is None:
+                self.__head = data
+                return []
+
+            self.__head = b''
+            self.__decoder = get_incremental_decoder(self.__encoding)
+
+        lines, self.__rest = split_lines(self.__rest + self.__decoder.decode(data, final), final)
+        return lines
+
+
+def read_chunks(stream, encoding=None, chunk_size=CHUNK_SIZE):
+    """Generator returning the decoded lines of a binary stream, line endings included, as one
+    list per chunk read. The stream position after each list is available from `stream.tell()`.
+    If `encoding` is `None` it is detected from the start of the stream.
+
+    :type stream: a binary file stream, or `mmap.mmap`
+
+    :type encoding: str
+
+    :type chunk_size: int
+
+    :rtype: generator of list of str
+    """
+    decoder = IncrementalLineDecoder(encoding)
+
+    while True:
+        chunk = stream.read(chunk_size)
+        final = not chunk
+
+        lines = decoder.decode(chunk, final)
+        if lines:
+            yield lines
+
+        if final:
+            return
+
+
+def read_lines(stream, encoding=None, chunk_size=CHUNK_SIZE):
+    """Generator returning the decoded lines of a binary stream, line endings included.
+    If `encoding` is `None` it is detected from the start of the stream.
+
+    :type stream: a binary file stream, or `mmap.mmap`
+
+    :type encoding: str
+
+    :type chunk_size: int
+
+    :rtype: generator of str
+    """
+    for lines in read_chunks(stream, encoding, chunk_size):
+        yield from lines
+
+
+def decode_lines(stream_or_lines, encoding=None):
+    """Returns the decoded lines of a binary stream, see `gedcom.reader.read_lines()`, or of an array of
+    UTF-8 encoded lines
+
+    :type stream_or_lines: a binary file stream, or bytes array of lines with new line at the end
+
+    :type encoding: str
+
+    :rtype: iterable of str
+    """
+    if hasattr(stream_or_lines, 'read'):
+        return read_lines(stream_or_lines, encoding)
+
+    return (line.decode('utf-8-sig') for line in stream_or_lines)
+
+
+def count_lines(buffer, start=0, end=None, chunk_size=CHUNK_SIZE):
+    """Returns the number of line endings (`\r\n`, `\n` or `\r`) in a range of a bytes-like buffer,
+    counted in chunks of `chunk_size` bytes
+
+    :type buffer: bytes or `mmap.mmap`
+
+    :type start: int
+
+    :type end: int
+
+    :type chunk_size: int
+
+    :rtype: int
+    """
+    if end is None:
+        end = len(buffer)
+
+    lines = 0
+    last_byte = b''
+
+    while start < end:
+        chunk = buffer[start:min(start + chunk_size, end)]
+        lines += chunk.count(b'\n') + chunk.count(b'\r') - chunk.count(b'\r\n')
+
+        # a `\r\n` split across two chunks was counted twice
+        if last_byte == b'\r' and chunk[:1] == b'\n':
+            lines -= 1
+
+        last_byte = chunk[-1:]
+        start += chunk_size
+
+    return lines
+
+
+def find_record_boundaries(buffer, parts, window=BOUNDARY_WINDOW):
+    """Returns the byte offsets splitting a bytes-like buffer into at most `parts` ranges of about
+    equal size, each starting with a level 0 line. The first offset is `0`, the last one is the
+    size of the buffer. Each level 0 line is searched in a window of `window` bytes, doubled until one
+    is found, so that only the bytes up to it are read.
+
+    :type buffer: bytes or `mmap.mmap`
+
+    :type parts: int
+
+    :type window: int
+
+    :rtype: list of int
+    """
+    size = len(buffer)
+    boundaries = [0]
+
+    for part in range(1, parts):
+        position = max(size * part // parts, boundaries[-1])
+
+        found = []
+        search_window = window
+        while position < size and not found:
+            # a line ending at the end of the window is found with the start of the next line
+            end = min(position + search_window, size)
+            found = [index for index in (buffer.find(b'\n0 ', position, end + 2),
+                                         buffer.find(b'\r0 ', position, end + 2)) if index >= 0]
+            position = end
+            search_window *= 2
+
+        if not found:
+            break
+
+        boundary = min(found) + 1
+        if boundary > boundaries[-1]:
+            boundaries.append(boundary)
+
+    if size > boundaries[-1]:
+        boundaries.append(size)
+
+    return boundaries
@@ -0,0 +1,283 @@
+# -*- coding: utf-8 -*-
+
+# Python GEDCOM Parser
+#
+# Copyright (C) 2022-2025 Mark Wing (mark @ markwing.net)
+# Copyright (C) 2018 Damon Brodie (damon.brodie at gmail.com)
+# Copyright (C) 2018-2019 Nicklas Reincke (contact at reynke.com)
+# Copyright (C) 2016 Andreas Oberritter
+# Copyright (C) 2012 Madeleine Price Ball
+# Copyright (C) 2005 Daniel Zappala (zappala at cs.byu.edu)
+# Copyright (C) 2005 Brigham Young University
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Further information about the license: http://www.gnu.org/licenses/gpl-2.0.html
+
+
+"""
+Binary snapshots of a tree of elements, written by `gedcom.parser.Parser.save_snapshot` and read by
+`gedcom.parser.Parser.load_snapshot`. Loading a snapshot restores the tree without tokenizing a single line.
+
+A snapshot is a header followed by a string table and one array per element attribute, with the elements
+in document order (depth first):
+
+* header: magic bytes, format version, number of elements, number of strings, size of the string data
+* string table: the length of every string in characters, then all strings as one block of UTF-8
+* `level`, element class, parent index, and `pointer`, `tag`, `value` and `crlf` as indexes into the
+  string table
+
+Numbers are little-endian. Index 0 of the string table stands for `None` and parent index 0 for the root
+element. Only plain data is read, no code is run, so snapshots from untrusted storage are safe to load.
+"""
+
+from array import array
+import gc
+from itertools import accumulate
+import struct
+import sys
+
+from gedcom.element.element import Element
+from gedcom.element.family import FamilyElement
+from gedcom.element.file import FileElement
+from gedcom.element.individual import IndividualElement
+from gedcom.element.note import NoteElement
+from gedcom.element.object import ObjectElement
+from gedcom.element.repository import RepositoryElement
+from gedcom.element.root import RootElement
+from gedcom.element.source import SourceElement
+
+MAGIC = b'GEDSNAP\x00'
+
+VERSION = 1
+
+# magic, version, number of elements, number of strings, size of the string data in bytes
+HEADER = struct.Struct('<8sIIIQ')
+
+ELEMENT_CLASSES = (
+    Element,
+    IndividualElement,
+    FamilyElement,
+    FileElement,
+    NoteElement,
+    ObjectElement,
+    SourceElement,
+    RepositoryElement,
+)
+"""Element classes in the order of their ids; only ever append to keep old snapshots readable"""
+
+# typecodes of the 4 byte arrays
+LEVEL_TYPECODE = 'i'
+INDEX_TYPECODE = 'I'
+CLASS_TYPECODE = 'B'
+
+
+class SnapshotFormatError(Exception):
+    pass
+
+
+def save_snapshot(root_element, snapshot_file):
+    """Writes the tree below `root_element` to a binary file. Elements of other classes than
+    `gedcom.snapshot.ELEMENT_CLASSES` are saved as the closest class they derive from.
+    Folded `CONC` and `CONT` lines are saved, and loaded, as child elements.
+
+    :type root_element: RootElement
+
+    :type snapshot_file: a binary file stream
+    """
+    class_ids = {element_class: class_id for class_id, element_class in enumerate(ELEMENT_CLASSES)}
+
+    # string to string id, in order of first appearance
+    strings = {None: 0}
+
+    levels = array(LEVEL_TYPECODE)
+    classes = array(CLASS_TYPECODE)
+    parents = array(INDEX_TYPECODE)
+    pointers = array(INDEX_TYPECODE)
+    tags = array(INDEX_TYPECODE)
+    values = array(INDEX_TYPECODE)
+    crlfs = array(INDEX_TYPECODE)
+
+    # (element, index of its parent), the root element has index 0
+    stack = [(element, 0) for element in reversed(root_element.get_child_elements())]
+
+    while stack:
+        element, parent = stack.pop()
+
+        element_class = type(element)
+        if element_class not in class_ids:
+            class_ids[element_class] = _get_class_id(element_class)
+
+        levels.append(element.get_level())
+        classes.append(class_ids[element_class])
+        parents.append(parent)
+        pointers.append(strings.setdefault(element.get_pointer(), len(strings)))
+        tags.append(strings.setdefault(element.get_tag(), len(strings)))
+        values.append(strings.setdefault(element.get_value(), len(strings)))
+        crlfs.append(strings.setdefault(element.get_crlf(), len(strings)))
+
+        index = len(levels)
+        children = element.get_folded_elements()
+        if element.has_child_elements():
+            children += element.get_child_elements()
+        stack.extend((child, index) for child in reversed(children))
+
+    string_list = list(strings)[1:]
+    lengths = array(INDEX_TYPECODE, [len(string) for string in string_list])
+    string_data = "".join(string_list).encode('utf-8', 'surrogatepass')
+
+    snapshot_file.write(HEADER.pack(MAGIC, VERSION, len(levels), len(string_list), len(string_data)))
+    _write_array(snapshot_file, lengths)
+    snapshot_file.write(string_data)
+    for column in (levels, classes, parents, pointers, tags, values, crlfs):
+        _write_array(snapshot_file, column)
+
+
+def load_snapshot(snapshot_file):
+    """Reads a tree written by `gedcom.snapshot.save_snapshot` and returns its root element.
+    Raises `SnapshotFormatError` if the file is not a valid snapshot.
+
+    :type snapshot_file: a binary file stream
+
+    :rtype: RootElement
+    """
+    data = memoryview(snapshot_file.read())
+
+    if len(data) < HEADER.size:
+        raise SnapshotFormatError("File is too short to be a GEDCOM snapshot")
+
+    magic, version, element_count, string_count, string_size = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise SnapshotFormatError("File is not a GEDCOM snapshot")
+    if version != VERSION:
+        raise SnapshotFormatError("Unsupported GEDCOM snapshot version %d" % version)
+
+    reader = _BlockReader(data, HEADER.size)
+
+    lengths = reader.read_array(INDEX_TYPECODE, string_count)
+    try:
+        text = reader.read_bytes(string_size).decode('utf-8', 'surrogatepass')
+    except UnicodeDecodeError:
+        raise SnapshotFormatError("GEDCOM snapshot is corrupt")
+
+    levels = reader.read_array(LEVEL_TYPECODE, element_count)
+    classes = reader.read_array(CLASS_TYPECODE, element_count)
+    parents = reader.read_array(INDEX_TYPECODE, element_count)
+    pointers = reader.read_array(INDEX_TYPECODE, element_count)
+    tags = reader.read_array(INDEX_TYPECODE, element_count)
+    values = reader.read_array(INDEX_TYPECODE, element_count)
+    crlfs = reader.read_array(INDEX_TYPECODE, element_count)
+
+    ends = list(accumulate(lengths))
+    # the strings must make up the text exactly, otherwise they are cut at the wrong places
+    if (ends[-1] if ends else 0) != len(text):
+        raise SnapshotFormatError("GEDCOM snapshot is corrupt")
+
+    strings = [None] + [text[end - length:end] for end, length in zip(ends, lengths)]
+
+    root_element = RootElement()
+    elements = [root_element]
+
+    get_string = strings.__getitem__
+
+    # every element forms reference cycles with its parent, which would trigger the cyclic
+    # garbage collector over and over while nothing can be collected
+    gc_enabled = gc.isenabled()
+    gc.disable()
+
+    try:
+        for element_class, level, parent, pointer, tag, value, crlf in zip(
+                map(ELEMENT_CLASSES.__getitem__, classes), levels, parents,
+                map(get_string, pointers), map(get_string, tags), map(get_string, values), map(get_string, crlfs)):
+            element = element_class(level, pointer, tag, value, crlf, False)
+            # like the parser, without `notify_change`, nothing has been derived from the new elements
+            elements[parent].get_child_elements().append_element(element)
+            element.set_parent_element(elements[parent])
+            elements.append(element)
+    except IndexError:
+        raise SnapshotFormatError("GEDCOM snapshot is corrupt")
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    return root_element
+
+
+def _get_class_id(element_class):
+    """Returns the id of the closest class in `ELEMENT_CLASSES` that `element_class` derives from
+
+    :type element_class: type
+
+    :rtype: int
+    """
+    for base_class in element_class.__mro__:
+        if base_class in ELEMENT_CLASSES:
+            return ELEMENT_CLASSES.index(base_class)
+
+    raise SnapshotFormatError("%s is not an element class" % element_class.__name__)
+
+
+def _write_array(snapshot_file, column):
+    """Writes an array as little-endian
+
+    :type snapshot_file: a binary file stream
+
+    :type column: array
+    """
+    if sys.byteorder == 'big':
+        column = array(column.typecode, column)
+        column.byteswap()
+
+    snapshot_file.write(column.tobytes())
+
+
+class _BlockReader(object):
+    """Reads consecutive blocks of a snapshot"""
+
+    def __init__(self, data, offset):
+        self.__data = data
+        self.__offset = offset
+
+    def read_bytes(self, size):
+        """Returns the next `size` bytes
+
+        :type size: int
+
+        :rtype: bytes
+        """
+        if self.__offset + size > len(self.__data):
+            raise SnapshotFormatError("GEDCOM snapshot is truncated")
+
+        block = self.__data[self.__offset:self.__offset + size]
+        self.__offset += size
+
+        return bytes(block)
+
+    def read_array(self, typecode, count):
+        """Returns the next `count` little-endian numbers of an array type
+
+        :type typecode: str
+
+        :type count: int
+
+        :rtype: array
+        """
+        column = array(typecode)
+        column.frombytes(self.read_bytes(count * column.itemsize))
+
+        if sys.byteorder == 'big':
+            column.byteswap()
+
+        return column
@@ -0,0 +1,463 @@
+# -*- coding: utf-8 -*-
+
+# Python GEDCOM Parser
+#
+# Copyright (C) 2022-2025 Mark Wing (mark @ markwing.net)
+# Copyright (C) 2018 Damon Brodie (damon.brodie at gmail.com)
+# Copyright (C) 2018-2019 Nicklas Reincke (contact at reynke.com)
+# Copyright (C) 2016 Andreas Oberritter
+# Copyright (C) 2012 Madeleine Price Ball
+# Copyright (C) 2005 Daniel Zappala (zappala at cs.byu.edu)
+# Copyright (C) 2005 Brigham Young University
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Further information about the license: http://www.gnu.org/licenses/gpl-2.0.html
+
+
+"""
+Array-backed storage of a GEDCOM tree, used by `gedcom.parser.Parser` when parsing with `store=True`.
+
+Instead of one `gedcom.element.element.Element` object per line, `gedcom.store.ElementStore` keeps
+one `array.array` column per attribute, in document order (depth first):
+
+* `level`
+* `tag`, `pointer` and `crlf` as ids into a table of distinct strings
+* the offset and length of `value` in a single block of UTF-8 data
+* the index of the parent and the index after the last descendant
+
+That is about 36 bytes per line plus the value. Elements are created on demand as views of one line of
+the store (`gedcom.store.ElementView`), with the same classes, methods and getters as parsed elements.
+Views are cheap and not kept; two views of the same line compare equal.
+
+The structure of a store cannot be changed: adding or removing elements, or changing pointers, raises a
+`gedcom.store.ReadOnlyElementError`. Values can be changed with `set_value`.
+"""
+
+from array import array
+from collections.abc import Mapping
+
+from gedcom.element.element import Element
+from gedcom.element.family import FamilyElement
+from gedcom.element.file import FileElement
+from gedcom.element.individual import IndividualElement
+from gedcom.element.note import NoteElement
+from gedcom.element.object import ObjectElement
+from gedcom.element.repository import RepositoryElement
+from gedcom.element.root import RootElement
+from gedcom.element.source import SourceElement
+from gedcom.tokenizer import tokenize
+import gedcom.tags
+
+ROOT_INDEX = -1
+"""Index of the virtual root element of a store"""
+
+
+class ReadOnlyElementError(Exception):
+    pass
+
+
+class ElementView(Element):
+    """An element of a `gedcom.store.ElementStore`. All data is read from, and written to, the store.
+    Views are created on access and are short-lived, so they keep an instance dictionary instead of declaring
+    `__slots__`, which could not be combined with the slots of the element classes.
+    """
+
+    def __init__(self, store, index):
+        """
+        :type store: ElementStore
+
+        :type index: int
+        """
+        # the attributes of `Element` stay unset, they are all in the store
+        self.__store = store
+        self.__index = index
+
+    def get_store(self):
+        """Returns the store of this element
+
+        :rtype: ElementStore
+        """
+        return self.__store
+
+    def get_index(self):
+        """Returns the index of this element in its store
+
+        :rtype: int
+        """
+        return self.__index
+
+    def get_level(self):
+        return self.__store.get_level(self.__index)
+
+    def get_pointer(self):
+        return self.__store.get_pointer(self.__index)
+
+    def get_tag(self):
+        return self.__store.get_tag(self.__index)
+
+    def get_value(self):
+        return self.__store.get_value(self.__index)
+
+    def set_value(self, value):
+        self.__store.set_value(self.__index, value)
+
+    def get_crlf(self):
+        return self.__store.get_crlf(self.__index)
+
+    def get_child_elements(self):
+        """Returns the direct child elements of this element. Changing the returned list does not change the store.
+
+        :rtype: list of ElementView
+        """
+        return [self.__store.get_element(index) for index in self.__store.get_child_indexes(self.__index)]
+
+    def has_child_elements(self):
+        return bool(self.__store.get_child_indexes(self.__index))
+
+    def get_child_elements_by_tag(self, tag):
+        return [self.__store.get_element(index) for index in self.__store.get_child_indexes(self.__index)
+                if self.__store.get_tag(index) == tag]
+
+    def get_parent_element(self):
+        parent_index = self.__store.get_parent_index(self.__index)
+        return self.__store.get_element(parent_index) if parent_index is not None else None
+
+    def add_child_element(self, element):
+        raise ReadOnlyElementError("Elements cannot be added to an element store")
+
+    def remove_child_element(self, pointer):
+        raise ReadOnlyElementError("Elements cannot be removed from an element store")
+
+    def remove_child_elements(self, elements):
+        raise ReadOnlyElementError("Elements cannot be removed from an element store")
+
+    def set_pointer(self, pointer):
+        raise ReadOnlyElementError("The pointers of an element store cannot be changed")
+
+    def set_parent_element(self, element):
+        raise ReadOnlyElementError("Elements of an element store cannot be moved")
+
+    def notify_change(self, change=None, element=None):
+        # nothing is derived from the store outside of it
+        pass
+
+    def is_folded(self):
+        return False
+
+    def fold_continuations(self):
+        raise ReadOnlyElementError("Elements of an element store cannot be folded")
+
+    def __eq__(self, other):
+        return isinstance(other, ElementView) and self.__store is other.__store and self.__index == other.__index
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((id(self.__store), self.__index))
+
+
+class IndividualElementView(ElementView, IndividualElement):
+    # views are created on every access and cannot be notified of changes
+    cache_derived_values = False
+
+
+class FamilyElementView(ElementView, FamilyElement):
+    pass
+
+
+class FileElementView(ElementView, FileElement):
+    pass
+
+
+class NoteElementView(ElementView, NoteElement):
+    pass
+
+
+class ObjectElementView(ElementView, ObjectElement):
+    pass
+
+
+class SourceElementView(ElementView, SourceElement):
+    pass
+
+
+class RepositoryElementView(ElementView, RepositoryElement):
+    pass
+
+
+class RootElementView(ElementView, RootElement):
+    pass
+
+
+# View classes by tag, matching the element classes `gedcom.parser.Parser` creates
+VIEW_CLASSES = {
+    gedcom.tags.GEDCOM_TAG_INDIVIDUAL: IndividualElementView,
+    gedcom.tags.GEDCOM_TAG_FAMILY: FamilyElementView,
+    gedcom.tags.GEDCOM_TAG_FILE: FileElementView,
+    gedcom.tags.GEDCOM_TAG_NOTE: NoteElementView,
+    gedcom.tags.GEDCOM_TAG_OBJECT: ObjectElementView,
+    gedcom.tags.GEDCOM_TAG_SOURCE: SourceElementView,
+    gedcom.tags.GEDCOM_TAG_REPOSITORY: RepositoryElementView,
+}
+
+
+class ElementStore(object):
+    """Column store of the lines of a GEDCOM file, see `gedcom.store`"""
+
+    def __init__(self):
+        self.__levels = array('i')
+        self.__tags = array('I')
+        self.__pointers = array('I')
+        self.__crlfs = array('I')
+        self.__value_offsets = array('Q')
+        self.__value_lengths = array('I')
+        self.__parents = array('i')
+        self.__ends = array('I')
+
+        self.__strings = []
+        self.__string_ids = {}
+        self.__value_data = bytearray()
+
+        # index of each logical record with a pointer
+        self.__records = {}
+
+    def parse(self, lines, strict=True):
+        """Adds decoded GEDCOM lines to an empty store
+
+        :type lines: iterable of str
+
+        :type strict: bool
+        """
+        levels = self.__levels
+        parents = self.__parents
+        ends = self.__ends
+        get_string_id = self.__get_string_id
+
+        line_number = 1
+        last_index = ROOT_INDEX
+        last_level = -1
+        last_tag = "ROOT"
+
+        for line in lines:
+            level, pointer, tag, value, crlf = tokenize(line_number, line, last_level, last_tag, strict)
+            index = len(levels)
+
+            # back up to the parent, ending every element passed
+            parent_index = last_index
+            while parent_index != ROOT_INDEX and levels[parent_index] > level - 1:
+                ends[parent_index] = index
+                parent_index = parents[parent_index]
+
+            levels.append(level)
+            self.__tags.append(get_string_id(tag))
+            self.__pointers.append(get_string_id(pointer))
+            self.__crlfs.append(get_string_id(crlf))
+            self.__append_value(value)
+            parents.append(parent_index)
+            ends.append(0)
+
+            if parent_index == ROOT_INDEX and pointer:
+                self.__records[pointer] = index
+
+            last_index = index
+            last_level = level
+            last_tag = tag
+            line_number += 1
+
+        # the elements of the last line and its ancestors end with the store
+        while last_index != ROOT_INDEX:
+            ends[last_index] = len(levels)
+            last_index = parents[last_index]
+
+    def __len__(self):
+        return len(self.__levels)
+
+    def get_memory_size(self):
+        """Returns the number of bytes used by the columns and the value data, without the string table
+
+        :rtype: int
+        """
+        columns = (self.__levels, self.__tags, self.__pointers, self.__crlfs, self.__value_offsets,
+                   self.__value_lengths, self.__parents, self.__ends)
+
+        return sum(column.buffer_info()[1] * column.itemsize for column in columns) + len(self.__value_data)
+
+    def get_level(self, index):
+        """Returns the level of an element
+
+        :type index: int
+
+        :rtype: int
+        """
+        return self.__levels[index] if index != ROOT_INDEX else -1
+
+    def get_pointer(self, index):
+        """Returns the pointer of an element
+
+        :type index: int
+
+        :rtype: str
+        """
+        return self.__strings[self.__pointers[index]] if index != ROOT_INDEX else ""
+
+    def get_tag(self, index):
+        """Returns the tag of an element
+
+        :type index: int
+
+        :rtype: str
+        """
+        return self.__strings[self.__tags[index]] if index != ROOT_INDEX else "ROOT"
+
+    def get_crlf(self, index):
+        """Returns the line ending of an element
+
+        :type index: int
+
+        :rtype: str
+        """
+        return self.__strings[self.__crlfs[index]] if index != ROOT_INDEX else "\n"
+
+    def get_value(self, index):
+        """Returns the value of an element
+
+        :type index: int
+
+        :rtype: str
+        """
+        if index == ROOT_INDEX:
+            return ""
+
+        offset = self.__value_offsets[index]
+        return self.__value_data[offset:offset + self.__value_lengths[index]].decode('utf-8', 'surrogatepass')
+
+    def set_value(self, index, value):
+        """Sets the value of an element. The previous value keeps its space in the store.
+
+        :type index: int
+
+        :type value: str
+        """
+        if index == ROOT_INDEX:
+            raise ReadOnlyElementError("The value of the root element cannot be changed")
+
+        data = value.encode('utf-8', 'surrogatepass')
+        self.__value_offsets[index] = len(self.__value_data)
+        self.__value_lengths[index] = len(data)
+        self.__value_data += data
+
+    def get_parent_index(self, index):
+        """Returns the index of the parent of an element, `None` for the root element
+
+        :type index: int
+
+        :rtype: int
+        """
+        return self.__parents[index] if index != ROOT_INDEX else None
+
+    def get_child_indexes(self, index):
+        """Returns the indexes of the direct children of an element
+
+        :type index: int
+
+        :rtype: list of int
+        """
+        ends = self.__ends
+        end = ends[index] if index != ROOT_INDEX else len(ends)
+
+        child_indexes = []
+        child_index = index + 1
+        while child_index < end:
+            child_indexes.append(child_index)
+            child_index = ends[child_index]
+
+        return child_indexes
+
+    def get_element(self, index):
+        """Returns a view of the element at an index
+
+        :type index: int
+
+        :rtype: ElementView
+        """
+        if index == ROOT_INDEX:
+            return RootElementView(self, index)
+
+        return VIEW_CLASSES.get(self.get_tag(index), ElementView)(self, index)
+
+    def get_root_element(self):
+        """Returns a view of the virtual root element containing all logical records as children
+
+        :rtype: RootElementView
+        """
+        return self.get_element(ROOT_INDEX)
+
+    def get_element_dictionary(self):
+        """Returns a read-only mapping of the pointers of the logical records to views of them
+
+        :rtype: ElementDictionary
+        """
+        return ElementDictionary(self, self.__records)
+
+    def __get_string_id(self, string):
+        """Returns the id of a tag, pointer or line ending in the string table
+
+        :type string: str
+
+        :rtype: int
+        """
+        string_id = self.__string_ids.get(string)
+        if string_id is None:
+            string_id = self.__string_ids[string] = len(self.__strings)
+            self.__strings.append(string)
+
+        return string_id
+
+    def __append_value(self, value):
+        """Appends the value of a new element
+
+        :type value: str
+        """
+        data = value.encode('utf-8', 'surrogatepass')
+        self.__value_offsets.append(len(self.__value_data))
+        self.__value_lengths.append(len(data))
+        self.__value_data += data
+
+
+class ElementDictionary(Mapping):
+    """Read-only mapping of the pointers of the logical records of a `gedcom.store.ElementStore` to views of them"""
+
+    def __init__(self, store, records):
+        """
+        :type store: ElementStore
+
+        :type records: dict of int
+        """
+        self.__store = store
+        self.__records = records
+
+    def __getitem__(self, pointer):
+        return self.__store.get_element(self.__records[pointer])
+
+    def __contains__(self, pointer):
+        return pointer in self.__records
+
+    def __iter__(self):
+        return iter(self.__records)
+
+    def __len__(self):
+        return len(self.__records)
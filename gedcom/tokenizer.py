@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+
+# Python GEDCOM Parser
+#
+# Copyright (C) 2022-2025 Mark Wing (mark @ markwing.net)
+# Copyright (C) 2018 Damon Brodie (damon.brodie at gmail.com)
+# Copyright (C) 2018-2019 Nicklas Reincke (contact at reynke.com)
+# Copyright (C) 2016 Andreas Oberritter
+# Copyright (C) 2012 Madeleine Price Ball
+# Copyright (C) 2005 Daniel Zappala (zappala at cs.byu.edu)
+# Copyright (C) 2005 Brigham Young University
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Further information about the license: http://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+Tokenizer splitting a single GEDCOM line into its `level`, `pointer`, `tag`, `value` and line ending.
+Used by `gedcom.parser.Parser` before elements are created.
+
+The patterns are compiled once, at import time, instead of once per line.
+
+`gedcom.tokenizer.tokenize` interns tags, line endings and short values, so that equal strings of
+different lines are stored once: tags are the constants of `gedcom.tags` where one exists, values
+such as dates, places and pointers to records are shared through a bounded table.
+"""
+
+import re as regex
+import gedcom.tags
+
+
+class GedcomFormatViolationError(Exception):
+    pass
+
+
+# Level must start with non-negative int, no leading zeros.
+LEVEL_REGEX = '(0|[1-9]+[0-9]*) '
+
+# Pointer optional, if it exists it must be flanked by `@`
+POINTER_REGEX = '(@[^@]+@ |)'
+
+# Tag must be an alphanumeric string
+TAG_REGEX = '([A-Za-z0-9_]+)'
+
+# Value optional, consists of anything after a space to end of line
+VALUE_REGEX = '( [^\n\r]*|)'
+
+# End of line defined by `\n` or `\r`
+END_OF_LINE_REGEX = '([\r\n]{1,2})'
+
+GEDCOM_LINE_PATTERN = regex.compile(LEVEL_REGEX + POINTER_REGEX + TAG_REGEX + VALUE_REGEX + END_OF_LINE_REGEX)
+"""Complete GEDCOM 5.5 line: `level + ' ' + [pointer + ' ' +] tag + [' ' + line_value]` and a line ending"""
+
+LAST_LINE_PATTERN = regex.compile(LEVEL_REGEX + POINTER_REGEX + TAG_REGEX + VALUE_REGEX)
+"""Quirk: a GEDCOM line without a line ending (usually the last line of a file)"""
+
+CONTINUATION_LINE_PATTERN = regex.compile('([^\n\r]*|)' + END_OF_LINE_REGEX)
+"""Quirk: a text field broken by a line ending, without level and tag"""
+
+INTERN_TABLE_SIZE = 65536
+"""Maximum number of distinct values in the intern table; it starts over when full"""
+
+MAXIMUM_INTERNED_VALUE_LENGTH = 80
+"""Longer values, mostly notes and other free text, are rarely repeated and not interned"""
+
+
+class InternTable(object):
+    """Bounded table of distinct strings. `gedcom.tokenizer.InternTable.intern()` returns the string in the
+    table equal to the one given, adding it if there is none. When the table is full, it is emptied
+    except for the initial strings."""
+
+    def __init__(self, size=INTERN_TABLE_SIZE, initial_strings=()):
+        """
+        :type size: int
+
+        :type initial_strings: iterable of str
+        """
+        self.__size = size
+        self.__initial_strings = {string: string for string in initial_strings}
+        self.__strings = dict(self.__initial_strings)
+
+    def intern(self, string):
+        """Returns the string in the table equal to `string`
+
+        :type string: str
+
+        :rtype: str
+        """
+        interned = self.__strings.get(string)
+
+        if interned is None:
+            if len(self.__strings) >= self.__size:
+                self.__strings = dict(self.__initial_strings)
+
+            interned = self.__strings[string] = string
+
+        return interned
+
+    def __len__(self):
+        return len(self.__strings)
+
+
+TAGS = InternTable(initial_strings=[value for name, value in vars(gedcom.tags).items() if name.startswith('GEDCOM_')])
+"""Intern table of tags and line endings, starting with the tags of `gedcom.tags`"""
+
+VALUES = InternTable()
+"""Intern table of values"""
+
+
+def tokenize_line(line):
+    """Splits a GEDCOM line into a tuple: (`int` level, `str` pointer, `str` tag, `str` value, `str` crlf).
+    Returns `None` when the line violates GEDCOM format 5.5. A missing pointer is returned as `""`.
+
+    :type line: str
+
+    :rtype: tuple
+    """
+    regex_match = GEDCOM_LINE_PATTERN.match(line)
+    if regex_match is None:
+        return None
+
+    level, pointer, tag, value, crlf = regex_match.groups()
+    return int(level), pointer.rstrip(' '), tag, value[1:], crlf
+
+
+def tokenize(line_number, line, last_level=-1, last_tag="ROOT", strict=True):
+    """Splits a GEDCOM line into a tuple: (`int` level, `str` pointer, `str` tag, `str` value, `str` crlf),
+    given the level and tag of the previous line.
+    Raises `GedcomFormatViolationError` if the line violates GEDCOM format 5.5. If `strict` is `False`,
+    a line without a line ending and a text line without level and tag are accepted, the latter as
+    a `CONC` line (`pointer` is then `None`). Tags, line endings and values up to
+    `gedcom.tokenizer.MAXIMUM_INTERNED_VALUE_LENGTH` characters are interned.
+
+    :type line_number: int
+
+    :type line: str
+
+    :type last_level: int
+
+    :type last_tag: str
+
+    :type strict: bool
+
+    :rtype: tuple
+    """
+    tokens = tokenize_line(line)
+
+    if tokens is None:
+        if strict:
+            error_message = ("Line <%d:%s> of document violates GEDCOM format 5.5" % (line_number, line)
+                             + "\nSee: https://chronoplexsoftware.com/gedcomvalidator/gedcom/gedcom-5.5.pdf")
+            raise GedcomFormatViolationError(error_message)
+        else:
+            # Quirk check - see if this is a line without a CRLF (which could be the last line)
+            regex_match = LAST_LINE_PATTERN.match(line)
+            if regex_match is not None:
+                line_parts = regex_match.groups()
+
+                level = int(line_parts[0])
+                pointer = line_parts[1].rstrip(' ')
+                tag = line_parts[2]
+                value = line_parts[3][1:]
+                crlf = '\n'
+            else:
+                # Quirk check - Sometimes a gedcom has a text field with a CR.
+                # This creates a line without the standard level and pointer.
+                # If this is detected then turn it into a CONC or CONT.
+                regex_match = CONTINUATION_LINE_PATTERN.match(line)
+                line_parts = regex_match.groups()
+                level = last_level
+                tag = last_tag
+                pointer = None
+                value = line_parts[0][1:]
+                crlf = line_parts[1]
+                if tag != gedcom.tags.GEDCOM_TAG_CONTINUED and tag != gedcom.tags.GEDCOM_TAG_CONCATENATION:
+                    # Increment level and change this line to a CONC
+                    level += 1
+                    tag = gedcom.tags.GEDCOM_TAG_CONCATENATION
+    else:
+        level, pointer, tag, value, crlf = tokens
+
+    # Check level: should never be more than one higher than previous line.
+    if level > last_level + 1:
+        error_message = ("Line %d of document violates GEDCOM format 5.5" % line_number
+                         + "\nLines must be no more than one level higher than previous line."
+                         + "\nSee: https://chronoplexsoftware.com/gedcomvalidator/gedcom/gedcom-5.5.pdf")
+        raise GedcomFormatViolationError(error_message)
+
+    if len(value) <= MAXIMUM_INTERNED_VALUE_LENGTH:
+        value = VALUES.intern(value)
+
+    return level, pointer, TAGS.intern(tag), value, TAGS.intern(crlf)
@@ -1,17 +1,48 @@
 import sys
 import getopt
+from array import array
+from contextlib import ExitStack
+from io import BytesIO
+import mmap as memory_map
+import os
 from pathlib import Path
+import re as regex
 
 from gedcom.element.family import FamilyElement
 from gedcom.element.individual import IndividualElement
 from gedcom.element.individual import NotAnActualIndividualError
+from gedcom.element.note import NoteElement
 from gedcom.element.object import ObjectElement
 from gedcom.element.source import SourceElement
 from gedcom.element.repository import RepositoryElement
+from gedcom.encoding import detect_encoding, is_ascii_compatible, HEADER_SIZE
 from gedcom.parser import Parser
+from gedcom.progress import ConsoleProgressReporter, wrap_callback
+from gedcom.reader import count_lines
+from gedcom.tokenizer import GedcomFormatViolationError
 
 import gedcom.tags
 
+SPLIT_RECORD_TYPES = (IndividualElement, FamilyElement, SourceElement, RepositoryElement, ObjectElement, NoteElement)
+"""Classes of the records that are only kept in a split if they are related to the ancestor"""
+
+REFERENCED_RECORD_TAGS = {gedcom.tags.GEDCOM_TAG_SOURCE, gedcom.tags.GEDCOM_TAG_REPOSITORY,
+                          gedcom.tags.GEDCOM_TAG_OBJECT, gedcom.tags.GEDCOM_TAG_NOTE}
+"""Tags of the records that are kept in a split if they are referenced from the kept records"""
+
+# A level 0 line, following a line ending, capturing the pointer of the record if it has one, and its tag
+RECORD_PATTERN = regex.compile(rb'[\r\n]0 (?:(@[^@\r\n]+@) )?([^ \r\n]*)')
+
+# The first line of the file, after an optional byte order mark, if it is a level 0 line
+FIRST_RECORD_PATTERN = regex.compile(rb'(?:\xef\xbb\xbf)?0 (?:(@[^@\r\n]+@) )?([^ \r\n]*)')
+
+# A level 1 line linking individuals and families, capturing its tag and the pointer it links to
+LINK_PATTERN = regex.compile(rb'[\r\n]1 (FAMC|FAMS|HUSB|WIFE) (@[^@\r\n]+@)(?=[\r\n]|$)')
+
+OTHER_RECORD = 0
+INDIVIDUAL_RECORD = 1
+FAMILY_RECORD = 2
+
 
 class Splitter(Parser):
 
@@ -24,6 +55,9 @@ class Splitter(Parser):
         are not a spouse). If include_inlaws is True, it also includes the parents of spouses and
         descendants' parents.
 
+        The records not in the split are removed from the tree. See `write_split` to write the split
+        without changing the tree.
+
         :type ancestor: Element
 
         :type include_inlaws: bool
@@ -32,233 +66,726 @@ class Splitter(Parser):
 
         :rtype: str
         """
+        callback = wrap_callback(callback)
+
+        if not self.__is_in_tree(ancestor):
+            return 'Ancestor not in tree'
+
+        kept_pointers = self.__find_all_kept_pointers([ancestor], include_inlaws, callback)[0]
+
+        self.__remove_root_child_elements(IndividualElement, kept_pointers, "Removing non-family members", callback,
+                                          FamilyElement)
+        self.__remove_root_child_elements(SourceElement, kept_pointers, "Removing unused sources", callback)
+        self.__remove_root_child_elements(RepositoryElement, kept_pointers, "Removing unused repositories", callback)
+        self.__remove_root_child_elements(ObjectElement, kept_pointers, "Removing unused media", callback)
+        self.__remove_root_child_elements(NoteElement, kept_pointers, "Removing unused notes", callback)
+
+    def write_split(self, ancestor, output, include_inlaws=True, callback=None):
+        """Writes the records `split_gedcom` would keep to `output`, a file name or a text stream, without
+        changing the tree. Several splits can be written from one parsed file this way.
+
+        :type ancestor: Element
+
+        :type output: str or a text stream
+
+        :type include_inlaws: bool
+
+        :type callback: function(str message, progress int, progress_total int
+
+        :rtype: str
+        """
+        callback = wrap_callback(callback)
+
+        if not self.__is_in_tree(ancestor):
+            return 'Ancestor not in tree'
+
+        kept_pointers = self.__find_all_kept_pointers([ancestor], include_inlaws, callback)[0]
+        self.__write_records(self.__get_kept_records(kept_pointers), output, callback)
+
+    def split_many(self, splits, include_inlaws=True, callback=None):
+        """Writes the records `split_gedcom` would keep for each ancestor to its output, without changing
+        the tree. `splits` is a list of tuples (`ancestor`, `output`), where `output` is a file name or a text
+        stream. The descendants of all ancestors are found in one traversal of the families, and all outputs
+        are written in one pass over the records, converting each record to a string once. All outputs are
+        open at the same time.
+
+        Splits whose ancestor is not in the tree are not written. Returns their ancestors.
+
+        :type splits: list of tuple
+
+        :type include_inlaws: bool
+
+        :type callback: function(str message, progress int, progress_total int
+
+        :rtype: list of IndividualElement
+        """
+        callback = wrap_callback(callback)
+
+        missing_ancestors = [ancestor for ancestor, output in splits if not self.__is_in_tree(ancestor)]
+        missing_ids = {id(ancestor) for ancestor in missing_ancestors}
+        splits = [(ancestor, output) for ancestor, output in splits if id(ancestor) not in missing_ids]
+
+        all_kept_pointers = self.__find_all_kept_pointers([ancestor for ancestor, output in splits], include_inlaws,
+                                                          callback)
+
+        # outputs of each record, by position; records of other classes go to all outputs
+        positions, records_by_pointer = self.__index_root_child_elements()
+        outputs_by_position = {}
+        for output, kept_pointers in enumerate(all_kept_pointers):
+            for element_type, pointers in kept_pointers.items():
+                for element in self.__get_records(pointers, element_type, records_by_pointer):
+                    outputs_by_position.setdefault(positions[element], []).append(output)
+
+        all_outputs = list(range(len(splits)))
+
+        # files already opened are closed if opening a later one fails
+        with ExitStack() as stack:
+            files = [output if hasattr(output, 'write')
+                     else stack.enter_context(open(output, 'w', encoding='utf-8', newline=''))
+                     for ancestor, output in splits]
+
+            root_elements = len(self.get_root_child_elements())
+            count = 0
+            for position, element in enumerate(self.get_root_child_elements()):
+                if isinstance(element, SPLIT_RECORD_TYPES):
+                    outputs = outputs_by_position.get(position, ())
+                else:
+                    outputs = all_outputs
 
+                if outputs:
+                    record = element.to_gedcom_string(True)
+                    for output in outputs:
+                        files[output].write(record)
+
+                count += 1
+                self.__update_progress("Writing files", count, root_elements, callback)
+
+        return missing_ancestors
+
+    def write_file(self, file_name, callback=None):
+        """Writes tree in output file, or to a text stream
+
+        :type file_name: str or a text stream
+
+        :type callback: function(message as str, count as int, total as int)
+        """
+        self.__write_records(self.get_root_child_elements(), file_name, wrap_callback(callback))
+
+    def __is_in_tree(self, ancestor):
+        """Returns whether the ancestor of a split is in the tree
+
+        :type ancestor: Element
+
+        :rtype: bool
+        """
         # validate ancestor
         if not isinstance(ancestor, IndividualElement):
             raise NotAnActualIndividualError(
                 "Operation only valid for elements with %s tag" % gedcom.tags.GEDCOM_TAG_INDIVIDUAL
             )
 
-        if ancestor.get_pointer() not in self.get_element_dictionary():
-            return 'Ancestor not in tree'
+        return ancestor.get_pointer() in self.get_element_dictionary()
 
-        # initialize arrays used when determining what to include
-        individual_ids = []
-        family_ids = []
-        source_ids = []
-        repository_ids = []
-        object_ids = []
-        spouses = []
+    def __find_all_kept_pointers(self, ancestors, include_inlaws, callback):
+        """Returns the pointers of the records in the split of `split_gedcom` for each ancestor, as dictionaries
+        of sets of pointers by element class, for the classes of records that are not all kept. The records of
+        each split are visited in tree order, without going through the other records. Sources, repositories, media
+        and notes are kept if they are referenced at any depth from the kept individuals and families, from the
+        records of other classes, such as the header, or from each other, see
+        `gedcom.parser.Parser.find_referenced_pointers()`. The tree is not changed.
 
-        root_elements = len(self.get_root_child_elements())
-        people_in_tree = 0
+        :type ancestors: list of IndividualElement
 
-        # get descendants, their family elements and the pointers for the their spouses
-        count = 0
-        for element in self.get_root_child_elements():
-            if isinstance(element, IndividualElement):
-                people_in_tree += 1
-                if self.find_path_to_ancestor(element, ancestor, parent_type="All") is not None:
-                    individual_ids.append(element.get_pointer())
+        :type include_inlaws: bool
 
-                    for family_element in self.get_families(element):
-                        family_ids.append(family_element.get_pointer())
+        :type callback: function(str message, progress int, progress_total int
 
-                        for spouse_element in self.get_family_members(family_element, "PARENTS"):
-                            if element.get_pointer() != spouse_element.get_pointer():
-                                spouses.append(spouse_element.get_pointer())
+        :rtype: list of dict of set of str
+        """
+        positions, records_by_pointer = self.__index_root_child_elements()
+        all_descendants = self.__find_all_descendants(ancestors, self.__get_children_by_parent())
+
+        def in_tree_order(elements):
+            return sorted(elements, key=positions.__getitem__)
+
+        def get_pointers(pointers, element_type):
+            return {element.get_pointer()
+                    for element in self.__get_records(pointers, element_type, records_by_pointer)}
+
+        other_records = [element for element in self.get_root_child_elements()
+                         if not isinstance(element, SPLIT_RECORD_TYPES)]
+
+        all_kept_pointers = []
+        for descendants in all_descendants:
+            # initialize sets used when determining what to include
+            individual_ids = set()
+            family_ids = set()
+            spouses = set()
+
+            # get descendants, their family elements and the pointers for the their spouses
+            records = in_tree_order(descendants)
+            count = 0
+            for element in records:
+                individual_ids.add(element.get_pointer())
+
+                for family_element in self.get_families(element):
+                    family_ids.add(family_element.get_pointer())
+
+                    for spouse_element in self.get_family_members(family_element, "PARENTS"):
+                        if element.get_pointer() != spouse_element.get_pointer():
+                            spouses.add(spouse_element.get_pointer())
+
+                count += 1
+                self.__update_progress("Gathering descendants", count, len(records), callback)
+
+            # get spouses, their family elements and optionally their parents
+            records = in_tree_order(self.__get_records(spouses, IndividualElement, records_by_pointer))
+            count = 0
+            for element in records:
+                individual_ids.add(element.get_pointer())
+
+                for family_element in self.get_families(element, gedcom.tags.GEDCOM_TAG_FAMILY_CHILD):
+                    family_ids.add(family_element.get_pointer())
+
+                    if include_inlaws:
+                        for parent_element in self.get_parents(element):
+                            individual_ids.add(parent_element.get_pointer())
+
+                count += 1
+                self.__update_progress("Gathering spouses of descendants", count, len(records), callback)
+
+            # determine which sources, repositories, media and notes are still needed
+            records = self.__get_records(individual_ids, IndividualElement, records_by_pointer) \
+                + self.__get_records(family_ids, FamilyElement, records_by_pointer) + other_records
+            referenced_pointers = self.find_referenced_pointers(records, REFERENCED_RECORD_TAGS)
+            self.__update_progress("Gathering sources, repositories, media and notes", 1, 1, callback)
+
+            all_kept_pointers.append({
+                IndividualElement: individual_ids,
+                FamilyElement: family_ids,
+                SourceElement: get_pointers(referenced_pointers, SourceElement),
+                RepositoryElement: get_pointers(referenced_pointers, RepositoryElement),
+                ObjectElement: get_pointers(referenced_pointers, ObjectElement),
+                NoteElement: get_pointers(referenced_pointers, NoteElement),
+            })
+
+        return all_kept_pointers
+
+    def __index_root_child_elements(self):
+        """Returns a tuple: (`dict` position of each root child element, `dict` list of root child elements
+        by pointer)
+
+        :rtype: tuple
+        """
+        positions = {}
+        records_by_pointer = {}
+        for position, element in enumerate(self.get_root_child_elements()):
+            positions[element] = position
+            records_by_pointer.setdefault(element.get_pointer(), []).append(element)
 
-            count += 1
-            self.__update_progress("Gathering descendants", count, root_elements, callback)
+        return positions, records_by_pointer
 
-        # get spouses, their family elements and optionally their parents
-        count = 0
-        for element in self.get_root_child_elements():
-            if isinstance(element, IndividualElement):
-                if element.get_pointer() in spouses:
-                    if element.get_pointer() not in individual_ids:
-                        individual_ids.append(element.get_pointer())
+    def __get_records(self, pointers, element_type, records_by_pointer):
+        """Returns the root child elements of `element_type` with one of the pointers
 
-                    for family_element in self.get_families(element, gedcom.tags.GEDCOM_TAG_FAMILY_CHILD):
-                        family_ids.append(family_element.get_pointer())
+        :type pointers: set of str
 
-                        if include_inlaws:
-                            for parent_element in self.get_parents(element):
-                                if parent_element.get_pointer() not in individual_ids:
-                                    individual_ids.append(parent_element.get_pointer())
+        :type element_type: type
 
-            count += 1
-            self.__update_progress("Gathering spouses of descendants", count, root_elements, callback)
+        :type records_by_pointer: dict of list of Element
 
-        # remove people not in tree
-        people_to_remove = people_in_tree - len(individual_ids)
-        count = 0
-        x = 0
-        while x < len(self.get_root_child_elements()):
-            element = self.get_root_child_elements()[x]
-            if isinstance(element, IndividualElement):
-                if element.get_pointer() not in individual_ids:
-                    self.__remove_root_child_element(element)
-                    count += 1
-                    self.__update_progress("Removing non-family members", count, people_to_remove, callback)
-                else:
-                    x += 1
-            elif isinstance(element, FamilyElement):
-                if element.get_pointer() not in family_ids:
-                    self.__remove_root_child_element(element)
-                else:
-                    x += 1
+        :rtype: list of Element
+        """
+        return [element for pointer in pointers for element in records_by_pointer.get(pointer, ())
+                if isinstance(element, element_type)]
+
+    def __get_kept_records(self, kept_pointers):
+        """Returns the root child elements that are kept, in tree order. Records of an element class in
+        `kept_pointers` are kept if their pointer is listed, all others are kept.
+
+        :type kept_pointers: dict of set of str
+
+        :rtype: list of Element
+        """
+        records = []
+        for element in self.get_root_child_elements():
+            for element_type, pointers in kept_pointers.items():
+                if isinstance(element, element_type):
+                    if element.get_pointer() in pointers:
+                        records.append(element)
+                    break
             else:
-                x += 1
+                records.append(element)
+
+        return records
+
+    def __write_records(self, records, output, callback):
+        """Writes records to `output`, a file name or a text stream
+
+        :type records: list of Element
+
+        :type output: str or a text stream
+
+        :type callback: function(message as str, count as int, total as int)
+        """
+        if hasattr(output, 'write'):
+            f_out = output
+        else:
+            f_out = open(output, 'w', encoding='utf-8', newline='')
 
-        # determine which sources are still needed
-        root_elements = len(self.get_root_child_elements())
         count = 0
-        sources_in_tree = 0
+        for element in records:
+            f_out.write(element.to_gedcom_string(True))
+            count += 1
+            self.__update_progress("Writing file", count, len(records), callback)
+
+        if f_out is not output:
+            f_out.close()
+
+    def __get_children_by_parent(self):
+        """Returns a dictionary of the individuals of the tree listed by each of their parents, as found by
+        `gedcom.parser.Parser.get_parents()`. Built in one pass over the records.
+
+        :rtype: dict of list of IndividualElement
+        """
+        children_by_parent = {}
         for element in self.get_root_child_elements():
             if isinstance(element, IndividualElement):
-                for child in element.get_child_elements():
-                    for childOfChild in child.get_child_elements():
-                        if childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_SOURCE:
-                            if childOfChild.get_value() not in source_ids:
-                                source_ids.append(childOfChild.get_value())
-
-            elif isinstance(element, FamilyElement):
-                for child in element.get_child_elements():
-                    for childOfChild in child.get_child_elements():
-                        if childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_SOURCE:
-                            if childOfChild.get_value() not in source_ids:
-                                source_ids.append(childOfChild.get_value())
-
-            elif isinstance(element, SourceElement):
-                sources_in_tree += 1
+                for parent in self.get_parents(element):
+                    children_by_parent.setdefault(parent, []).append(element)
 
-            count += 1
-            self.__update_progress("Gathering sources", count, root_elements, callback)
+        return children_by_parent
 
-        # remove sources that are not needed
-        sources_to_remove = sources_in_tree - len(source_ids)
-        count = 0
-        x = 0
-        while x < len(self.get_root_child_elements()):
-            element = self.get_root_child_elements()[x]
-            if isinstance(element, SourceElement):
-                if element.get_pointer() not in source_ids:
-                    self.__remove_root_child_element(element)
-                    count += 1
-                    self.__update_progress("Removing unused sources", count, sources_to_remove, callback)
-                else:
-                    x = x + 1
-            else:
-                x = x + 1
+    def __find_all_descendants(self, ancestors, children_by_parent):
+        """Returns, for each ancestor, the individuals of the tree that `gedcom.parser.Parser.find_path_to_ancestor()`
+        finds a path from to the ancestor, the ancestor included. The descendants of all ancestors are found in
+        one traversal down from the ancestors, marking each individual with a bit for each of its ancestors.
 
-        # determine which repositories are still needed
-        root_elements = len(self.get_root_child_elements())
-        count = 0
-        repositories_in_tree = 0
-        for element in self.get_root_child_elements():
-            if isinstance(element, SourceElement):
-                repository = element.get_repository()
-                if repository != "" and element.get_repository() not in repository_ids:
-                    repository_ids.append(element.get_repository())
-            elif isinstance(element, RepositoryElement):
-                repositories_in_tree += 1
+        :type ancestors: list of IndividualElement
 
-            count += 1
-            self.__update_progress("Gathering repositories", count, root_elements, callback)
+        :type children_by_parent: dict of list of IndividualElement
 
-        # remove repositories that are not needed
-        repositories_to_remove = repositories_in_tree - len(repository_ids)
-        count = 0
-        x = 0
-        while x < len(self.get_root_child_elements()):
-            element = self.get_root_child_elements()[x]
-            if isinstance(element, RepositoryElement):
-                if element.get_pointer() not in repository_ids:
-                    self.__remove_root_child_element(element)
-                    count += 1
-                    self.__update_progress("Removing unused repositories", count, repositories_to_remove, callback)
-                else:
-                    x = x + 1
-            else:
-                x = x + 1
+        :rtype: list of set of IndividualElement
+        """
+        bits_by_pointer = {}
+        for bit, ancestor in enumerate(ancestors):
+            bits_by_pointer[ancestor.get_pointer()] = bits_by_pointer.get(ancestor.get_pointer(), 0) | 1 << bit
 
-        # determine which media objects are still needed
-        root_elements = len(self.get_root_child_elements())
-        objects_in_tree = 0
-        count = 0
+        ancestor_bits = {}
         for element in self.get_root_child_elements():
-            if isinstance(element, IndividualElement):
-                for child in element.get_child_elements():
-                    if child.get_tag() == 'OBJE':
-                        if child.get_value() not in object_ids:
-                            object_ids.append(childOfChild.get_value())
+            if isinstance(element, IndividualElement) and element.get_pointer() in bits_by_pointer:
+                ancestor_bits[element] = bits_by_pointer[element.get_pointer()]
+
+        unvisited = list(ancestor_bits)
+        while unvisited:
+            element = unvisited.pop()
+            bits = ancestor_bits[element]
+            for child in children_by_parent.get(element, ()):
+                child_bits = ancestor_bits.get(child, 0)
+                if child_bits | bits != child_bits:
+                    ancestor_bits[child] = child_bits | bits
+                    unvisited.append(child)
+
+        all_descendants = [set() for ancestor in ancestors]
+        for element, bits in ancestor_bits.items():
+            while bits:
+                bit = bits & -bits
+                all_descendants[bit.bit_length() - 1].add(element)
+                bits ^= bit
+
+        return all_descendants
 
-                    else:
-                        for childOfChild in child.get_child_elements():
-                            if childOfChild.get_tag() == gedcom.tags.GEDCOM_TAG_SOURCE:
-                                for obj in childOfChild.get_objects():
-                                    if obj.get_value() not in object_ids:
-                                        object_ids.append(obj.get_value())
+    def __update_progress(self, message, count, total, callback):
+        """if there is a callback function, calls the functions. Callbacks are wrapped in a
+        `gedcom.progress.ProgressReporter` by the calling method, which rate-limits the updates."""
+        if callback is not None:
+            callback(message, count, total)
 
-            elif isinstance(element, ObjectElement):
-                objects_in_tree += 1
+    def __remove_root_child_elements(self, element_type, kept_pointers, message, callback, other_type=None):
+        """Removes the root child elements of `element_type` whose pointer is not kept in one pass over the
+        root element, reporting progress for each removed element. Elements of the optional `other_type` that are
+        not kept are removed in the same pass, without progress.
 
-            count += 1
-            self.__update_progress("Gathering media", count, root_elements, callback)
+        :type element_type: type
 
-        # remove objects that are not needed
-        objects_to_remove = objects_in_tree - len(object_ids)
-        count = 0
-        x = 0
-        while x < len(self.get_root_child_elements()):
-            element = self.get_root_child_elements()[x]
-            if isinstance(element, ObjectElement):
-                if element.get_pointer() not in object_ids:
-                    self.__remove_root_child_element(element)
-                    count += 1
-                    self.__update_progress("Removing unused media", count, objects_to_remove, callback)
-                else:
-                    x = x + 1
-            else:
-                x = x + 1
+        :type kept_pointers: dict of set of str
 
-    def write_file(self, file_name, callback=None):
-        """Writes tree in output file
+        :type message: str
+
+        :type callback: function(message as str, count as int, total as int)
+
+        :type other_type: type
+        """
+        pointers = kept_pointers[element_type]
+        total = sum(1 for element in self.get_root_child_elements() if isinstance(element, element_type)) \
+            - len(pointers)
+        removed = [0]
+
+        def is_removed(element):
+            if isinstance(element, element_type):
+                if element.get_pointer() not in pointers:
+                    removed[0] += 1
+                    self.__update_progress(message, removed[0], total, callback)
+                    return True
+            elif other_type is not None and isinstance(element, other_type):
+                return element.get_pointer() not in kept_pointers[other_type]
+            return False
+
+        self.get_root_element().remove_child_elements(is_removed)
+
+
+class UnsupportedEncodingError(Exception):
+    pass
 
-        :type file_name: str
+
+class StreamingSplitter(object):
+    """Splits GEDCOM files too large to be parsed into a tree, keeping the same individuals and families as
+    `gedcom.utilities.splitter.splitter.Splitter.split_gedcom()`. The file is memory-mapped and read in two passes:
+
+    The first pass, when the splitter is created, records where each level 0 record starts, and the
+    `FAMC`, `FAMS`, `HUSB` and `WIFE` links between individuals and families, as integer arrays.
+    The second pass, `write_split`, copies the bytes of the kept records to the output unchanged.
+
+    Only the individuals and families not in the split are left out, all other records are copied. Memory use
+    grows with the number of records and links, not with the size of the file. The encoding of the file must be
+    ASCII compatible, see `gedcom.encoding.is_ascii_compatible`, otherwise `UnsupportedEncodingError` is raised.
+
+    `close` releases the memory-mapped file, the splitter can be used as a context manager to close it.
+    """
+
+    def __init__(self, file_path, strict=True, callback=None):
+        """
+        :type file_path: str
+
+        :type strict: bool
 
         :type callback: function(message as str, count as int, total as int)
         """
-        root_elements = len(self.get_root_child_elements())
-        count = 0
+        self.__strict = strict
+        self.__buffer = b''
+
+        with open(file_path, 'rb') as gedcom_file:
+            # an empty file cannot be mapped
+            if os.fstat(gedcom_file.fileno()).st_size > 0:
+                self.__buffer = memory_map.mmap(gedcom_file.fileno(), 0, access=memory_map.ACCESS_READ)
+
+        self.__encoding = detect_encoding(self.__buffer[:HEADER_SIZE])
+        if not is_ascii_compatible(self.__encoding):
+            self.close()
+            raise UnsupportedEncodingError("Files encoded in %s cannot be split without decoding" % self.__encoding)
+
+        # start offset, pointer id or -1, and kind of each record, in file order
+        self.__record_starts = array('q')
+        self.__record_ids = array('i')
+        self.__record_kinds = bytearray()
+
+        # id of each pointer, and kind of the record with the pointer
+        self.__ids = {}
+        self.__kinds = bytearray()
+
+        # links as pairs of arrays: individual and family of each FAMC and FAMS line, family and individual of
+        # each HUSB and WIFE line
+        self.__child_links = (array('i'), array('i'))
+        self.__spouse_links = (array('i'), array('i'))
+        self.__parent_links = (array('i'), array('i'))
+
+        # builds the records looked at by `find_person`, one at a time
+        self.__parser = Parser()
+
+        try:
+            self.__scan(wrap_callback(callback))
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Releases the memory-mapped file"""
+        if isinstance(self.__buffer, memory_map.mmap):
+            self.__buffer.close()
+        self.__buffer = b''
+
+    def find_person(self, criteria):
+        """Returns the first person matching all of the criteria, see `gedcom.parser.Parser.find_person()`.
+        Individual records are built one at a time until one matches.
+
+        :type criteria: str
+
+        :rtype: IndividualElement
+        """
+        for index in range(len(self.__record_kinds)):
+            if self.__record_kinds[index] == INDIVIDUAL_RECORD:
+                element = self.__build_record(index)
+                if isinstance(element, IndividualElement) and element.criteria_match(criteria):
+                    return element
 
-        f_out = open(file_name, 'w', encoding='utf-8', newline='')
+        return ""
 
-        for element in self.get_root_child_elements():
-            f_out.write(element.to_gedcom_string(True))
-            count += 1
-            self.__update_progress("Writing file", count, root_elements, callback)
-        f_out.close()
+    def write_split(self, ancestor, output, include_inlaws=True, callback=None):
+        """Writes the records of the split of `ancestor` to `output`, a file name or a binary stream, as
+        `gedcom.utilities.splitter.splitter.Splitter.split_gedcom()` would keep them, except that records other
+        than individuals and families are all kept.
+
+        :type ancestor: IndividualElement
+
+        :type output: str or a binary stream
+
+        :type include_inlaws: bool
+
+        :type callback: function(message as str, count as int, total as int)
+
+        :rtype: str
+        """
+        callback = wrap_callback(callback)
+
+        ancestor_id = self.__ids.get(ancestor.get_pointer().encode('utf-8'))
+        if ancestor_id is None or self.__kinds[ancestor_id] != INDIVIDUAL_RECORD:
+            return 'Ancestor not in tree'
+
+        kept_ids = self.__find_kept_ids(ancestor_id, include_inlaws)
+
+        if hasattr(output, 'write'):
+            f_out = output
+        else:
+            f_out = open(output, 'wb')
+
+        # consecutive kept records are copied at once
+        records = len(self.__record_starts)
+        copy_start = None
+        for index in range(records):
+            record_id = self.__record_ids[index]
+            is_kept = self.__record_kinds[index] == OTHER_RECORD or kept_ids[record_id]
+
+            if is_kept and copy_start is None:
+                copy_start = self.__record_starts[index]
+            elif not is_kept and copy_start is not None:
+                f_out.write(self.__buffer[copy_start:self.__record_starts[index]])
+                copy_start = None
+
+            if callback is not None:
+                callback("Writing file", index + 1, records)
+
+        if copy_start is not None:
+            f_out.write(self.__buffer[copy_start:])
+
+        if f_out is not output:
+            f_out.close()
+
+    def __scan(self, callback):
+        """Records the start, pointer and kind of each level 0 record, and the links of individuals and families"""
+        size = len(self.__buffer)
+        if size == 0:
+            return
+
+        # anything before the first level 0 line belongs to the first record
+        first_match = FIRST_RECORD_PATTERN.match(self.__buffer)
+        if first_match is not None:
+            self.__add_record(0, first_match.group(1), first_match.group(2))
+        else:
+            self.__add_record(0, None, b'')
+
+        for match in RECORD_PATTERN.finditer(self.__buffer):
+            start = match.start() + 1
+            self.__add_links(self.__record_starts[-1], start)
+            self.__add_record(start, match.group(1), match.group(2))
+
+            if callback is not None:
+                callback("Indexing records", start, size)
+
+        self.__add_links(self.__record_starts[-1], size)
 
-    def __update_progress(self, message, count, total, callback):
-        """if there is a callback function, calls the functions"""
         if callback is not None:
-            callback(message, count, total)
+            callback("Indexing records", size, size)
 
-    def __remove_root_child_element(self, element):
-        """Removes child element from list of root elements
+    def __add_record(self, start, pointer, tag):
+        """Appends the start, pointer and kind of a record
 
-        :type element: Element
+        :type start: int
+
+        :type pointer: bytes
+
+        :type tag: bytes
         """
-        self.get_root_element().remove_child_element(element.get_pointer())
+        kind = OTHER_RECORD
+        if pointer is not None:
+            if tag == b'INDI':
+                kind = INDIVIDUAL_RECORD
+            elif tag == b'FAM':
+                kind = FAMILY_RECORD
+
+        self.__record_starts.append(start)
+        self.__record_kinds.append(kind)
+
+        if pointer is None:
+            self.__record_ids.append(-1)
+        else:
+            record_id = self.__get_id(pointer)
+            self.__kinds[record_id] = kind
+            self.__record_ids.append(record_id)
+
+    def __add_links(self, start, end):
+        """Records the links of the last record, if it is an individual or family, found between `start` and `end`
+
+        :type start: int
+
+        :type end: int
+        """
+        kind = self.__record_kinds[-1]
+        if kind == OTHER_RECORD:
+            return
+
+        record_id = self.__record_ids[-1]
+        for match in LINK_PATTERN.finditer(self.__buffer, start, end):
+            tag = match.group(1)
+            if kind == INDIVIDUAL_RECORD and tag == b'FAMC':
+                links = self.__child_links
+            elif kind == INDIVIDUAL_RECORD and tag == b'FAMS':
+                links = self.__spouse_links
+            elif kind == FAMILY_RECORD and tag in (b'HUSB', b'WIFE'):
+                links = self.__parent_links
+            else:
+                continue
+
+            links[0].append(record_id)
+            links[1].append(self.__get_id(match.group(2)))
+
+    def __get_id(self, pointer):
+        """Returns the id of a pointer, assigning the next one if it has none yet
+
+        :type pointer: bytes
+
+        :rtype: int
+        """
+        pointer_id = self.__ids.get(pointer)
+        if pointer_id is None:
+            pointer_id = self.__ids[pointer] = len(self.__kinds)
+            self.__kinds.append(OTHER_RECORD)
+
+        return pointer_id
+
+    def __get_adjacency(self, links, kind):
+        """Returns the links as a tuple: (`array` offsets, `array` targets), where the targets of id `i` are
+        `targets[offsets[i]:offsets[i + 1]]`, in file order. Only targets of `kind` are included.
+
+        :type links: tuple of array
+
+        :type kind: int
+
+        :rtype: tuple
+        """
+        sources, targets = links
+        ids = len(self.__kinds)
+
+        offsets = array('q', bytes(8 * (ids + 1)))
+        for source, target in zip(sources, targets):
+            if self.__kinds[target] == kind:
+                offsets[source + 1] += 1
+        for index in range(ids):
+            offsets[index + 1] += offsets[index]
+
+        positions = array('q', offsets)
+        sorted_targets = array('i', bytes(4 * offsets[ids]))
+        for source, target in zip(sources, targets):
+            if self.__kinds[target] == kind:
+                sorted_targets[positions[source]] = target
+                positions[source] += 1
+
+        return offsets, sorted_targets
+
+    def __find_kept_ids(self, ancestor_id, include_inlaws):
+        """Returns a flag for each id, set for the individuals and families in the split of `ancestor_id`,
+        following the rules of `gedcom.utilities.splitter.splitter.Splitter.split_gedcom()`
+
+        :type ancestor_id: int
+
+        :type include_inlaws: bool
+
+        :rtype: bytearray
+        """
+        child_offsets, child_families = self.__get_adjacency(self.__child_links, FAMILY_RECORD)
+        spouse_offsets, spouse_families = self.__get_adjacency(self.__spouse_links, FAMILY_RECORD)
+        parent_offsets, parents = self.__get_adjacency(self.__parent_links, INDIVIDUAL_RECORD)
+
+        def get_parents(individual):
+            for index in range(child_offsets[individual], child_offsets[individual + 1]):
+                family = child_families[index]
+                yield from parents[parent_offsets[family]:parent_offsets[family + 1]]
+
+        # children of each parent, as the reverse of `get_parents`
+        child_links = (array('i'), array('i'))
+        for individual in range(len(self.__kinds)):
+            if self.__kinds[individual] == INDIVIDUAL_RECORD:
+                for parent in get_parents(individual):
+                    child_links[0].append(parent)
+                    child_links[1].append(individual)
+        children_offsets, children = self.__get_adjacency(child_links, INDIVIDUAL_RECORD)
+        del child_links
+
+        # descendants
+        kept_ids = bytearray(len(self.__kinds))
+        kept_ids[ancestor_id] = 1
+        descendants = array('i', [ancestor_id])
+        unvisited = [ancestor_id]
+        while unvisited:
+            individual = unvisited.pop()
+            for child in children[children_offsets[individual]:children_offsets[individual + 1]]:
+                if not kept_ids[child]:
+                    kept_ids[child] = 1
+                    descendants.append(child)
+                    unvisited.append(child)
+
+        # families of descendants, and their spouses
+        spouses = bytearray(len(self.__kinds))
+        for individual in descendants:
+            for family in spouse_families[spouse_offsets[individual]:spouse_offsets[individual + 1]]:
+                kept_ids[family] = 1
+                for spouse in parents[parent_offsets[family]:parent_offsets[family + 1]]:
+                    if spouse != individual:
+                        spouses[spouse] = 1
+
+        # spouses, their families as a child and optionally their parents
+        for individual in range(len(spouses)):
+            if spouses[individual]:
+                kept_ids[individual] = 1
+                for family in child_families[child_offsets[individual]:child_offsets[individual + 1]]:
+                    kept_ids[family] = 1
+                    if include_inlaws:
+                        for parent in parents[parent_offsets[family]:parent_offsets[family + 1]]:
+                            kept_ids[parent] = 1
+
+        return kept_ids
+
+    def __build_record(self, index):
+        """Parses the record at position `index` in the file
+
+        :type index: int
+
+        :rtype: Element
+        """
+        start = self.__record_starts[index]
+        end = self.__record_starts[index + 1] if index + 1 < len(self.__record_starts) else len(self.__buffer)
+        data = BytesIO(self.__buffer[start:end])
+
+        try:
+            return next(self.__parser.iter_records(data, self.__strict, 1, self.__encoding))
+        except GedcomFormatViolationError:
+            # counting lines is only worth it for the error message
+            data.seek(0)
+            line_number = count_lines(self.__buffer, 0, start) + 1
+            return next(self.__parser.iter_records(data, self.__strict, line_number, self.__encoding))
+
 
 # functions for support running from command line
 
 
 def print_usage_message():
 
-    print('usage: python splitter.py -i <gedcom-input-file> [-h | -b <year-of-birth> | -d <year-of-death> | -g <given-name> | -l <last-name> | -o <gedcom-output-file> | -n] ')
+    print('usage: python splitter.py -i <gedcom-input-file> [-h | -b <year-of-birth> | -d <year-of-death> | -g <given-name> | -l <last-name> | -o <gedcom-output-file> | -n | -m] ')
     print('Options and arguments (and corresponding environment variables):')
     print('-b : root person\'s year of birth')
     print('-d : root person\'s year of death')
@@ -266,6 +793,7 @@ def print_usage_message():
     print('-h : print this help message and exit')
     print('-i : file name of the source GEDCOM file')
     print('-l : part of all of the root person\'s last name')
+    print('-m : split without loading the file, for files too large to load; all records other than individuals and families are kept')
     print('-n : exclude father-in-law and mother-in-law of descendants')
     print('-o : file name of output GEDCOM file; if not included, adds "_split" to the input file name')
     print('-s : does not enforce strict parsing of GEDCOM file')
@@ -283,19 +811,19 @@ def build_criteria(criteria, field, value):
 
 
 def progress_status(message, progress, progress_total):
+    """Writes a progress bar with rate and estimated time remaining to stdout, through a
+    `gedcom.progress.ConsoleProgressReporter` shared by all calls of this function
 
-    barLength = 30
+    :type message: str
 
-    if progress == 1:
-        print()
+    :type progress: int
 
-    percent = round(progress / progress_total, 3)
+    :type progress_total: int
+    """
+    _console_progress_reporter(message, progress, progress_total)
 
-    block = int(round(barLength * percent))
 
-    text = "\r{0}: [{1}] {2}/{3}                  ".format(message, "#" * block + "-" * (barLength - block), progress, progress_total)
-    sys.stdout.write(text)
-    sys.stdout.flush()
+_console_progress_reporter = ConsoleProgressReporter()
 
 
 def main(argv):
@@ -308,9 +836,13 @@ def main(argv):
     given_name = ""
     last_name = ""
     strict = True
+    streaming = False
+
+    # rate-limited progress bar with rate and estimated time remaining, its state is kept for this run only
+    progress_status = ConsoleProgressReporter()
 
     try:
-        opts, args = getopt.getopt(argv, "b:d:g:h:i:l:n:o:s")
+        opts, args = getopt.getopt(argv, "b:d:g:h:i:l:mn:o:s")
 
         for opt, arg in opts:
             if opt == '-h':
@@ -326,6 +858,8 @@ def main(argv):
                 given_name = arg
             elif opt in ("-l"):
                 last_name = arg
+            elif opt in ("-m"):
+                streaming = True
             elif opt in ("-n"):
                 include_inlaws = False
             elif opt in ("-o"):
@@ -362,17 +896,32 @@ def main(argv):
             print_usage_message()
             sys.exit()
 
-        parser = Splitter()
-        parser.parse_file(input_file, strict=strict, callback=progress_status)
-
-        ancestor = parser.find_person(criteria)
-
-        if ancestor == "":
-            print("No ancestor was found")
-        else:
-            parser.split_gedcom(ancestor, include_inlaws=include_inlaws, callback=progress_status)
-            parser.write_file(output_file, callback=progress_status)
-            print("\nSplit complete")
+        if streaming:
+            try:
+                parser = StreamingSplitter(input_file, strict=strict, callback=progress_status)
+            except UnsupportedEncodingError:
+                print("\nThe encoding of the input file requires it to be loaded, splitting without -m")
+                streaming = False
+
+        if not streaming:
+            parser = Splitter()
+            parser.parse_file(input_file, strict=strict, callback=progress_status)
+
+        try:
+            ancestor = parser.find_person(criteria)
+
+            if ancestor == "":
+                print("No ancestor was found")
+            elif streaming:
+                parser.write_split(ancestor, output_file, include_inlaws=include_inlaws, callback=progress_status)
+                print("\nSplit complete")
+            else:
+                parser.split_gedcom(ancestor, include_inlaws=include_inlaws, callback=progress_status)
+                parser.write_file(output_file, callback=progress_status)
+                print("\nSplit complete")
+        finally:
+            if streaming:
+                parser.close()
 
     except getopt.GetoptError:
         print_usage_message()
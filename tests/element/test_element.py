@@ -1,12 +1,48 @@
+import tracemalloc
+
 from gedcom.element.element import Element
+from gedcom.element.family import FamilyElement
+from gedcom.element.file import FileElement
+from gedcom.element.individual import IndividualElement
+from gedcom.element.note import NoteElement
+from gedcom.element.object import ObjectElement
+from gedcom.element.repository import RepositoryElement
+from gedcom.element.root import RootElement
+from gedcom.element.source import SourceElement
 from gedcom.parser import Parser
 
+# Maximum bytes allocated per element without children, which has no list of children. An element with
+# an instance dictionary needs about 200 bytes on CPython 3.11 and more on older versions.
+MAXIMUM_BYTES_PER_ELEMENT = 160
+
 
 def test_initialization():
     element = Element(level=-1, pointer="", tag="", value="")
     assert isinstance(element, Element)
 
 
+def test_slots():
+    for element_class in (Element, IndividualElement, FamilyElement, SourceElement, NoteElement, ObjectElement,
+                          RepositoryElement, FileElement, RootElement):
+        element = element_class(level=0, pointer="", tag="", value="")
+        assert not hasattr(element, '__dict__')
+
+
+def test_memory_per_element():
+    count = 10000
+
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        elements = [Element(1, "", "NAME", "", multi_line=False) for x in range(count)]
+        allocated = tracemalloc.get_traced_memory()[0] - start
+    finally:
+        tracemalloc.stop()
+
+    assert len(elements) == count
+    assert allocated / count <= MAXIMUM_BYTES_PER_ELEMENT
+
+
 def test_get_sources_by_value():
 
     parser = Parser()
@@ -31,3 +67,90 @@ def test_get_child_value_by_tag():
     text = file.get_child_value_by_tag("_TEXT")
 
     assert(text) == "New England Historic Genealogical Society; Boston, Massachusetts; State of Vermont. Vermont Vital Records, 1871–1908"
+
+
+def test_get_child_elements_by_tag():
+    individual = IndividualElement(0, "@I1@", "INDI", "", multi_line=False)
+    first_name = individual.new_child_element("NAME", value="John /Smith/")
+    individual.new_child_element("SEX", value="M")
+
+    assert individual.get_child_elements_by_tag("NAME") == [first_name]
+    assert individual.get_child_elements_by_tag("BIRT") == []
+
+    # the index is kept up to date by add_child_element and remove_child_element
+    second_name = individual.new_child_element("NAME", value="Johnny /Smith/")
+    family = individual.new_child_element("FAMS", "@F1@")
+    assert individual.get_child_elements_by_tag("NAME") == [first_name, second_name]
+    assert individual.get_all_names() == ["John /Smith/", "Johnny /Smith/"]
+
+    individual.remove_child_element("@F1@")
+    assert individual.get_child_elements_by_tag("FAMS") == []
+    individual.get_child_elements().remove(second_name)
+    assert individual.get_child_elements_by_tag("NAME") == [first_name]
+
+    # changing the list of child elements directly leaves neither the index nor derived values stale
+    individual.get_child_elements().insert(0, Element(1, "", "SEX", "F", multi_line=False))
+    assert individual.get_gender() == "M"
+    del individual.get_child_elements()[2]
+    assert individual.get_gender() == "F"
+    del individual.get_child_elements()[0]
+    assert individual.get_gender() == ""
+    individual.get_child_elements()[:] = []
+    assert individual.get_child_elements_by_tag("NAME") == []
+    assert family.get_child_elements_by_tag("NAME") == []
+
+
+def test_remove_child_elements():
+    root = RootElement()
+    records = [root.new_child_element("INDI", "@I%d@" % number) for number in range(6)]
+    root.new_child_element("TRLR")
+    children = root.get_child_elements()
+
+    root.remove_child_element("@I2@")
+    assert root.get_child_elements()[2] is records[3]
+
+    # indexing keeps the list of child elements, changes through an earlier reference are not lost
+    assert root.get_child_elements_by_tag("INDI")[0] is records[0]
+    assert root.get_child_elements() is children
+
+    # the pointer index follows pointer changes
+    records[3].set_pointer("@I9@")
+    root.remove_child_element("@I3@")
+    assert len(root.get_child_elements()) == 6
+    root.remove_child_element("@I9@")
+    assert records[3] not in root.get_child_elements()
+
+    assert root.remove_child_elements({"@I0@", "@I5@", "@X1@"}) == [records[0], records[5]]
+    assert root.get_child_elements() == [records[1], records[4], root.get_child_elements()[-1]]
+
+    removed = root.remove_child_elements(lambda element: element.get_tag() == "TRLR")
+    assert [element.get_tag() for element in removed] == ["TRLR"]
+    assert root.get_child_elements() == [records[1], records[4]]
+    assert root.get_child_elements_by_tag("INDI") == [records[1], records[4]]
+
+
+def test_derived_values_cache():
+    parser = Parser()
+    parser.parse_file('tests/files/Coolidge.ged')
+
+    individual = parser.find_person("surname=Coolidge:birth=1872")
+    assert individual.get_birth_year() == 1872
+    assert individual.get_name() == ('John Calvin', 'Coolidge')
+
+    # changes of descendants discard the cached values
+    birth_date = individual.get_child_elements_by_tag('BIRT')[0].get_child_elements_by_tag('DATE')[0]
+    birth_date.set_value('4 JUL 1873')
+    assert individual.get_birth_year() == 1873
+    assert individual.get_birth_date() == '4 JUL 1873'
+
+    name = individual.get_child_elements_by_tag('NAME')[0]
+    name.set_value('Cal /Coolidge/')
+    assert individual.get_name() == ('Cal', 'Coolidge')
+    name.new_child_element('GIVN', value='Calvin')
+    assert individual.get_name() == ('Calvin', 'Coolidge')
+
+    assert len(individual.get_name_data()[3]) == 1
+    individual.get_name_data()[3].append(None)
+    assert len(individual.get_name_data()[3]) == 1
+    name.remove_child_element('')
+    assert individual.get_name_data()[3] == []
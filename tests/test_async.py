@@ -0,0 +1,98 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from gedcom.parser import Parser
+from gedcom.tokenizer import GedcomFormatViolationError
+
+
+class AsyncWriter(object):
+
+    def __init__(self):
+        self.writes = []
+
+    async def write(self, data):
+        self.writes.append(data)
+
+
+class StreamWriter(object):
+
+    def __init__(self):
+        self.writes = []
+        self.drains = 0
+
+    def write(self, data):
+        self.writes.append(data)
+
+    async def drain(self):
+        self.drains += 1
+
+
+async def parse_async(data, executor=None, strict=True, fold=False):
+    stream = asyncio.StreamReader()
+    stream.feed_data(data)
+    stream.feed_eof()
+
+    parser = Parser()
+    await parser.parse_async(stream, strict, executor, chunk_size=1000, fold=fold)
+    return parser
+
+
+def read_file(file_path):
+    with open(file_path, 'rb') as gedcom_file:
+        return gedcom_file.read()
+
+
+def test_parse_async():
+    parser = Parser()
+    parser.parse_file('tests/files/Coolidge.ged')
+    expected = parser.get_root_element().to_gedcom_string(True)
+
+    data = read_file('tests/files/Coolidge.ged')
+
+    async_parser = asyncio.run(parse_async(data))
+    assert async_parser.get_root_element().to_gedcom_string(True) == expected
+
+    with ThreadPoolExecutor(1) as executor:
+        async_parser = asyncio.run(parse_async(data, executor))
+    assert async_parser.get_root_element().to_gedcom_string(True) == expected
+
+    with ProcessPoolExecutor(1) as executor:
+        async_parser = asyncio.run(parse_async(data, executor))
+    assert async_parser.get_root_element().to_gedcom_string(True) == expected
+    assert len(async_parser.get_element_list()) == 1885
+
+    async_parser = asyncio.run(parse_async(data, fold=True))
+    assert async_parser.get_root_element().to_gedcom_string(True) == expected
+    assert len(async_parser.get_element_list()) == 1829
+
+    with ThreadPoolExecutor(1) as executor:
+        async_parser = asyncio.run(parse_async(data, executor, fold=True))
+    assert len(async_parser.get_element_list()) == 1829
+
+
+def test_parse_async_violation():
+    data = b'0 @I1@ INDI\n' * 100 + b'2 DATE 1900\n'
+
+    with pytest.raises(GedcomFormatViolationError, match="Line 101 "):
+        asyncio.run(parse_async(data))
+
+    with ThreadPoolExecutor(1) as executor:
+        with pytest.raises(GedcomFormatViolationError, match="Line 101 "):
+            asyncio.run(parse_async(data, executor))
+
+
+def test_save_async():
+    parser = Parser()
+    parser.parse_file('tests/files/Musterstammbaum.ged')
+    expected = parser.get_root_element().to_gedcom_string(True)
+
+    writer = AsyncWriter()
+    asyncio.run(parser.save_async(writer))
+    assert "".join(writer.writes) == expected
+
+    writer = StreamWriter()
+    asyncio.run(parser.save_async(writer, 'utf-8'))
+    assert b"".join(writer.writes) == expected.encode('utf-8')
+    assert writer.drains == len(writer.writes)
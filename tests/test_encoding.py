@@ -0,0 +1,81 @@
+from io import BytesIO
+
+from gedcom.encoding import ANSEL, AnselIncrementalDecoder, decode_ansel, detect_encoding
+from gedcom.events import EventHandler, EventParser
+from gedcom.parser import Parser
+from gedcom.reader import read_lines
+
+ANSEL_DATA = (b'0 HEAD\r\n1 CHAR ANSEL\r\n0 @I1@ INDI\r\n1 NAME J\xe2ozef /M\xe8uller/\r\n'
+              b'1 NOTE \xa5gir \xb1\xe2od\xe2z\r\n0 TRLR\r\n')
+
+
+def test_decode_ansel():
+    assert decode_ansel(b'M\xe8uller') == 'Müller'
+    assert decode_ansel(b'\xa5\xb1\xb5\xc7\xc3') == 'Æłæß©'
+    assert decode_ansel(b'\xe8\r\n') == '̈\r\n'
+
+    # diacritics split from their letter across chunks
+    decoder = AnselIncrementalDecoder()
+    assert decoder.decode(b'Gar\xf0') == 'Gar'
+    assert decoder.decode(b'con') == 'çon'
+    assert decoder.decode(b'\xe2', True) == '́'
+
+
+def test_detect_encoding():
+    assert detect_encoding(b'\xef\xbb\xbf0 HEAD\n') == 'utf-8-sig'
+    assert detect_encoding('0 HEAD\n'.encode('utf-16')) == 'utf-16'
+    assert detect_encoding('0 HEAD\n'.encode('utf-16-be')) == 'utf-16-be'
+    assert detect_encoding(ANSEL_DATA) == ANSEL
+    assert detect_encoding(b'0 HEAD\n1 CHAR ANSI\n0 TRLR\n') == 'cp1252'
+    assert detect_encoding(b'0 HEAD\n1 CHAR UTF-16\n0 TRLR\n') == 'utf-8-sig'
+    assert detect_encoding(b'0 HEAD\n1 CHAR UTF-32LE\n0 TRLR\n') == 'utf-8-sig'
+    assert detect_encoding(b'0 HEAD\n1 CHAR UCS-2\n0 TRLR\n') == 'utf-8-sig'
+    assert detect_encoding(b'0 HEAD\n1 SOUR X\n0 @I1@ INDI\n1 CHAR ANSEL\n') == 'utf-8-sig'
+    assert detect_encoding(b'0 @I1@ INDI\n') == 'utf-8-sig'
+
+    # the end of the header is needed unless no more data follows
+    assert detect_encoding(b'0 HEAD\n1 SOUR X\n', final=False) is None
+    assert detect_encoding(b'0 HEAD\n1 SOUR X\n') == 'utf-8-sig'
+
+
+def test_parse_ansel(tmp_path):
+    parser = Parser()
+    parser.parse(BytesIO(ANSEL_DATA))
+
+    individual = parser.get_element_dictionary()['@I1@']
+    assert individual.get_name() == ('Józef', 'Müller')
+    assert individual.get_child_elements()[1].get_value() == 'Ægir łódź'
+
+    file_path = tmp_path / 'ansel.ged'
+    file_path.write_bytes(ANSEL_DATA * 10)
+
+    expected = parser.get_root_element().to_gedcom_string(True) * 10
+    for options in ({}, {'mmap': True}, {'workers': 2}, {'lazy': True}):
+        file_parser = Parser()
+        file_parser.parse_file(str(file_path), **options)
+        assert file_parser.get_root_element().to_gedcom_string(True) == expected
+
+    assert list(read_lines(BytesIO(ANSEL_DATA), chunk_size=30)) == list(read_lines(BytesIO(ANSEL_DATA)))
+
+
+def test_parse_utf_16(tmp_path):
+    parser = Parser()
+    parser.parse_file('tests/files/Musterstammbaum.ged')
+    expected = parser.get_root_element().to_gedcom_string(True)
+
+    file_path = tmp_path / 'utf-16.ged'
+    file_path.write_bytes(expected.encode('utf-16'))
+
+    for options in ({}, {'mmap': True}, {'workers': 2}, {'lazy': True}):
+        file_parser = Parser()
+        file_parser.parse_file(str(file_path), **options)
+        assert file_parser.get_root_element().to_gedcom_string(True) == expected
+
+    fed_parser = Parser()
+    data = expected.encode('utf-16-le')
+    for start in range(0, len(data), 7):
+        fed_parser.feed(data[start:start + 7])
+    fed_parser.close()
+    assert fed_parser.get_root_element().to_gedcom_string(True) == expected
+
+    EventParser(EventHandler()).parse_file(str(file_path))
@@ -0,0 +1,88 @@
+import pytest
+
+from gedcom.element.individual import IndividualElement
+from gedcom.events import EventHandler, EventParser
+from gedcom.parser import Parser
+from gedcom.tokenizer import GedcomFormatViolationError
+
+
+class RecordingHandler(EventHandler):
+
+    def __init__(self):
+        self.events = []
+
+    def start_record(self, level, pointer, tag, value):
+        self.events.append(('start_record', level, pointer, tag, value))
+
+    def end_record(self, level, pointer, tag, value):
+        self.events.append(('end_record', level, pointer, tag, value))
+
+    def start_element(self, level, pointer, tag, value):
+        self.events.append(('start_element', level, pointer, tag, value))
+
+    def end_element(self, level, pointer, tag, value):
+        self.events.append(('end_element', level, pointer, tag, value))
+
+
+class BirthDateHandler(EventHandler):
+
+    def __init__(self):
+        self.birth_dates = {}
+        self.__pointer = None
+        self.__in_birth = False
+
+    def start_record(self, level, pointer, tag, value):
+        self.__pointer = pointer if tag == 'INDI' else None
+
+    def start_element(self, level, pointer, tag, value):
+        if level == 1:
+            self.__in_birth = tag == 'BIRT' and self.__pointer not in self.birth_dates
+        elif level == 2 and self.__in_birth and tag == 'DATE':
+            self.birth_dates[self.__pointer] = value
+
+
+def test_events():
+    handler = RecordingHandler()
+    EventParser(handler).parse([b'0 @I1@ INDI\n', b'1 BIRT\n', b'2 DATE 1900\n', b'1 SEX M\n', b'0 TRLR\n'])
+
+    assert handler.events == [
+        ('start_record', 0, '@I1@', 'INDI', ''),
+        ('start_element', 1, '', 'BIRT', ''),
+        ('start_element', 2, '', 'DATE', '1900'),
+        ('end_element', 2, '', 'DATE', '1900'),
+        ('end_element', 1, '', 'BIRT', ''),
+        ('start_element', 1, '', 'SEX', 'M'),
+        ('end_element', 1, '', 'SEX', 'M'),
+        ('end_record', 0, '@I1@', 'INDI', ''),
+        ('start_record', 0, '', 'TRLR', ''),
+        ('end_record', 0, '', 'TRLR', ''),
+    ]
+
+
+def test_events_match_tree():
+    parser = Parser()
+    parser.parse_file('tests/files/Coolidge.ged')
+
+    handler = RecordingHandler()
+    EventParser(handler).parse_file('tests/files/Coolidge.ged')
+
+    starts = [event for event in handler.events if event[0].startswith('start')]
+    assert len(starts) == len(parser.get_element_list())
+    assert len(handler.events) == 2 * len(starts)
+
+
+def test_birth_dates():
+    parser = Parser()
+    parser.parse_file('tests/files/Coolidge.ged')
+
+    handler = BirthDateHandler()
+    EventParser(handler).parse_file('tests/files/Coolidge.ged')
+
+    for element in parser.get_root_child_elements():
+        if isinstance(element, IndividualElement) and element.get_birth_date() != "":
+            assert handler.birth_dates[element.get_pointer()] == element.get_birth_date()
+
+
+def test_level_violation():
+    with pytest.raises(GedcomFormatViolationError):
+        EventParser(EventHandler()).parse([b'0 @I1@ INDI\n', b'2 DATE 1900\n'])
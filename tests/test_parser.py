@@ -1,6 +1,11 @@
+import os
+
+import pytest
+
+from gedcom.element.element import Element
 from gedcom.element.individual import IndividualElement
 from gedcom.element.root import RootElement
-from gedcom.parser import Parser
+from gedcom.parser import GedcomFormatViolationError, Parser
 
 
 def test_initialization():
@@ -22,6 +27,88 @@ def test_invalidate_cache():
     assert len(parser.get_element_dictionary()) == 32
 
 
+def test_cache_follows_changes():
+
+    def assert_caches_are_current(parser):
+        element_list = parser.get_element_list()
+        element_dictionary = parser.get_element_dictionary()
+        parser.invalidate_cache()
+        assert element_list == parser.get_element_list()
+        assert element_dictionary == parser.get_element_dictionary()
+
+    parser = Parser()
+    parser.parse_file('tests/files/Musterstammbaum.ged')
+
+    element_list = parser.get_element_list()
+    element_dictionary = parser.get_element_dictionary()
+    root_element = parser.get_root_element()
+    individual = element_dictionary['@1@']
+
+    # a new record with descendants
+    record = Element(0, '@N1@', 'NOTE', 'note')
+    record.new_child_element('CONT', value='line')
+    root_element.add_child_element(record)
+    assert parser.get_element_list() is element_list
+    assert parser.get_element_dictionary() is element_dictionary
+    assert element_dictionary['@N1@'] is record
+    assert element_list[-2:] == [record, record.get_child_elements()[0]]
+    assert_caches_are_current(parser)
+
+    # nested elements
+    event = individual.new_child_element('EVEN')
+    event.new_child_element('DATE', value='1900')
+    individual.get_child_elements()[0].new_child_element('NOTE', value='first')
+    assert_caches_are_current(parser)
+
+    individual.remove_child_element('')
+    assert_caches_are_current(parser)
+
+    # pointers
+    parser.get_element_dictionary()['@N1@'].set_pointer('@N2@')
+    assert '@N1@' not in parser.get_element_dictionary()
+    assert parser.get_element_dictionary()['@N2@'] is record
+    assert_caches_are_current(parser)
+
+    record.set_pointer('@N2@')
+    individual.set_pointer('@N2@')
+    assert parser.get_element_dictionary()['@N2@'] is record
+    individual.set_pointer('@1@')
+    assert parser.get_element_dictionary()['@1@'] is individual
+    assert_caches_are_current(parser)
+
+    duplicate = root_element.new_child_element('NOTE', pointer='@N2@')
+    assert parser.get_element_dictionary()['@N2@'] is duplicate
+    root_element.remove_child_element('@N2@')
+    assert parser.get_element_dictionary()['@N2@'] is duplicate
+    assert_caches_are_current(parser)
+
+    root_element.remove_child_element('@N2@')
+    assert '@N2@' not in parser.get_element_dictionary()
+    assert len(parser.get_element_list()) == 396 + 1
+    assert_caches_are_current(parser)
+
+    # bulk removal
+    families = [element for element in root_element.get_child_elements() if element.get_tag() == 'FAM']
+    root_element.remove_child_elements({family.get_pointer() for family in families})
+    individual.remove_child_elements(lambda element: element.get_tag() in ('FAMS', 'FAMC'))
+    assert all(family.get_pointer() not in parser.get_element_dictionary() for family in families)
+    assert_caches_are_current(parser)
+
+    # direct changes of a list of child elements
+    record = root_element.get_child_elements().pop()
+    assert record not in parser.get_element_list()
+    root_element.get_child_elements().insert(0, record)
+    assert parser.get_element_list()[0] is record
+    assert_caches_are_current(parser)
+
+    # a dictionary without pointers stays cached
+    parser = Parser()
+    parser.parse([b'0 HEAD\n', b'0 TRLR\n'])
+    element_dictionary = parser.get_element_dictionary()
+    assert element_dictionary == {}
+    assert parser.get_element_dictionary() is element_dictionary
+
+
 def test_get_root_element():
     parser = Parser()
     assert isinstance(parser.get_root_element(), RootElement)
@@ -52,6 +139,88 @@ def test_parse_file():
     assert individuals_in_element_list == 20
 
 
+def test_parse_file_mmap():
+
+    parser = Parser()
+    parser.parse_file('tests/files/Musterstammbaum.ged')
+
+    progress = []
+    mapped_parser = Parser()
+    mapped_parser.parse_file('tests/files/Musterstammbaum.ged', mmap=True,
+                             callback=lambda message, count, total: progress.append((message, count, total)))
+
+    assert len(mapped_parser.get_element_list()) == 396
+    assert len(mapped_parser.get_element_dictionary()) == 32
+    assert mapped_parser.get_root_element().to_gedcom_string(True) == parser.get_root_element().to_gedcom_string(True)
+
+    file_size = os.path.getsize('tests/files/Musterstammbaum.ged')
+    assert progress[-2] == ("Loading and parsing file", file_size, file_size)
+    assert progress[-1] == ("File loaded", file_size, file_size)
+
+
+def test_parse_file_workers():
+
+    for file_name in ('tests/files/Musterstammbaum.ged', 'tests/files/Coolidge.ged'):
+        parser = Parser()
+        parser.parse_file(file_name)
+
+        parallel_parser = Parser()
+        parallel_parser.parse_file(file_name, workers=3)
+
+        assert parallel_parser.get_root_element().to_gedcom_string(True) == parser.get_root_element().to_gedcom_string(True)
+        assert len(parallel_parser.get_element_dictionary()) == len(parser.get_element_dictionary())
+
+        for element in parallel_parser.get_root_child_elements():
+            assert element.get_parent_element() is parallel_parser.get_root_element()
+
+
+def write_violation_file(tmp_path):
+    """Writes a file of 200 individuals with a level skipped on line 352 and returns its name"""
+    lines = []
+    for x in range(200):
+        lines += ['0 @I%d@ INDI\r\n' % x, '1 NAME Person /%d/\r\n' % x]
+    lines.insert(351, '3 DATE 1900\r\n')
+
+    file_name = str(tmp_path / 'violation.ged')
+    with open(file_name, 'w', newline='') as gedcom_file:
+        gedcom_file.write(''.join(lines))
+
+    return file_name
+
+
+def test_parse_file_workers_violation(tmp_path):
+    file_name = write_violation_file(tmp_path)
+
+    with pytest.raises(GedcomFormatViolationError) as serial_error:
+        Parser().parse_file(file_name)
+
+    with pytest.raises(GedcomFormatViolationError) as parallel_error:
+        Parser().parse_file(file_name, workers=4)
+
+    assert str(parallel_error.value) == str(serial_error.value)
+    assert "Line 352 " in str(parallel_error.value)
+
+
+def test_iter_records():
+
+    parser = Parser()
+    parser.parse_file('tests/files/Musterstammbaum.ged')
+
+    records = list(Parser().iter_records('tests/files/Musterstammbaum.ged'))
+
+    assert len(records) == 34
+    assert len([record for record in records if isinstance(record, IndividualElement)]) == 20
+    assert [record.to_gedcom_string(True) for record in records] == \
+        [element.to_gedcom_string(True) for element in parser.get_root_child_elements()]
+
+    with open('tests/files/Musterstammbaum.ged', 'rb') as gedcom_stream:
+        records = Parser().iter_records(gedcom_stream)
+        assert next(records).get_tag() == 'HEAD'
+        assert len(list(records)) == 33
+
+    assert len(parser.get_root_child_elements()) == 34
+
+
 def test_parse_from_string():
     case_1 = """0 @I5@ INDI
 1 NAME First /Last/
@@ -218,3 +387,162 @@ def test_get_family():
     assert persons[1].get_pointer() == '@I19@'
     assert persons[2].get_pointer() == '@I20@'
     assert persons[3].get_pointer() == '@I21@'
+
+
+def test_parse_file_lazy():
+    parser = Parser()
+    parser.parse_file('tests/files/Coolidge.ged')
+
+    lazy_parser = Parser()
+    lazy_parser.parse_file('tests/files/Coolidge.ged', lazy=True)
+
+    element_dictionary = lazy_parser.get_element_dictionary()
+    assert sorted(element_dictionary) == sorted(parser.get_element_dictionary())
+    assert not element_dictionary.is_loaded('@I20@')
+
+    individual = element_dictionary['@I20@']
+    assert element_dictionary.is_loaded('@I20@')
+    assert not element_dictionary.is_loaded('@I21@')
+    assert individual.to_gedcom_string(True) == parser.get_element_dictionary()['@I20@'].to_gedcom_string(True)
+    assert [parent.get_pointer() for parent in lazy_parser.get_parents(individual)] == ['@I16@', '@I19@']
+
+    # building the tree keeps the records already built
+    assert lazy_parser.get_root_element().to_gedcom_string(True) == parser.get_root_element().to_gedcom_string(True)
+    assert lazy_parser.get_element_dictionary()['@I20@'] is individual
+    assert individual.get_parent_element() is lazy_parser.get_root_element()
+
+
+def test_parse_file_lazy_violation(tmp_path):
+    file_name = write_violation_file(tmp_path)
+
+    with pytest.raises(GedcomFormatViolationError) as serial_error:
+        Parser().parse_file(file_name)
+
+    parser = Parser()
+    parser.parse_file(file_name, lazy=True)
+    assert parser.get_element_dictionary()['@I0@'].get_pointer() == '@I0@'
+
+    with pytest.raises(GedcomFormatViolationError) as lazy_error:
+        parser.get_root_child_elements()
+
+    assert str(lazy_error.value) == str(serial_error.value)
+
+
+def test_feed():
+    parser = Parser()
+    parser.parse_file('tests/files/Musterstammbaum.ged')
+
+    with open('tests/files/Musterstammbaum.ged', 'rb') as gedcom_file:
+        data = gedcom_file.read()
+
+    fed_parser = Parser()
+    for start in range(0, len(data), 7):
+        fed_parser.feed(data[start:start + 7])
+
+    fed_parser.close()
+    assert fed_parser.get_root_element().to_gedcom_string(True) == parser.get_root_element().to_gedcom_string(True)
+    assert len(fed_parser.get_element_list()) == len(parser.get_element_list())
+
+    # a new tree is started after close()
+    fed_parser.feed(b'0 @I1@ INDI\r')
+    fed_parser.feed(b'\n1 SEX M')
+
+    # the last line is only complete once no more data follows
+    assert len(fed_parser.get_element_list()) == 1
+
+    fed_parser.close(strict=False)
+    assert fed_parser.get_root_element().to_gedcom_string(True) == '0 @I1@ INDI\r\n1 SEX M\n'
+
+    # values derived between chunks follow the elements added to records completed by a later chunk
+    fed_parser.feed(b'0 @I1@ INDI\n1 BIRT\n')
+    individual = fed_parser.get_root_child_elements()[0]
+    assert individual.get_birth_year() == -1
+    fed_parser.feed(b'2 DATE 1900\n0 TRLR\n')
+    assert individual.get_birth_year() == 1900
+    assert individual.get_birth_data() == ('1900', '', [])
+    fed_parser.close()
+
+
+def test_parse_file_fold():
+    parser = Parser()
+    parser.parse_file('tests/files/Coolidge.ged')
+
+    for options in ({}, {'mmap': True}, {'workers': 2}):
+        folded_parser = Parser()
+        folded_parser.parse_file('tests/files/Coolidge.ged', fold=True, **options)
+
+        assert len(folded_parser.get_element_list()) == 1829
+        assert folded_parser.get_root_element().to_gedcom_string(True) == parser.get_root_element().to_gedcom_string(True)
+
+    multi_line_values = [element.get_multi_line_value() for element in parser.get_element_list()
+                         if element.get_tag() not in ('CONC', 'CONT')]
+    assert [element.get_multi_line_value() for element in folded_parser.get_element_list()] == multi_line_values
+
+
+def test_parse_fold():
+    lines = [b'0 @N1@ NOTE First\r\n', b'1 CONC  line\r\n', b'1 CONT\r\n', b'1 CONT Third\r\n',
+             b'1 SOUR @S1@\r\n', b'1 CONC  after the source\r\n', b'0 TRLR\r\n']
+
+    parser = Parser()
+    parser.parse(lines)
+
+    folded_parser = Parser()
+    folded_parser.parse(lines, fold=True)
+
+    note = parser.get_root_child_elements()[0]
+    folded_note = folded_parser.get_root_child_elements()[0]
+    assert folded_note.is_folded()
+    assert [child.get_tag() for child in folded_note.get_child_elements()] == ['SOUR', 'CONC']
+    assert folded_note.get_value() == 'First'
+    assert folded_note.get_multi_line_value() == note.get_multi_line_value() == \
+        'First line\r\n\r\nThird after the source'
+    assert folded_note.get_notes() == note.get_notes() == [' line', '', 'Third after the source']
+    assert folded_parser.get_root_element().to_gedcom_string(True) == b''.join(lines).decode()
+
+    # the other ways of parsing fold as well
+    fed_parser = Parser()
+    for line in lines:
+        fed_parser.feed(line, fold=True)
+    fed_parser.close(fold=True)
+    assert [element.get_tag() for element in fed_parser.get_element_list()] == \
+        [element.get_tag() for element in folded_parser.get_element_list()]
+
+    records = list(Parser().iter_records(lines, fold=True))
+    assert records[0].is_folded()
+    assert records[0].to_gedcom_string(True) == folded_note.to_gedcom_string(True)
+
+    folded_note.set_value('1st')
+    assert folded_note.get_multi_line_value() == '1st line\r\n\r\nThird after the source'
+    assert folded_note.to_gedcom_string(True).startswith('0 @N1@ NOTE 1st\r\n1 CONC  line\r\n1 CONT\r\n')
+
+    folded_note.set_multi_line_value('Short')
+    assert not folded_note.is_folded()
+    assert folded_note.to_gedcom_string(True) == '0 @N1@ NOTE Short\r\n1 SOUR @S1@\r\n'
+
+
+def test_prune_unreferenced():
+
+    parser = Parser()
+    parser.parse([
+        b'0 HEAD\n', b'1 SUBM @U1@\n',
+        b'0 @I1@ INDI\n', b'1 BIRT\n', b'2 SOUR @S1@\n', b'3 OBJE @O1@\n', b'1 NOTE @N1@\n', b'1 _LINK @X1@\n',
+        b'0 @I2@ INDI\n', b'1 NOTE @N2@\n',
+        b'0 @S1@ SOUR\n', b'1 REPO @R1@\n',
+        b'0 @S2@ SOUR\n', b'1 REPO @R2@\n',
+        b'0 @R1@ REPO\n', b'0 @R2@ REPO\n', b'0 @O1@ OBJE\n', b'0 @N1@ NOTE\n', b'0 @N2@ NOTE\n',
+        b'0 @U1@ SUBM\n', b'0 @X1@ _CUSTOM\n', b'0 TRLR\n',
+    ])
+    element_dictionary = parser.get_element_dictionary()
+    parser.get_element_list()
+
+    # only sources are removed
+    removed = parser.prune_unreferenced([element_dictionary['@I1@']], record_tags={'SOUR'})
+    assert [record.get_pointer() for record in removed] == ['@S2@']
+
+    removed = parser.prune_unreferenced([element_dictionary['@I1@']])
+    assert [record.get_pointer() for record in removed] == ['@I2@', '@R2@', '@N2@']
+    assert sorted(parser.get_element_dictionary()) == ['@I1@', '@N1@', '@O1@', '@R1@', '@S1@', '@U1@', '@X1@']
+
+    element_list = parser.get_element_list()
+    parser.invalidate_cache()
+    assert parser.get_element_list() == element_list
@@ -0,0 +1,65 @@
+from io import StringIO
+
+from gedcom.parser import Parser
+from gedcom.progress import ConsoleProgressReporter, ProgressReporter, wrap_callback
+
+
+def test_interval_throttling():
+    updates = []
+    reporter = ProgressReporter(lambda message, count, total: updates.append((message, count, total)), interval=3600)
+
+    for count in range(1, 1001):
+        reporter("Loading", count, 1000)
+    for count in range(1, 11):
+        reporter("Writing", count, 10)
+
+    assert updates == [("Loading", 1, 1000), ("Loading", 1000, 1000), ("Writing", 1, 10), ("Writing", 10, 10)]
+
+
+def test_step_throttling():
+    updates = []
+    reporter = ProgressReporter(lambda message, count, total: updates.append(count), step=10)
+
+    for count in range(1, 1001):
+        reporter("Loading", count, 1000)
+
+    assert updates == [1, 101, 201, 301, 401, 501, 601, 701, 801, 901, 1000]
+
+
+def test_rate_and_eta():
+    reporter = ProgressReporter(step=50)
+    assert reporter.get_eta() is None
+
+    reporter("Loading", 1, 100)
+    reporter("Loading", 100, 100)
+
+    assert reporter.get_rate() > 0
+    assert reporter.get_eta() == 0
+
+
+def test_wrap_callback():
+    reporter = ProgressReporter()
+
+    assert wrap_callback(None) is None
+    assert wrap_callback(reporter) is reporter
+    assert isinstance(wrap_callback(print), ProgressReporter)
+
+
+def test_console_progress_reporter():
+    stream = StringIO()
+    reporter = ConsoleProgressReporter(interval=3600, stream=stream)
+
+    for count in range(1, 101):
+        reporter("Loading", count, 100)
+
+    assert stream.getvalue().count("\r") == 2
+    assert "Loading: [" + "#" * 30 + "] 100/100" in stream.getvalue()
+
+
+def test_parse_file_progress():
+    updates = []
+    parser = Parser()
+    parser.parse_file('tests/files/Coolidge.ged', callback=lambda message, count, total: updates.append(count))
+
+    assert len(updates) < 1885
+    assert updates[-1] == 1885
@@ -0,0 +1,66 @@
+from io import BytesIO
+
+from gedcom.parser import Parser
+from gedcom.reader import IncrementalLineDecoder, count_lines, find_record_boundaries, read_lines, split_lines
+
+
+def test_split_lines():
+    assert split_lines('0 HEAD\r\n1 CHAR UTF-8\n0 TRLR\r') == (['0 HEAD\r\n', '1 CHAR UTF-8\n', '0 TRLR\r'], '')
+    assert split_lines('0 HEAD\n0 TRLR') == (['0 HEAD\n', '0 TRLR'], '')
+    assert split_lines('0 HEAD\n0 TR', final=False) == (['0 HEAD\n'], '0 TR')
+    assert split_lines('0 HEAD\r\n0 TRLR\r', final=False) == (['0 HEAD\r\n'], '0 TRLR\r')
+
+
+def test_read_lines_across_chunks():
+    data = '\ufeff0 HEAD\r\n1 NOTE Müller\r0 @I1@ INDI\n0 TRLR\r\n'.encode('utf-8')
+    expected = ['0 HEAD\r\n', '1 NOTE Müller\r', '0 @I1@ INDI\n', '0 TRLR\r\n']
+
+    for chunk_size in range(1, len(data) + 1):
+        assert list(read_lines(BytesIO(data), chunk_size=chunk_size)) == expected
+
+
+def test_incremental_line_decoder():
+    decoder = IncrementalLineDecoder()
+    name = '1 NAME J\u00f6rg\r\n'.encode('utf-8')
+
+    assert decoder.decode(b'\xef\xbb\xbf0 HEAD\r') == []
+    assert decoder.decode(b'\n' + name[:9]) == ['0 HEAD\r\n']
+    assert decoder.decode(name[9:] + b'0 TRLR') == ['1 NAME J\u00f6rg\r\n']
+    assert decoder.decode(b'', True) == ['0 TRLR']
+
+
+def test_read_lines_byte_order_mark():
+    data = '\ufeff0 HEAD\n\ufeff0 TRLR\n'.encode('utf-8')
+    assert list(read_lines(BytesIO(data), chunk_size=4)) == ['0 HEAD\n', '\ufeff0 TRLR\n']
+
+
+def test_parse_stream_line_endings():
+    parser = Parser()
+    parser.parse(BytesIO(b'0 HEAD\r\n1 CHAR UTF-8\r0 @I1@ INDI\n1 NAME John /Doe/\r\n0 TRLR\n'))
+
+    elements = parser.get_element_list()
+    assert [element.get_tag() for element in elements] == ['HEAD', 'CHAR', 'INDI', 'NAME', 'TRLR']
+    assert parser.get_root_element().to_gedcom_string(True) == \
+        '0 HEAD\r\n1 CHAR UTF-8\r0 @I1@ INDI\n1 NAME John /Doe/\r\n0 TRLR\n'
+
+
+def test_count_lines():
+    data = b'0 HEAD\r\n1 CHAR UTF-8\r0 @I1@ INDI\n0 TRLR'
+
+    for chunk_size in range(1, len(data) + 1):
+        assert count_lines(data, chunk_size=chunk_size) == 3
+    assert count_lines(data, 8) == 2
+
+
+def test_find_record_boundaries():
+    data = b'0 HEAD\r\n1 CHAR UTF-8\r\n0 @I1@ INDI\r\n1 NAME John /Doe/\r\n0 @I2@ INDI\r0 TRLR\r'
+
+    assert find_record_boundaries(data, 1) == [0, len(data)]
+    assert find_record_boundaries(data, 2) == [0, data.index(b'0 @I2@'), len(data)]
+    assert find_record_boundaries(data, 100)[-1] == len(data)
+    assert find_record_boundaries(b'', 4) == [0]
+
+    # the search windows grow until a level 0 line is found, also across their ends
+    for window in (1, 2, 3, 5):
+        assert find_record_boundaries(data, 2, window) == [0, data.index(b'0 @I2@'), len(data)]
+        assert find_record_boundaries(data, 3, window) == find_record_boundaries(data, 3)
@@ -0,0 +1,81 @@
+import pytest
+
+from gedcom.element.individual import IndividualElement
+from gedcom.parser import Parser
+from gedcom.snapshot import HEADER, SnapshotFormatError
+
+
+def test_snapshot(tmp_path):
+    parser = Parser()
+    parser.parse_file('tests/files/Coolidge.ged')
+
+    snapshot_path = str(tmp_path / 'Coolidge.snapshot')
+    parser.save_snapshot(snapshot_path)
+
+    snapshot_parser = Parser()
+    snapshot_parser.load_snapshot(snapshot_path)
+
+    assert snapshot_parser.get_root_element().to_gedcom_string(True) == parser.get_root_element().to_gedcom_string(True)
+    assert [type(element) for element in snapshot_parser.get_element_list()] == \
+           [type(element) for element in parser.get_element_list()]
+    assert snapshot_parser.get_root_child_elements()[2].get_parent_element() is snapshot_parser.get_root_element()
+
+    criteria = "surname=Coolidge:birth=1872"
+    assert [parent.get_pointer() for parent in snapshot_parser.get_parents(snapshot_parser.find_person(criteria))] == \
+           ['@I17@', '@I18@']
+
+
+def test_snapshot_line_endings(tmp_path):
+    parser = Parser()
+    parser.parse([b'0 @I1@ INDI\r\n', b'1 NAME J\xc3\xb6rg /M\xc3\xbcller/\r', b'1 SEX M\n', b'0 TRLR'], strict=False)
+
+    snapshot_path = str(tmp_path / 'line_endings.snapshot')
+    parser.save_snapshot(snapshot_path)
+
+    snapshot_parser = Parser()
+    snapshot_parser.load_snapshot(snapshot_path)
+    snapshot_individual = snapshot_parser.get_element_dictionary()['@I1@']
+
+    assert isinstance(snapshot_individual, IndividualElement)
+    assert snapshot_individual.get_name() == ('Jörg', 'Müller')
+    assert [child.get_crlf() for child in snapshot_individual.get_child_elements()] == ['\r', '\n']
+    assert snapshot_parser.get_root_element().to_gedcom_string(True) == parser.get_root_element().to_gedcom_string(True)
+
+
+def test_snapshot_format_error(tmp_path):
+    snapshot_path = tmp_path / 'invalid.snapshot'
+    snapshot_path.write_bytes(b'0 HEAD\n0 TRLR\n' * 10)
+
+    with pytest.raises(SnapshotFormatError):
+        Parser().load_snapshot(str(snapshot_path))
+
+    parser = Parser()
+    parser.parse_file('tests/files/Musterstammbaum.ged')
+    parser.save_snapshot(str(snapshot_path))
+    snapshot_path.write_bytes(snapshot_path.read_bytes()[:-10])
+
+    with pytest.raises(SnapshotFormatError):
+        Parser().load_snapshot(str(snapshot_path))
+
+    # string lengths not adding up to the length of the text
+    parser.save_snapshot(str(snapshot_path))
+    data = bytearray(snapshot_path.read_bytes())
+    data[HEADER.size] += 1
+    snapshot_path.write_bytes(bytes(data))
+
+    with pytest.raises(SnapshotFormatError):
+        Parser().load_snapshot(str(snapshot_path))
+
+
+def test_snapshot_fold(tmp_path):
+    parser = Parser()
+    parser.parse_file('tests/files/Coolidge.ged', fold=True)
+
+    snapshot_path = str(tmp_path / 'Coolidge.snapshot')
+    parser.save_snapshot(snapshot_path)
+
+    snapshot_parser = Parser()
+    snapshot_parser.load_snapshot(snapshot_path)
+
+    assert snapshot_parser.get_root_element().to_gedcom_string(True) == parser.get_root_element().to_gedcom_string(True)
+    assert len(snapshot_parser.get_element_list()) == 1885
@@ -0,0 +1,76 @@
+import pytest
+
+from gedcom.element.individual import IndividualElement
+from gedcom.parser import Parser
+from gedcom.store import ElementView, ReadOnlyElementError
+
+
+def pointers(elements):
+    return [element.get_pointer() for element in elements]
+
+
+def test_store():
+    parser = Parser()
+    parser.parse_file('tests/files/Coolidge.ged')
+
+    store_parser = Parser()
+    store_parser.parse_file('tests/files/Coolidge.ged', store=True)
+
+    assert store_parser.get_root_element().to_gedcom_string(True) == parser.get_root_element().to_gedcom_string(True)
+    assert len(store_parser.get_element_list()) == len(parser.get_element_list())
+    assert sorted(store_parser.get_element_dictionary()) == sorted(parser.get_element_dictionary())
+
+    for element, view in zip(parser.get_element_list(), store_parser.get_element_list()):
+        assert isinstance(view, ElementView)
+        assert isinstance(view, type(element))
+        assert view.get_crlf() == element.get_crlf()
+
+    individual = store_parser.get_element_dictionary()['@I20@']
+    assert individual in store_parser.get_root_child_elements()
+    assert individual.get_parent_element() == store_parser.get_root_element()
+    assert individual.get_child_elements()[0].get_parent_element() == individual
+
+
+def test_store_family_methods():
+    parser = Parser()
+    parser.parse_file('tests/files/Coolidge.ged')
+
+    store_parser = Parser()
+    store_parser.parse_file('tests/files/Coolidge.ged', store=True)
+
+    for element in parser.get_root_child_elements():
+        if not isinstance(element, IndividualElement):
+            continue
+
+        view = store_parser.get_element_dictionary()[element.get_pointer()]
+        assert view.get_name() == element.get_name()
+        assert view.get_birth_data()[:2] == element.get_birth_data()[:2]
+        assert pointers(store_parser.get_families(view)) == pointers(parser.get_families(element))
+        assert pointers(store_parser.get_parents(view)) == pointers(parser.get_parents(element))
+        assert pointers(store_parser.get_ancestors(view)) == pointers(parser.get_ancestors(element))
+        assert pointers(store_parser.get_children(view)) == pointers(parser.get_children(element))
+        assert store_parser.get_marriages(view) == parser.get_marriages(element)
+
+    criteria = "surname=Coolidge:birth=1872"
+    descendant = store_parser.find_person(criteria)
+    assert descendant.get_pointer() == parser.find_person(criteria).get_pointer()
+
+    ancestor = store_parser.get_element_dictionary()['@I16@']
+    path = store_parser.find_path_to_ancestor(descendant, ancestor)
+    assert pointers(path) == pointers(parser.find_path_to_ancestor(parser.find_person(criteria),
+                                                                   parser.get_element_dictionary()['@I16@']))
+
+
+def test_store_read_only():
+    parser = Parser()
+    parser.parse_file('tests/files/Musterstammbaum.ged', store=True)
+
+    record = parser.get_root_child_elements()[3]
+    with pytest.raises(ReadOnlyElementError):
+        record.new_child_element('NOTE', value='Note')
+    with pytest.raises(ReadOnlyElementError):
+        parser.get_root_element().remove_child_element(record.get_pointer())
+
+    child = record.get_child_elements()[0]
+    child.set_value('Jörg')
+    assert record.get_child_elements()[0].get_value() == 'Jörg'
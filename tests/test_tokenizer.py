@@ -0,0 +1,73 @@
+import time
+
+from gedcom.parser import Parser
+from gedcom.tokenizer import InternTable, tokenize, tokenize_line
+import gedcom.tags
+
+# Minimum lines per second the tokenizer must reach. Kept well below the
+# throughput of a developer machine so the test does not flake on slow CI.
+MINIMUM_LINES_PER_SECOND = 100000
+
+
+def test_tokenize_line():
+    assert tokenize_line('0 HEAD\r\n') == (0, '', 'HEAD', '', '\r\n')
+    assert tokenize_line('0 @I1@ INDI\n') == (0, '@I1@', 'INDI', '', '\n')
+    assert tokenize_line('1 NAME John /Doe/\n') == (1, '', 'NAME', 'John /Doe/', '\n')
+    assert tokenize_line('12 _MREL Natural\r') == (12, '', '_MREL', 'Natural', '\r')
+    assert tokenize_line('1 NOTE  leading space\n') == (1, '', 'NOTE', ' leading space', '\n')
+
+
+def test_tokenize_line_violations():
+    assert tokenize_line('') is None
+    assert tokenize_line('01 NAME John\n') is None
+    assert tokenize_line('1 NAME John') is None
+    assert tokenize_line('continued text\n') is None
+    assert tokenize_line('1 BI:RT\n') is None
+
+
+def test_interning():
+    first = tokenize(1, ''.join(['2 ', 'PLAC', ' Plymouth, Vermont', '\r\n']), 1, 'BIRT')
+    second = tokenize(1, ''.join(['2 ', 'PLAC', ' Plymouth, Vermont', '\r\n']), 1, 'DEAT')
+
+    assert first[2] is gedcom.tags.GEDCOM_TAG_PLACE
+    assert first[3] is second[3]
+    assert first[4] is second[4]
+
+    note = 'x' * 1000
+    assert tokenize(1, '1 NOTE ' + note + '\n', 0, 'INDI')[3] is not tokenize(1, '1 NOTE ' + note + '\n', 0, 'INDI')[3]
+
+    parser = Parser()
+    parser.parse_file('tests/files/Coolidge.ged')
+    places = [element.get_value() for element in parser.get_element_list()
+              if element.get_value() == 'Plymouth, Windsor, Vermont, USA']
+    assert len(places) == 17 and all(place is places[0] for place in places)
+
+
+def test_intern_table():
+    table = InternTable(3, ['INDI'])
+    indi = table.intern(''.join(['IN', 'DI']))
+
+    assert table.intern('a') == 'a'
+    assert table.intern('b') == 'b'
+    assert len(table) == 3
+
+    # a full table starts over with the initial strings
+    assert table.intern('c') == 'c'
+    assert len(table) == 2
+    assert table.intern(''.join(['IN', 'DI'])) is indi
+
+
+def test_tokenize_line_throughput():
+    lines = []
+    with open('tests/files/Coolidge.ged', 'rb') as gedcom_file:
+        for line in gedcom_file:
+            lines.append(line.decode('utf-8-sig'))
+
+    repeat = 20
+    start = time.perf_counter()
+    for x in range(repeat):
+        for line in lines:
+            tokenize_line(line)
+    elapsed = time.perf_counter() - start
+
+    assert len(lines) * repeat / elapsed >= MINIMUM_LINES_PER_SECOND
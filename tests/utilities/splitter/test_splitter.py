@@ -1,10 +1,16 @@
+import io
+import os
+
+import pytest
+
 from gedcom.element.family import FamilyElement
 from gedcom.element.individual import IndividualElement
 from gedcom.element.object import ObjectElement
 from gedcom.element.source import SourceElement
 from gedcom.element.repository import RepositoryElement
 
-from gedcom.utilities.splitter.splitter import Splitter
+from gedcom.parser import Parser
+from gedcom.utilities.splitter.splitter import Splitter, StreamingSplitter, UnsupportedEncodingError
 
 
 def test_get_split_gedcom():
@@ -40,3 +46,134 @@ def test_get_split_gedcom():
     assert(count_sources) == 18
     assert(count_repositories) == 1
     assert(count_objects) == 28
+
+
+def test_split_gedcom_keeps_descendants():
+
+    parser = Splitter()
+    parser.parse_file('tests/files/Coolidge.ged')
+    ancestor = parser.find_person("surname=Coolidge:birth=1816")
+
+    descendants = [
+        element.get_pointer() for element in parser.get_root_child_elements()
+        if isinstance(element, IndividualElement)
+        and parser.find_path_to_ancestor(element, ancestor, parent_type="All") is not None
+    ]
+    assert len(descendants) > 1
+
+    parser.split_gedcom(ancestor)
+
+    for pointer in descendants:
+        assert isinstance(parser.get_element_dictionary()[pointer], IndividualElement)
+
+
+def test_split_gedcom_keeps_nested_references():
+
+    parser = Splitter()
+    parser.parse([
+        b'0 HEAD\n', b'1 NOTE @N3@\n',
+        b'0 @I1@ INDI\n', b'1 OBJE @O1@\n', b'1 FAMS @F1@\n', b'1 BIRT\n', b'2 SOUR @S1@\n', b'3 OBJE @O2@\n',
+        b'3 NOTE @N1@\n',
+        b'0 @I2@ INDI\n', b'1 FAMC @F1@\n',
+        b'0 @I3@ INDI\n', b'1 NOTE @N2@\n', b'1 SOUR @S2@\n',
+        b'0 @F1@ FAM\n', b'1 HUSB @I1@\n', b'1 CHIL @I2@\n',
+        b'0 @S1@ SOUR\n', b'1 REPO @R1@\n',
+        b'0 @S2@ SOUR\n', b'1 REPO @R2@\n',
+        b'0 @R1@ REPO\n', b'0 @R2@ REPO\n',
+        b'0 @O1@ OBJE\n', b'0 @O2@ OBJE\n',
+        b'0 @N1@ NOTE\n', b'1 SOUR @S3@\n', b'0 @N2@ NOTE\n', b'0 @N3@ NOTE\n',
+        b'0 @S3@ SOUR\n',
+        b'0 TRLR\n',
+    ])
+
+    parser.split_gedcom(parser.get_element_dictionary()['@I1@'])
+
+    assert [element.get_pointer() for element in parser.get_root_child_elements()] == [
+        '', '@I1@', '@I2@', '@F1@', '@S1@', '@R1@', '@O1@', '@O2@', '@N1@', '@N3@', '@S3@', ''
+    ]
+
+
+def test_write_split():
+
+    parser = Splitter()
+    parser.parse_file('tests/files/Coolidge.ged')
+    tree = parser.get_root_element().to_gedcom_string(True)
+
+    # the tree is not changed, so several splits can be written
+    splits = []
+    for criteria in ("surname=Coolidge:birth=1816", "surname=Coolidge:birth=1872"):
+        output = io.StringIO()
+        parser.write_split(parser.find_person(criteria), output)
+        splits.append(output.getvalue())
+
+    assert parser.get_root_element().to_gedcom_string(True) == tree
+    assert splits[0] != splits[1]
+
+    parser.split_gedcom(parser.find_person("surname=Coolidge:birth=1816"))
+    assert parser.get_root_element().to_gedcom_string(True) == splits[0]
+
+
+def test_split_many():
+
+    parser = Splitter()
+    parser.parse_file('tests/files/Coolidge.ged')
+
+    ancestors = [parser.find_person("surname=Coolidge:birth=1816"), parser.find_person("surname=Coolidge:birth=1872")]
+    missing_ancestor = IndividualElement(0, "@MISSING@", "INDI", "")
+
+    outputs = [io.StringIO() for ancestor in ancestors]
+    splits = list(zip(ancestors, outputs)) + [(missing_ancestor, io.StringIO())]
+    assert parser.split_many(splits) == [missing_ancestor]
+
+    for ancestor, output in zip(ancestors, outputs):
+        split = io.StringIO()
+        parser.write_split(ancestor, split)
+        assert output.getvalue() == split.getvalue()
+
+
+def test_streaming_splitter(tmp_path):
+
+    parser = Splitter()
+    parser.parse_file('tests/files/Coolidge.ged')
+    records = {element.get_pointer(): element.to_gedcom_string(True) for element in parser.get_root_child_elements()}
+    other_records = [element.to_gedcom_string(True) for element in parser.get_root_child_elements()
+                     if not isinstance(element, (IndividualElement, FamilyElement))]
+
+    with StreamingSplitter('tests/files/Coolidge.ged') as streaming_splitter:
+        ancestor = streaming_splitter.find_person("surname=Coolidge:birth=1816")
+        streaming_splitter.write_split(ancestor, str(tmp_path / 'split.ged'))
+
+    split = Parser()
+    split.parse_file(str(tmp_path / 'split.ged'))
+
+    # the same individuals and families as split_gedcom, all other records, copied unchanged
+    parser.split_gedcom(parser.find_person("surname=Coolidge:birth=1816"))
+    assert [element.get_pointer() for element in split.get_root_child_elements()
+            if isinstance(element, (IndividualElement, FamilyElement))] == \
+        [element.get_pointer() for element in parser.get_root_child_elements()
+         if isinstance(element, (IndividualElement, FamilyElement))]
+    assert [element.to_gedcom_string(True) for element in split.get_root_child_elements()
+            if not isinstance(element, (IndividualElement, FamilyElement))] == other_records
+
+    for element in split.get_root_child_elements():
+        if element.get_pointer():
+            assert element.to_gedcom_string(True) == records[element.get_pointer()]
+
+
+def test_streaming_splitter_encoding(tmp_path):
+    file_path = tmp_path / 'utf-16.ged'
+    file_path.write_bytes('0 HEAD\n1 CHAR UNICODE\n0 TRLR\n'.encode('utf-16'))
+
+    with pytest.raises(UnsupportedEncodingError):
+        StreamingSplitter(str(file_path))
+
+
+def test_streaming_splitter_progress():
+    updates = []
+
+    with StreamingSplitter('tests/files/Coolidge.ged', callback=lambda *update: updates.append(update)):
+        pass
+
+    # the last record is indexed as well
+    size = os.path.getsize('tests/files/Coolidge.ged')
+    assert updates[-1] == ("Indexing records", size, size)